@@ -5,7 +5,13 @@ Database initialization script for NEXXT_AI_PROJECT.
 This script initializes all database tables and populates them with initial data:
 - Creates users table
 - Creates products table
-- Populates products from markdown files in products/ directory
+- Creates recommendation score cache table
+- Creates recommendation snapshots table
+- Creates learned bank terms table
+- Creates term extraction cache table
+- Creates term explanations table
+- Syncs products from markdown files in products/ directory (only changed files are
+  re-parsed; products whose files were removed are deleted)
 
 Usage:
     python init_database.py
@@ -12,18 +12,14 @@ from __future__ import annotations
 import streamlit as st
 import streamlit.components.v1 as components
 import html
-import unicodedata
-import asyncio
 import json
-from collections import defaultdict
-from typing import Dict, List, Tuple, Optional
+from datetime import datetime
+from typing import Dict, Iterator, List
 from agents import Runner
 import os
-from pydantic import ValidationError
 import sys
 from pathlib import Path
 import glob
-import difflib
 
 # Make local vendored 'st-annotated-text' importable
 _BASE_DIR = Path(__file__).resolve().parent.parent
@@ -40,13 +36,15 @@ except Exception:
 from src.config.settings import AWS_BEDROCK_API_KEY
 
 import streamlit as st
-import asyncio
 import json
 from agents import Runner
-import nest_asyncio
-import concurrent.futures
 
 from src.config.settings import AWS_BEDROCK_API_KEY
+from src.utils import llm_runtime
+from src.utils.term_extraction import extract_terms, extract_terms_batch
+from src.utils.term_spans import find_token_spans, tokens_by_category
+from src.utils.product_catalog import product_catalog
+from src.utils.product_parser import build_term_context
 from src.components.ui_components import render_sidebar_info, apply_button_styling
 from src.agents.product_recommendation_agent import (
     UserProfile,
@@ -60,16 +58,13 @@ from src.agents.user_experience_summary_agent import (
 )
 from src.agents.product_title_generation_agent import product_title_agent
 from src.agents.email_summary_agent import email_summary_agent
-from src.agents.financial_plan_agent import generate_financial_plan, format_plan_for_display
+from src.agents.financial_plan_agent import stream_financial_plan, format_plan_for_display
 from src.agents.pdf_converter_direct import convert_markdown_to_pdf_direct
 from src.utils.db import save_financial_plan
+from src.utils.allocation_optimizer import optimize_allocation
 from src.agents.product_summary_agent import product_summary_agent
-from src.agents.bank_term_extractor_agent import (
-    bank_term_extractor_agent,
-    ExtractionResult,
-)
-from src.agents.term_explain_agent import explain_term
-from src.agents.voice_explain_agent import explain_term_voice
+from src.agents.term_explain_agent import EDUCATION_LEVELS, explain_term
+from src.agents.voice_explain_agent import stream_explain_term_voice
 
 """
 Feature flags for LLM-driven enrichments. Disable to avoid extra turns/latency
@@ -87,36 +82,6 @@ CATEGORY_COLORS: Dict[str, str] = {
 }
 
 
-async def run_agent_extraction(text: str) -> Optional[ExtractionResult]:
-    """Call the Bank Term Extractor agent and return a validated ExtractionResult or None."""
-    prompt = (
-        "Extract bank-related terms from the following text. Return ONLY strict JSON with\n"
-        "keys 'categories' and 'spans' as previously defined. Do not include explanations.\n\n"
-        f"Text:\n{text}"
-    )
-    try:
-        result = await Runner.run(bank_term_extractor_agent, prompt)
-        raw = result.final_output or ""
-        # Some LLMs might return extra text; try to isolate JSON
-        try:
-            data = json.loads(raw)
-        except Exception:
-            start = raw.find("{")
-            end = raw.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                data = json.loads(raw[start : end + 1])
-            else:
-                return None
-        # Validate into class
-        try:
-            return ExtractionResult.model_validate(data)
-        except ValidationError:
-            return None
-    except Exception:
-        return None
-    return None
-
-
 def highlight_bank_terms_html(text: str, product_id: str) -> str:
     """
     Extract bank terms from text and return HTML with highlighted terms and context menu.
@@ -132,75 +97,16 @@ def highlight_bank_terms_html(text: str, product_id: str) -> str:
     if not text or not text.strip():
         return f"<div style='white-space:pre-wrap; line-height:1.8;'>{html.escape(text)}</div>"
     
-    # Run extraction synchronously (we're already in async context from Streamlit)
+    # Lexicon match first; the LLM only runs when no known term is found
     try:
-        validated = asyncio.run(run_agent_extraction(text))
+        validated = extract_terms(text)
     except Exception:
         # If extraction fails, return plain text
         return f"<div style='white-space:pre-wrap; line-height:1.8;'>{html.escape(text)}</div>"
     
-    matches: List[Tuple[int, int, str, str]] = []
-    tokens_by_cat: Dict[str, set] = defaultdict(set)
-    
-    if validated:
-        # Collect tokens from typed categories
-        for cat in ALLOWED_CATEGORIES:
-            for t in getattr(validated.categories, cat):
-                tokens_by_cat[cat].add(t.strip())
-    
-    # Normalize spans to whole words (no punctuation, no partial words)
-    def _is_word_char(ch: str) -> bool:
-        if not ch:
-            return False
-        cat = unicodedata.category(ch)
-        return cat.startswith("L") or cat.startswith("N") or cat.startswith("M")
-    
-    def _word_boundary_ok(start: int, end: int) -> bool:
-        # start boundary
-        if start > 0 and _is_word_char(text[start - 1]):
-            return False
-        # end boundary
-        if end < len(text) and _is_word_char(text[end]):
-            return False
-        return True
-    
-    def _find_all_occurrences(hay: str, needle: str) -> List[Tuple[int, int]]:
-        """Case-insensitive search for all occurrences with word-boundary checks."""
-        res: List[Tuple[int, int]] = []
-        if not needle:
-            return res
-        low_hay = hay.lower()
-        low_need = needle.lower()
-        i = 0
-        while True:
-            i = low_hay.find(low_need, i)
-            if i == -1:
-                break
-            j = i + len(needle)
-            if _word_boundary_ok(i, j):
-                res.append((i, j))
-            i = i + 1
-        return res
-    
-    token_spans: List[Tuple[int, int, str, str]] = []
-    # Prefer longer tokens to avoid partial overlaps (e.g., 'card' vs 'credit card')
-    all_cat_tokens: List[Tuple[str, str]] = []  # (cat, token)
-    for cat, toks in tokens_by_cat.items():
-        for t in toks:
-            all_cat_tokens.append((cat, t))
-    all_cat_tokens.sort(key=lambda ct: -len(ct[1]))
-    
-    used_intervals: List[Tuple[int, int]] = []
-    for cat, tok in all_cat_tokens:
-        for s, e in _find_all_occurrences(text, tok):
-            # Skip if overlaps an already selected interval
-            if any(not (e <= us or s >= ue) for us, ue in used_intervals):
-                continue
-            token_spans.append((s, e, cat, text[s:e]))
-            used_intervals.append((s, e))
-    
-    # Sort by position for rendering
-    matches = sorted(token_spans, key=lambda t: t[0])
+    tokens_by_cat = tokens_by_category(validated)
+    # Single-pass scan, longest token first (e.g., 'credit card' vs 'card')
+    matches = find_token_spans(text, tokens_by_cat)
     
     # Build HTML with highlighted terms
     html_parts: List[str] = []
@@ -376,80 +282,47 @@ def _extract_tokens_with_positions(text: str) -> tuple[list[tuple[int, int, str,
     if not text or not text.strip():
         return [], {}
 
-    # Run extraction synchronously and defensively
+    # Lexicon match first (LLM fallback on no hits), defensively
     try:
-        validated = asyncio.run(run_agent_extraction(text))
+        validated = extract_terms(text)
     except Exception:
         validated = None
 
-    tokens_by_cat: Dict[str, set] = defaultdict(set)
-    if validated:
-        for cat in ALLOWED_CATEGORIES:
-            for t in getattr(validated.categories, cat):
-                tt = (t or "").strip()
-                if tt:
-                    tokens_by_cat[cat].add(tt)
-
-    def _is_word_char(ch: str) -> bool:
-        if not ch:
-            return False
-        cat = unicodedata.category(ch)
-        return cat.startswith("L") or cat.startswith("N") or cat.startswith("M")
-
-    def _word_boundary_ok(start: int, end: int) -> bool:
-        if start > 0 and _is_word_char(text[start - 1]):
-            return False
-        if end < len(text) and _is_word_char(text[end]):
-            return False
-        return True
-
-    def _find_all_occurrences(hay: str, needle: str) -> list[tuple[int, int]]:
-        res: list[tuple[int, int]] = []
-        if not needle:
-            return res
-        low_hay = hay.lower()
-        low_need = needle.lower()
-        i = 0
-        while True:
-            i = low_hay.find(low_need, i)
-            if i == -1:
-                break
-            j = i + len(needle)
-            if _word_boundary_ok(i, j):
-                res.append((i, j))
-            i += 1
-        return res
-
-    # Build prioritized list of tokens (longer first)
-    all_cat_tokens: list[tuple[str, str]] = []
-    for cat, toks in tokens_by_cat.items():
-        for t in toks:
-            all_cat_tokens.append((cat, t))
-    all_cat_tokens.sort(key=lambda ct: -len(ct[1]))
-
-    used: list[tuple[int, int]] = []
-    matches: list[tuple[int, int, str, str]] = []
-    for cat, tok in all_cat_tokens:
-        for s, e in _find_all_occurrences(text, tok):
-            if any(not (e <= us or s >= ue) for us, ue in used):
-                continue
-            matches.append((s, e, cat, text[s:e]))
-            used.append((s, e))
-
-    matches.sort(key=lambda t: t[0])
-    return matches, tokens_by_cat
-
-
-def render_annotated_summary(text: str) -> list[tuple[str, str]]:
+    tokens_by_cat = tokens_by_category(validated)
+    return find_token_spans(text, tokens_by_cat), tokens_by_cat
+
+
+def _card_summary_text(product: dict) -> str:
+    """Text shown (and highlighted) on a product card."""
+    return product.get("personalized_summary") or product.get("base_summary") or product.get("description", "")
+
+
+def _precompute_summary_spans(products_for_ui: list[tuple[str, dict]]) -> None:
+    """Extract terms for all card summaries in one batch and store spans on each product.
+
+    Runs once when the ranked list is built so rendering never calls the extractor.
+    """
+    texts = {pid: _card_summary_text(product) for pid, product in products_for_ui}
+    try:
+        extracted = extract_terms_batch(list(texts.items()))
+    except Exception:
+        extracted = {}
+    for pid, product in products_for_ui:
+        product["summary_spans"] = find_token_spans(texts[pid], tokens_by_category(extracted.get(pid)))
+
+
+def render_annotated_summary(text: str, matches: list[tuple[int, int, str, str]] | None = None) -> list[tuple[str, str]]:
     """Render the summary using st-annotated-text and return list of (term, category).
 
     If st-annotated-text is not available, fall back to plain text.
+    `matches` are precomputed spans (see `_precompute_summary_spans`); extracted on demand if missing.
     """
     if not text:
         st.write("")
         return []
 
-    matches, _ = _extract_tokens_with_positions(text)
+    if matches is None:
+        matches, _ = _extract_tokens_with_positions(text)
 
     # Build pieces: plain strings and (body, label, background)
     pieces: list = []
@@ -482,28 +355,46 @@ def render_annotated_summary(text: str) -> list[tuple[str, str]]:
     return uniq_terms
 
 
-def _load_product_markdown(product_name: str) -> str:
-    """Best-effort load of product markdown from products/ directory using fuzzy match."""
+def _load_product_markdown(product_name: str, term: str = "") -> str:
+    """Product excerpt for the term explainer, built from the sections parsed at ingestion.
+
+    The product is fuzzy-matched by name/title in the cached catalog; sections
+    mentioning `term` come first.
+    """
     try:
-        product_dir = (_BASE_DIR / "products").resolve()
-        files = list(product_dir.glob("*.md"))
-        if not files:
+        product = product_catalog.find(product_name)
+        if product is None:
             return ""
-        # Score by difflib ratio on stem and full name
-        def score(p: Path) -> float:
-            stem = p.stem.replace("_", " ")
-            return max(
-                difflib.SequenceMatcher(None, product_name.lower(), stem.lower()).ratio(),
-                difflib.SequenceMatcher(None, product_name.lower(), p.name.lower()).ratio(),
-            )
-        best = max(files, key=score)
-        # Only accept if similarity is decent
-        if score(best) < 0.4:
-            return ""
-        return best.read_text(encoding="utf-8", errors="ignore")
+        return build_term_context(product["parsed"], term)
     except Exception:
         return ""
 
+def _play_voice_stream(
+    clips: Iterator[tuple[str, bytes]],
+    text_area,
+    audio_area,
+    sentences: list[str],
+    audio_parts: list[bytes],
+    audio_format: str = "mp3",
+) -> None:
+    """Show streamed sentences as they arrive and autoplay the first clip.
+
+    The first clip starts playing while the rest is generated; the player is
+    cleared when the stream ends so the caller can show the full joined audio.
+    Sentences and audio are appended to `sentences` / `audio_parts` as they
+    arrive, so partial results survive a stream error.
+    """
+    try:
+        for sentence, audio in clips:
+            sentences.append(sentence)
+            text_area.caption(" ".join(sentences))
+            if audio:
+                if not audio_parts:
+                    audio_area.audio(audio, format=f"audio/{audio_format}", autoplay=True)
+                audio_parts.append(audio)
+    finally:
+        audio_area.empty()
+
 apply_button_styling()
 render_sidebar_info()
 
@@ -594,7 +485,7 @@ with col1:
         help="Bifați dacă aveți copii"
     )
     
-    education_options = ["Fără studii superioare", "Liceu", "Facultate", "Master", "Doctorat"]
+    education_options = EDUCATION_LEVELS
     education_level = st.selectbox(
         "Nivel Studii",
         education_options,
@@ -683,11 +574,11 @@ if st.button("🔍 Obține Recomandări", type="primary", use_container_width=Tr
                 
                 # STEP 2: Get product catalog from agent and prepare for personalization
                 # Using product description as input (not pre-generated summary)
-                product_catalog = _get_products_catalog_dict()
+                catalog_by_name = _get_products_catalog_dict()
                 products_with_descriptions = []
                 for product in ranked_products:
                     pid = product["product_id"]
-                    base_data = product_catalog.get(pid, {})
+                    base_data = catalog_by_name.get(pid, {})
                     
                     products_with_descriptions.append({
                         "product_id": pid,
@@ -729,8 +620,6 @@ if st.button("🔍 Obține Recomandări", type="primary", use_container_width=Tr
                 # STEP 3: Summary Personalization Agent (optional)
                 if USE_PERSONALIZATION_AGENT:
                     # Uses Bedrock LLM to adapt base summaries to user's specific situation
-                    nest_asyncio.apply()
-
                     context = PersonalizationContext(user_profile=user_profile)
 
                     async def run_personalization_agent():
@@ -762,9 +651,7 @@ if st.button("🔍 Obține Recomandări", type="primary", use_container_width=Tr
 
                     # Execute personalization agent safely so failures don't block UI
                     try:
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(asyncio.run, run_personalization_agent())
-                            agent_result = future.result()
+                        agent_result = llm_runtime.run_sync(run_personalization_agent(), timeout=120)
 
                         # Parse LLM output
                         agent_output = agent_result.output if hasattr(agent_result, 'output') else str(agent_result)
@@ -904,7 +791,7 @@ if st.button("🔍 Obține Recomandări", type="primary", use_container_width=Tr
 
                             return await Runner.run(product_title_agent, prompt, max_turns=3)
 
-                        titles_result = asyncio.run(_run_titles())
+                        titles_result = llm_runtime.run_sync(_run_titles(), timeout=60)
                         raw = titles_result.final_output or "{}"
                         parsed = {}
                         try:
@@ -957,6 +844,9 @@ if st.button("🔍 Obține Recomandări", type="primary", use_container_width=Tr
                         )
                     )
                 
+                # Highlight spans for every card, extracted in one batch
+                _precompute_summary_spans(products_for_ui)
+
                 # Already sorted by Product Recommendation Agent (no need to re-sort)
                 ranked_products = products_for_ui
                 
@@ -1014,12 +904,12 @@ if st.session_state.ranked_products is not None:
             
 
             # Personalized Romanian recommendation (AI-generated based on user profile)
-            summary_text = product.get("personalized_summary") or product.get("base_summary") or product.get("description", "")
+            summary_text = _card_summary_text(product)
             if summary_text:
                 st.markdown("**💡 Recomandare Personalizată:**")
                 # Render summary with st-annotated-text and capture candidate terms
                 with st.container():
-                    terms = render_annotated_summary(summary_text)
+                    terms = render_annotated_summary(summary_text, product.get("summary_spans"))
                     if terms:
                         # Let user choose a highlighted term to explain
                         term_labels = [f"{t} ({c})" for t, c in terms]
@@ -1114,7 +1004,7 @@ FROM_EMAIL: {from_email}
                         # Build Markdown content with top products
                         markdown_content = f"""# Recomandările Dumneavoastră Personalizate
 
-**Data:** {asyncio.get_event_loop().time() if hasattr(asyncio, 'get_event_loop') else '02 Noiembrie 2025'}  
+**Data:** {datetime.now().strftime("%d.%m.%Y")}  
 **Consultant:** Raiffeisen Banking & Advisory
 
 ---
@@ -1231,7 +1121,7 @@ Please send this professional HTML email now."""
                         with log_expander:
                             st.write("**📤 Trimitere email HTML prin MCP Server...**")
                         
-                        send_result = asyncio.run(_send())
+                        send_result = llm_runtime.run_sync(_send(), timeout=120)
                         
                         with log_expander:
                             st.write("**✅ Răspuns Agent:**")
@@ -1301,6 +1191,59 @@ Please send this professional HTML email now."""
                     icon = ICONS.get(product_id, "🏦")
                     st.markdown(f"{icon} **{prod['name']}**")
         
+        # Monthly savings split across the selected products (recomputed on every rerun)
+        allocation = optimize_allocation(
+            {
+                "age": age,
+                "annual_income": annual_income,
+                "marital_status": marital_status,
+                "has_children": has_children,
+                "risk_tolerance": risk_tolerance.lower(),
+            },
+            st.session_state.selected_products,
+        )
+        with st.expander("💡 Alocare recomandată a economiilor lunare", expanded=False):
+            emergency = allocation["emergency_fund"]
+            st.caption(
+                f"Economii lunare estimate: **{allocation['monthly_savings']:,.0f} RON** · "
+                f"Randament estimat: **{allocation['portfolio']['expected_return']:.2f}%/an** · "
+                f"Volatilitate: **{allocation['portfolio']['volatility']:.2f}%** · "
+                f"Scor de risc: **{allocation['portfolio']['risk_score']:.2f}** "
+                f"(maxim {allocation['portfolio']['max_risk_score']:.1f})"
+            )
+            if emergency["monthly_amount"] > 0:
+                destination = catalog.get(emergency["product"], {}).get("name", emergency["product"]) if emergency["product"] else "un cont de economii separat"
+                st.info(
+                    f"🛟 Fond de urgență mai întâi: **{emergency['monthly_amount']:,.0f} RON/lună** în "
+                    f"{destination}, timp de ~{emergency['months_to_target']:.0f} luni "
+                    f"(țintă {emergency['target']:,.0f} RON)."
+                )
+            if allocation["allocations"]:
+                st.dataframe(
+                    [
+                        {
+                            "Produs": catalog.get(item["product"], {}).get("name", item["product"]),
+                            "Pondere investiții (%)": item["weight"],
+                            "Sumă lunară (RON)": item["monthly_amount"],
+                            "Randament estimat (%)": round(item["annual_return_rate"] * 100, 2),
+                            "Scor risc": item["risk_score"],
+                        }
+                        for item in allocation["allocations"]
+                    ],
+                    hide_index=True,
+                    use_container_width=True,
+                )
+            else:
+                st.caption("Niciun produs de economisire sau investiții selectat.")
+            if allocation["excluded_products"]:
+                excluded_names = ", ".join(catalog.get(p, {}).get("name", p) for p in allocation["excluded_products"])
+                st.caption(f"Nu primesc contribuții lunare (credite/carduri): {excluded_names}")
+            if not allocation["feasible"]:
+                st.warning("⚠️ Produsele selectate depășesc toleranța la risc; s-a ales combinația cu riscul cel mai mic.")
+        
+        # Full-width area where the plan streams in (outside the button columns)
+        plan_preview = st.empty()
+        
         # Action buttons
         col_generate, col_clear = st.columns(2)
         with col_generate:
@@ -1314,7 +1257,7 @@ Please send this professional HTML email now."""
                     if not profile_data:
                         st.error("⚠️ Profil utilizator lipsă. Vă rugăm să completați profilul mai sus.")
                     else:
-                        with st.spinner("🤖 Generăm planul dumneavoastră financiar personalizat... (poate dura 10-20 secunde)"):
+                        with st.spinner("🤖 Generăm planul dumneavoastră financiar personalizat..."):
                             try:
                                 # Build selected products data with full details
                                 selected_products_data = []
@@ -1344,8 +1287,11 @@ Please send this professional HTML email now."""
                                         }
                                         selected_products_data.append(product_data)
                                 
-                                # Generate financial plan
-                                plan_text = generate_financial_plan(profile_data, selected_products_data)
+                                # Generate financial plan, rendering the markdown as it streams in
+                                with plan_preview.container():
+                                    plan_text = st.write_stream(stream_financial_plan(profile_data, selected_products_data))
+                                # The complete plan is shown in the section below
+                                plan_preview.empty()
                                 formatted_plan = format_plan_for_display(plan_text)
                                 
                                 # Store in session state for download and PDF conversion
@@ -1547,29 +1493,50 @@ with st.sidebar:
     with c1:
         if st.button("Explain", disabled=disabled, use_container_width=True):
             # Load product markdown and call the text explanation agent
-            product_markdown = _load_product_markdown(meta.get("product_name") or "")
+            product_markdown = _load_product_markdown(meta.get("product_name") or "", term or "")
             explanation = explain_term(
                 term=term or "",
                 summary_text=(meta.get("summary_text") or ""),
                 education_level=edu_level,
                 product_name=meta.get("product_name"),
                 product_markdown=product_markdown,
+                product_key=meta.get("product_id"),
             )
             st.session_state["term_explanation"] = explanation
             st.session_state["term_explanation_audio"] = None
     with c2:
         if st.button("Voice Explain", disabled=disabled, use_container_width=True):
-            product_markdown = _load_product_markdown(meta.get("product_name") or "")
+            product_markdown = _load_product_markdown(meta.get("product_name") or "", term or "")
             # Prefer existing text explanation to avoid extra LLM calls
             text = st.session_state.get("term_explanation")
             if not text:
-                text, audio_bytes = explain_term_voice(
-                    term=term or "",
-                    summary_text=(meta.get("summary_text") or ""),
-                    education_level=edu_level,
-                    product_name=meta.get("product_name"),
-                    product_markdown=product_markdown,
-                )
+                # Stream: the first sentence starts playing while the rest is generated,
+                # then the full explanation replaces it in the player below
+                text_area = st.empty()
+                audio_area = st.empty()
+                sentences: list[str] = []
+                audio_parts: list[bytes] = []
+                try:
+                    _play_voice_stream(
+                        stream_explain_term_voice(
+                            term=term or "",
+                            summary_text=(meta.get("summary_text") or ""),
+                            education_level=edu_level,
+                            product_name=meta.get("product_name"),
+                            product_markdown=product_markdown,
+                            product_key=meta.get("product_id"),
+                        ),
+                        text_area,
+                        audio_area,
+                        sentences,
+                        audio_parts,
+                    )
+                except Exception as e:  # noqa: BLE001
+                    st.warning(f"Nu am putut genera explicația vocală: {str(e)[:120]}")
+                text_area.empty()
+                text = " ".join(sentences)
+                audio_bytes = b"".join(audio_parts)
+                st.session_state["term_explanation_autoplay"] = True
             else:
                 # Only do TTS if text already computed
                 from src.agents.voice_explain_agent import text_to_speech_openai
@@ -1581,7 +1548,11 @@ with st.sidebar:
     if st.session_state.get("term_explanation"):
         st.info(st.session_state["term_explanation"])
     if st.session_state.get("term_explanation_audio"):
-        st.audio(st.session_state["term_explanation_audio"], format="audio/mp3")
+        st.audio(
+            st.session_state["term_explanation_audio"],
+            format="audio/mp3",
+            autoplay=st.session_state.pop("term_explanation_autoplay", False),
+        )
 
     st.divider()
     st.subheader("ℹ️ Informații")
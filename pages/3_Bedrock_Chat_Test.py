@@ -3,13 +3,12 @@
 Usage: Enter a message; the page will call the Bedrock-backed agent and display a response.
 """
 
-import asyncio
 import streamlit as st
 
 from src.config.settings import AWS_BEDROCK_API_KEY
 from src.components.ui_components import render_sidebar_info, apply_button_styling
-from agents import Runner
 from src.agents.bedrock_chat_agent import bedrock_chat_agent
+from src.utils import llm_runtime
 
 # Styling + sidebar
 apply_button_styling()
@@ -69,10 +68,7 @@ if prompt := st.chat_input("Type your message here..."):
     with st.chat_message("assistant"):
         with st.spinner("Contacting Claude via Bedrock..."):
             try:
-                async def run_chat():
-                    return await Runner.run(bedrock_chat_agent, prompt)
-
-                result = asyncio.run(run_chat())
+                result = llm_runtime.submit(bedrock_chat_agent, prompt, timeout=120).result()
                 reply = result.final_output or "(no content from model)"
 
                 st.markdown(reply)
@@ -8,11 +8,7 @@ and validated into typed Pydantic classes before rendering.
 from __future__ import annotations
 
 import html
-import unicodedata
-import asyncio
-import json
-from collections import defaultdict
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List
 
 import streamlit as st
 import streamlit.components.v1 as components
@@ -22,12 +18,8 @@ except Exception:  # pragma: no cover
     _annotated_text = None
 
 from src.components.ui_components import render_sidebar_info, apply_button_styling
-from agents import Runner
-from pydantic import ValidationError
-from src.agents.bank_term_extractor_agent import (
-    bank_term_extractor_agent,
-    ExtractionResult,
-)
+from src.utils.term_extraction import extract_terms
+from src.utils.term_spans import find_token_spans, tokens_by_category
 
 # Apply styling and sidebar
 apply_button_styling()
@@ -46,8 +38,9 @@ with nav_col3:
 
 st.write(
     """
-    Paste any text below and click "Extract Tokens". An OpenAI Agents SDK agent
-    (via LiteLLM) will extract banking products, rates, and fees. We’ll render
+    Paste any text below and click "Extract Tokens". Banking products, rates, and fees
+    are matched instantly against a bank term lexicon; an OpenAI Agents SDK agent
+    (via LiteLLM) is only used when no known term is found. We’ll render
     natural inline highlights with labels.
     """
 )
@@ -63,36 +56,6 @@ CATEGORY_COLORS: Dict[str, str] = {
 }
 
 
-async def run_agent_extraction(text: str) -> Optional[ExtractionResult]:
-    """Call the Bank Term Extractor agent and return a validated ExtractionResult or None."""
-    prompt = (
-        "Extract bank-related terms from the following text. Return ONLY strict JSON with\n"
-        "keys 'categories' and 'spans' as previously defined. Do not include explanations.\n\n"
-        f"Text:\n{text}"
-    )
-    try:
-        result = await Runner.run(bank_term_extractor_agent, prompt)
-        raw = result.final_output or ""
-        # Some LLMs might return extra text; try to isolate JSON
-        try:
-            data = json.loads(raw)
-        except Exception:
-            start = raw.find("{")
-            end = raw.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                data = json.loads(raw[start : end + 1])
-            else:
-                return None
-        # Validate into class
-        try:
-            return ExtractionResult.model_validate(data)
-        except ValidationError:
-            return None
-    except Exception:
-        return None
-    return None
-
-
 # UI controls
 sample_text = (
     "I’m considering a mortgage with a fixed rate vs a variable rate. \n"
@@ -124,102 +87,14 @@ if run:
     if not text.strip():
         st.info("Please paste some text to analyze.")
     else:
-        with st.spinner("Extracting with AI agent..."):
-            validated = asyncio.run(run_agent_extraction(text))
-
-        matches: List[Tuple[int, int, str, str]] = []
-        tokens_by_cat: Dict[str, set] = defaultdict(set)
-
-        if validated:
-            # Collect tokens from typed categories
-            for cat in ALLOWED_CATEGORIES:
-                for t in getattr(validated.categories, cat):
-                    tokens_by_cat[cat].add(t.strip())
-            # NOTE: We purposefully ignore raw spans from the model and instead
-            # derive highlight positions from the validated token lists to ensure
-            # highlights exactly match the extracted tokens (no extra words).
-
-        # Normalize spans to whole words (no punctuation, no partial words)
-        def _is_word_char(ch: str) -> bool:
-            if not ch:
-                return False
-            cat = unicodedata.category(ch)
-            return cat.startswith("L") or cat.startswith("N") or cat.startswith("M")
-
-        def _is_punct(ch: str) -> bool:
-            if not ch:
-                return False
-            return unicodedata.category(ch).startswith("P")
-
-        def _normalize_span(s: int, e: int) -> tuple[int, int]:
-            # clamp
-            s = max(0, min(s, len(text)))
-            e = max(0, min(e, len(text)))
-            if s >= e:
-                return s, s
-            # trim leading/trailing whitespace/punct
-            while s < e and (text[s].isspace() or _is_punct(text[s])):
-                s += 1
-            while e > s and (text[e - 1].isspace() or _is_punct(text[e - 1])):
-                e -= 1
-            if s >= e:
-                return s, s
-            # expand to full word if inside a word
-            while s > 0 and _is_word_char(text[s - 1]) and _is_word_char(text[s]):
-                s -= 1
-            while e < len(text) and _is_word_char(text[e - 1]) and _is_word_char(text[e] if e < len(text) else ""):
-                e += 1
-            return s, e
-
-        # Build highlight spans by searching the text for each extracted token
-        # and ensuring word-boundary matches. This guarantees the highlights
-        # correspond exactly to the extracted token list.
-        def _word_boundary_ok(start: int, end: int) -> bool:
-            # start boundary
-            if start > 0 and _is_word_char(text[start - 1]):
-                return False
-            # end boundary
-            if end < len(text) and _is_word_char(text[end]):
-                return False
-            return True
-
-        def _find_all_occurrences(hay: str, needle: str) -> List[Tuple[int, int]]:
-            """Case-insensitive search for all occurrences with word-boundary checks."""
-            res: List[Tuple[int, int]] = []
-            if not needle:
-                return res
-            low_hay = hay.lower()
-            low_need = needle.lower()
-            i = 0
-            while True:
-                i = low_hay.find(low_need, i)
-                if i == -1:
-                    break
-                j = i + len(needle)
-                if _word_boundary_ok(i, j):
-                    res.append((i, j))
-                i = i + 1
-            return res
-
-        token_spans: List[Tuple[int, int, str, str]] = []
-        # Prefer longer tokens to avoid partial overlaps (e.g., 'card' vs 'credit card')
-        all_cat_tokens: List[Tuple[str, str]] = []  # (cat, token)
-        for cat, toks in tokens_by_cat.items():
-            for t in toks:
-                all_cat_tokens.append((cat, t))
-        all_cat_tokens.sort(key=lambda ct: -len(ct[1]))
-
-        used_intervals: List[Tuple[int, int]] = []
-        for cat, tok in all_cat_tokens:
-            for s, e in _find_all_occurrences(text, tok):
-                # Skip if overlaps an already selected interval
-                if any(not (e <= us or s >= ue) for us, ue in used_intervals):
-                    continue
-                token_spans.append((s, e, cat, text[s:e]))
-                used_intervals.append((s, e))
-
-        # Sort by position for rendering
-        matches = sorted(token_spans, key=lambda t: t[0])
+        with st.spinner("Extracting bank terms..."):
+            validated = extract_terms(text)
+
+        # Highlights are derived from the validated token lists (not raw model
+        # spans) so they match the extracted tokens exactly; one scan over the
+        # text, longest token first (e.g., 'credit card' vs 'card').
+        tokens_by_cat = tokens_by_category(validated)
+        matches = find_token_spans(text, tokens_by_cat)
 
         if not matches and not tokens_by_cat:
             st.warning("No bank-related terms detected by the agent.")
@@ -10,24 +10,24 @@ Flow (Operator Version):
 """
 
 import streamlit as st
-import asyncio
 import json
 from agents import Runner
-import nest_asyncio
-import concurrent.futures
 
 from src.config.settings import AWS_BEDROCK_API_KEY
+from src.utils import llm_runtime
 from src.components.ui_components import render_sidebar_info, apply_button_styling
 from src.agents.product_recommendation_agent import (
-    UserProfile,
-    rank_products_for_profile,  # Direct function for ranking
     _get_products_catalog_dict,  # Import catalog from agent
 )
-from src.agents.operator_guidance_agent import generate_operator_guidance  # NEW: Operator guidance
 from src.agents.email_summary_agent import email_summary_agent
 from src.agents.financial_plan_agent import generate_financial_plan, format_plan_for_display
 from src.agents.pdf_converter_direct import convert_markdown_to_pdf_direct
 from src.utils.db import save_financial_plan, get_user_by_email
+from src.utils.recommendation_snapshots import (
+    compute_recommendations,  # Ranking + parallel operator guidance
+    load_fresh_snapshot,
+    store_snapshot,
+)
 
 
 USE_PERSONALIZATION_AGENT = False
@@ -109,158 +109,79 @@ if st.button("🔍 Caută Client și Generează Recomandări", type="primary", u
                 
                 st.divider()
                 
-                # Map database fields to UserProfile
                 extra = user_data.get('extra', {})
                 
-                # Helper function to normalize strings
-                def normalize_string(s):
-                    if not s:
-                        return None
-                    s = str(s).lower().strip()
-                    # Map Romanian to English if needed
-                    mappings = {
-                        'necăsătorit/ă': 'single',
-                        'căsătorit/ă': 'married',
-                        'divorțat/ă': 'divorced',
-                        'văduv/ă': 'widowed',
-                        'angajat': 'employed',
-                        'independent': 'self-employed',
-                        'șomer': 'unemployed',
-                        'pensionar': 'retired',
-                        'student': 'student',
-                        'scăzută': 'low',
-                        'medie': 'medium',
-                        'ridicată': 'high',
-                        'fără studii superioare': 'fara_studii_superioare',
-                        'liceu': 'liceu',
-                        'facultate': 'facultate',
-                        'master': 'masterat',
-                        'doctorat': 'doctorat',
-                    }
-                    return mappings.get(s, s)
-                
-                # Create UserProfile from database data
-                user_profile = UserProfile(
-                    marital_status=normalize_string(user_data.get('marital_status')),
-                    annual_income=float(extra.get('annual_income', 50000)),
-                    age=int(user_data.get('age', 35)),
-                    employment_status=normalize_string(user_data.get('employment_status')),
-                    has_children=bool(user_data.get('has_children', False)),
-                    risk_tolerance=normalize_string(extra.get('risk_tolerance', 'medium')),
-                    financial_goals=[goal.lower().strip() for goal in extra.get('financial_goals', [])] if isinstance(extra.get('financial_goals'), list) else [],
-                    education_level=normalize_string(extra.get('education_level', 'facultate')),
-                )
+                # Prepare UI data: add icons and format for display
+                ICONS = {
+                    "card_cumparaturi_rate": "💳",
+                    "depozite_termen": "🏦",
+                    "cont_economii_super_acces": "💰",
+                    "card_debit_platinum": "🪪",
+                    "credit_ipotecar_casa_ta": "🏠",
+                    "credit_nevoi_personale": "🧾",
+                    "fonduri_investitii_smartinvest": "📈",
+                    "pensie_privata_pilon3": "🎯",
+                    "cont_junior_adolescenti": "🧒",
+                    "asigurare_viata_economii": "🛡️",
+                }
                 
-                with st.spinner("Analizăm profilul și generăm recomandări personalizate prin AI..."):
-                    # STEP 1: Product Recommendation Agent - Rank products by relevance score
-                    ranked_products = rank_products_for_profile(user_profile.model_dump_json())
-                    
-                    # STEP 2: Get product catalog and prepare for UI
-                    product_catalog = _get_products_catalog_dict()
-                    products_with_descriptions = []
-                    for product in ranked_products:
-                        pid = product["product_id"]
-                        base_data = product_catalog.get(pid, {})
-                        
-                        products_with_descriptions.append({
-                            "product_id": pid,
-                            "name": base_data.get("name", pid),
-                            "description": base_data.get("description", ""),
-                            "benefits": base_data.get("benefits", []),
-                            "score": product.get("score", 0.5),
-                            "justification": product.get("justification", ""),
-                            "recommended_action": product.get("recommended_action", ""),
-                        })
-                    
-                    # Prepare UI data: add icons and format for display
-                    ICONS = {
-                        "card_cumparaturi_rate": "💳",
-                        "depozite_termen": "🏦",
-                        "cont_economii_super_acces": "💰",
-                        "card_debit_platinum": "🪪",
-                        "credit_ipotecar_casa_ta": "🏠",
-                        "credit_nevoi_personale": "🧾",
-                        "fonduri_investitii_smartinvest": "📈",
-                        "pensie_privata_pilon3": "🎯",
-                        "cont_junior_adolescenti": "🧒",
-                        "asigurare_viata_economii": "🛡️",
-                    }
-
-                    # STEP 3: Generate operator guidance for each product
-                    st.info("🤖 Generăm ghiduri de abordare personalizate pentru operator...")
-                    
-                    # Prepare client profile for guidance generation
-                    client_profile_for_guidance = {
-                        "age": user_data.get('age'),
-                        "education_level": extra.get('education_level', 'facultate'),
-                        "annual_income": extra.get('annual_income', 50000),
-                        "marital_status": user_data.get('marital_status'),
-                        "has_children": user_data.get('has_children', False),
-                        "employment_status": user_data.get('employment_status'),
-                        "risk_tolerance": extra.get('risk_tolerance', 'medium'),
-                    }
-                    
-                    # Format for UI with operator guidance
-                    products_for_ui = []
-                    for idx, enriched_product in enumerate(products_with_descriptions, 1):
-                        pid = enriched_product["product_id"]
-                        icon = ICONS.get(pid, "🏦")
+                # Serve the precomputed snapshot (precompute_recommendations.py) when still fresh
+                products_with_guidance = load_fresh_snapshot(user_data)
+                if products_with_guidance is not None:
+                    st.caption("⚡ Recomandări încărcate din analiza precalculată")
+                else:
+                    with st.spinner("Analizăm profilul și generăm recomandări personalizate prin AI..."):
+                        # Ranking + operator guidance for all products in parallel;
+                        # each guidance card is shown as soon as it arrives
+                        guidance_progress = st.progress(0.0, text="Analizăm produsele și generăm ghidurile de abordare...")
+                        guidance_stream = st.container()
                         
-                        # Generate operator guidance for this specific client-product combination
-                        st.caption(f"Generăm ghid pentru produsul {idx}/{len(products_with_descriptions)}: {enriched_product.get('name', pid)}")
+                        def _show_guidance(product, done, total):
+                            guidance_progress.progress(done / total, text=f"Ghiduri generate: {done}/{total}")
+                            with guidance_stream.container(border=True):
+                                st.markdown(f"**{product['name']}** — {product['operator_guidance'].get('recommended_approach', '')}")
                         
-                        try:
-                            operator_guidance = generate_operator_guidance(
-                                client_profile=client_profile_for_guidance,
-                                product_info={
-                                    "product_name": enriched_product.get("name", pid),
-                                    "description": enriched_product.get("description", ""),
-                                    "benefits": enriched_product.get("benefits", []),
-                                }
-                            )
-                        except Exception as e:
-                            # Fallback if guidance generation fails
-                            operator_guidance = {
-                                "communication_tone": "profesional",
-                                "financial_literacy_level": "mediu",
-                                "recommended_approach": f"Prezentați produsul {enriched_product.get('name', pid)} clientului, adaptând comunicarea la profilul său.",
-                                "key_phrases_to_use": [],
-                                "terms_to_avoid": [],
-                                "concrete_example": ""
-                            }
+                        products_with_guidance = compute_recommendations(user_data, on_guidance=_show_guidance)
                         
-                        products_for_ui.append(
-                            (
-                                pid,
-                                {
-                                    "name": enriched_product.get("name", pid),
-                                    "icon": icon,
-                                    "description": enriched_product.get("description", ""),
-                                    "benefits": enriched_product.get("benefits", []),
-                                    "score": enriched_product["score"],
-                                    "operator_guidance": operator_guidance,  # NEW: Add guidance
-                                },
-                            )
+                        # Next lookup of this client is served from the snapshot
+                        store_snapshot(user_data, products_with_guidance)
+                
+                # Format for UI with operator guidance (ranking order)
+                products_for_ui = []
+                for enriched_product in products_with_guidance:
+                    pid = enriched_product["product_id"]
+                    products_for_ui.append(
+                        (
+                            pid,
+                            {
+                                "name": enriched_product.get("name", pid),
+                                "icon": ICONS.get(pid, "🏦"),
+                                "description": enriched_product.get("description", ""),
+                                "benefits": enriched_product.get("benefits", []),
+                                "score": enriched_product["score"],
+                                "operator_guidance": enriched_product["operator_guidance"],  # NEW: Add guidance
+                            },
                         )
-                    
-                    # Already sorted by Product Recommendation Agent
-                    ranked_products = products_for_ui
-                    
-                    # Store in session state to persist across reruns
-                    st.session_state.ranked_products = ranked_products
-                    st.session_state.llm_titles = {}
-                    st.session_state.user_profile_data = {
-                        "age": user_data.get('age'),
-                        "annual_income": extra.get('annual_income', 50000),
-                        "marital_status": user_data.get('marital_status'),
-                        "first_name": user_data.get('first_name'),
-                        "last_name": user_data.get('last_name'),
-                    }
-                    st.session_state.client_email = client_email
-                    
-                    # Display results
-                    st.success("✅ Recomandări generate cu succes!")
-                    
+                    )
+                
+                # Already sorted by Product Recommendation Agent
+                ranked_products = products_for_ui
+                
+                # Store in session state to persist across reruns
+                st.session_state.ranked_products = ranked_products
+                st.session_state.llm_titles = {}
+                st.session_state.user_profile_data = {
+                    "age": user_data.get('age'),
+                    "annual_income": extra.get('annual_income', 50000),
+                    "marital_status": user_data.get('marital_status'),
+                    "first_name": user_data.get('first_name'),
+                    "last_name": user_data.get('last_name'),
+                }
+                st.session_state.client_email = client_email
+                
+                # Display results
+                st.success("✅ Recomandări generate cu succes!")
+                
             except Exception as e:
                 st.error(f"A apărut o eroare: {str(e)}")
                 import traceback
@@ -618,7 +539,7 @@ Please send this professional HTML email now."""
                     with log_expander:
                         st.write("**📤 Trimitere email HTML prin MCP Server...**")
                     
-                    send_result = asyncio.run(_send())
+                    send_result = llm_runtime.run_sync(_send(), timeout=120)
                     
                     with log_expander:
                         st.write("**✅ Răspuns Agent:**")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Offline pre-computation of operator recommendations for NEXXT_AI_PROJECT.
+
+This script walks the users table in pages and, for every user, runs the
+product ranking and operator guidance generation, storing the result in the
+recommendation_snapshots table. The Operator Recommendations page serves these
+snapshots instead of calling the LLM on every client lookup.
+
+Users whose snapshot is still fresh (same profile + product catalog, younger
+than --max-age-hours) are skipped unless --force is given.
+
+Usage:
+    python precompute_recommendations.py
+    python precompute_recommendations.py --workers 8 --page-size 200 --force
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.db import get_users_page, init_recommendation_snapshots_table
+from src.utils.product_catalog import product_catalog
+from src.utils.recommendation_snapshots import (
+    SNAPSHOT_MAX_AGE_HOURS,
+    compute_recommendations,
+    load_fresh_snapshot,
+    store_snapshot,
+)
+
+
+def _process_user(user: dict, catalog_products: list, max_age_hours: float, force: bool) -> str:
+    """Compute and store one user's snapshot. Returns 'computed', 'skipped' or 'failed'."""
+    try:
+        if not force and load_fresh_snapshot(user, max_age_hours, catalog_products) is not None:
+            return "skipped"
+        products = compute_recommendations(user)
+        if not store_snapshot(user, products, catalog_products):
+            return "failed"
+        return "computed"
+    except Exception as e:
+        print(f"✗ {user.get('email')}: {e}")
+        return "failed"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Precompute recommendation snapshots for all users.")
+    parser.add_argument("--page-size", type=int, default=100, help="Users fetched per database page")
+    parser.add_argument("--workers", type=int, default=4, help="Users processed in parallel")
+    parser.add_argument("--max-age-hours", type=float, default=SNAPSHOT_MAX_AGE_HOURS,
+                        help="Recompute snapshots older than this")
+    parser.add_argument("--force", action="store_true", help="Recompute even fresh snapshots")
+    args = parser.parse_args()
+
+    init_recommendation_snapshots_table()
+    catalog_products = product_catalog.get_products()
+    if not catalog_products:
+        print("✗ No products in database. Run init_database.py first.")
+        return 1
+
+    counts = {"computed": 0, "skipped": 0, "failed": 0}
+    started = time.perf_counter()
+    after_id = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        while True:
+            users = get_users_page(after_id=after_id, limit=args.page_size)
+            if not users:
+                break
+            after_id = users[-1]["id"]
+
+            results = pool.map(
+                lambda user: (user["email"], _process_user(user, catalog_products, args.max_age_hours, args.force)),
+                users,
+            )
+            for email, status in results:
+                counts[status] += 1
+                print(f"{'✓' if status == 'computed' else '=' if status == 'skipped' else '✗'} {email}: {status}")
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✓ Snapshots done in {elapsed:.1f}s")
+    print(f"  - Computed: {counts['computed']}")
+    print(f"  - Skipped (fresh): {counts['skipped']}")
+    print(f"  - Failed: {counts['failed']}")
+    return 0 if counts["failed"] == 0 else 2
+
+
+if __name__ == "__main__":
+    try:
+        exit(main())
+    except Exception as e:
+        print(f"\n✗ Error precomputing recommendations: {e}")
+        exit(1)
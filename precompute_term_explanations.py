@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Warm-up of the term explanation store for NEXXT_AI_PROJECT.
+
+This script generates an explanation for every bank lexicon term (curated and
+learned) x every education level x every product in the catalog, and stores
+it in the term_explanations table. Selecting a term on the Product
+Recommendations page then becomes a lookup instead of a Bedrock call.
+
+Education levels that share the same prompt guidance (e.g. Master/Doctorat)
+are generated once. Explanations still fresh in the store are skipped unless
+--force is given.
+
+Usage:
+    python precompute_term_explanations.py
+    python precompute_term_explanations.py --workers 8 --only-present
+    python precompute_term_explanations.py --products "Depozite la Termen" --force
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.agents.term_explain_agent import EDUCATION_LEVELS, education_bucket, explain_term
+from src.utils.bank_term_lexicon import CURATED_TERMS, _normalize_term, fold_text
+from src.utils.db import get_learned_bank_terms, init_term_explanations_table, purge_expired_explanations
+from src.utils.explanation_cache import explanation_cache
+from src.utils.product_catalog import product_catalog
+from src.utils.product_parser import build_term_context
+
+
+def _lexicon_terms() -> list:
+    """Curated + learned terms, one surface form per normalized term."""
+    terms = {}
+    for category_terms in CURATED_TERMS.values():
+        for term in category_terms:
+            terms.setdefault(_normalize_term(term), term)
+    for term, _category in get_learned_bank_terms():
+        terms.setdefault(_normalize_term(term), term)
+    return sorted(terms.values(), key=str.lower)
+
+
+def _process(term: str, level: str, product: dict, force: bool) -> str:
+    """Generate and store one explanation. Returns 'computed', 'skipped' or 'failed'."""
+    product_key = product["product_name"]
+    if not force and explanation_cache.get(term, education_bucket(level), product_key):
+        return "skipped"
+    parsed = product.get("parsed") or {}
+    text = explain_term(
+        term=term,
+        summary_text="",
+        education_level=level,
+        product_name=parsed.get("name") or product_key,
+        product_markdown=build_term_context(parsed, term),
+        product_key=product_key,
+        use_cache=False,
+    )
+    # explain_term stores successful explanations; errors come back as plain text
+    if explanation_cache.get(term, education_bucket(level), product_key) != text:
+        print(f"✗ {term} / {level} / {product_key}: {text}")
+        return "failed"
+    return "computed"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pre-generate term explanations for the lexicon x education levels x products.")
+    parser.add_argument("--workers", type=int, default=4, help="Explanations generated in parallel")
+    parser.add_argument("--products", nargs="*", help="Only these product names (default: whole catalog)")
+    parser.add_argument("--only-present", action="store_true",
+                        help="Only terms that appear in the product document")
+    parser.add_argument("--force", action="store_true", help="Regenerate explanations still in the store")
+    args = parser.parse_args()
+
+    init_term_explanations_table()
+    purged = purge_expired_explanations()
+    if purged:
+        print(f"✓ Purged {purged} expired explanations")
+
+    products = product_catalog.get_products()
+    if args.products:
+        wanted = set(args.products)
+        products = [p for p in products if p["product_name"] in wanted]
+    if not products:
+        print("✗ No products in database. Run init_database.py first.")
+        return 1
+
+    terms = _lexicon_terms()
+    # One level per guidance bucket
+    levels, buckets = [], set()
+    for level in EDUCATION_LEVELS:
+        if education_bucket(level) not in buckets:
+            buckets.add(education_bucket(level))
+            levels.append(level)
+
+    jobs = []
+    for product in products:
+        document = " ".join(fold_text(product.get("product_description", "")).split())
+        for term in terms:
+            if args.only_present and _normalize_term(term) not in document:
+                continue
+            jobs.extend((term, level, product) for level in levels)
+    print(f"Generating up to {len(jobs)} explanations ({len(terms)} terms x {len(levels)} levels x {len(products)} products)...")
+
+    counts = {"computed": 0, "skipped": 0, "failed": 0}
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for status in pool.map(lambda job: _process(*job, args.force), jobs):
+            counts[status] += 1
+            done = sum(counts.values())
+            if done % 100 == 0:
+                print(f"  {done}/{len(jobs)} ({counts['computed']} computed, {counts['skipped']} skipped)")
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✓ Explanations done in {elapsed:.1f}s")
+    print(f"  - Computed: {counts['computed']}")
+    print(f"  - Skipped (fresh): {counts['skipped']}")
+    print(f"  - Failed: {counts['failed']}")
+    return 0 if counts["failed"] == 0 else 2
+
+
+if __name__ == "__main__":
+    try:
+        exit(main())
+    except Exception as e:
+        print(f"\n✗ Error precomputing term explanations: {e}")
+        exit(1)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Pre-render spoken term explanations for NEXXT_AI_PROJECT.
+
+This script synthesizes audio for every explanation in the term_explanations
+table (see precompute_term_explanations.py) and stores it in the on-disk TTS
+cache (src/utils/tts_cache.py). "Voice Explain" clicks for these explanations
+are then served straight from disk.
+
+Explanations whose audio is already cached are skipped unless --force is given.
+Identical explanation texts are synthesized once.
+
+Usage:
+    python prerender_term_audio.py
+    python prerender_term_audio.py --voice alloy --format mp3 --workers 8 --force
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.agents.voice_explain_agent import TTS_MODEL, text_to_speech_openai
+from src.utils.db import get_cached_explanations
+from src.utils.tts_cache import audio_cache, audio_key
+
+
+def _process(text: str, voice: str, audio_format: str, force: bool) -> str:
+    """Synthesize one text. Returns 'rendered', 'skipped' or 'failed'."""
+    if not force and audio_cache.contains(audio_key(text, voice, audio_format, TTS_MODEL), audio_format):
+        return "skipped"
+    return "rendered" if text_to_speech_openai(text, voice=voice, audio_format=audio_format, use_cache=False) else "failed"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pre-render TTS audio for cached term explanations.")
+    parser.add_argument("--voice", default="alloy", help="TTS voice")
+    parser.add_argument("--format", dest="audio_format", default="mp3", help="Audio format")
+    parser.add_argument("--workers", type=int, default=4, help="Texts synthesized in parallel")
+    parser.add_argument("--force", action="store_true", help="Re-render audio already in the cache")
+    args = parser.parse_args()
+
+    if not os.getenv("OPENAI_API_KEY"):
+        print("✗ OPENAI_API_KEY is not set.")
+        return 1
+
+    texts = sorted({row["explanation"] for row in get_cached_explanations() if row["explanation"].strip()})
+    if not texts:
+        print("✗ No cached explanations. Run precompute_term_explanations.py first.")
+        return 1
+    print(f"Rendering up to {len(texts)} explanations (voice={args.voice}, format={args.audio_format})...")
+
+    counts = {"rendered": 0, "skipped": 0, "failed": 0}
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for status in pool.map(lambda text: _process(text, args.voice, args.audio_format, args.force), texts):
+            counts[status] += 1
+            done = sum(counts.values())
+            if done % 50 == 0:
+                print(f"  {done}/{len(texts)} ({counts['rendered']} rendered, {counts['skipped']} skipped)")
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✓ Audio done in {elapsed:.1f}s")
+    print(f"  - Rendered: {counts['rendered']}")
+    print(f"  - Skipped (cached): {counts['skipped']}")
+    print(f"  - Failed: {counts['failed']}")
+    return 0 if counts["failed"] == 0 else 2
+
+
+if __name__ == "__main__":
+    try:
+        exit(main())
+    except Exception as e:
+        print(f"\n✗ Error pre-rendering audio: {e}")
+        exit(1)
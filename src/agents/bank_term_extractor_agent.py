@@ -49,6 +49,15 @@ class ExtractionResult(BaseModel):
   spans: List[ExtractionSpan]
 
 
+class BatchExtractionItem(ExtractionResult):
+  """Extraction result for one text of a batch request (spans relative to that text)."""
+  id: str
+
+
+class BatchExtractionResult(BaseModel):
+  results: List[BatchExtractionItem]
+
+
 bank_term_extractor_agent = Agent(
     name="Bank Term Extractor",
     instructions=(
@@ -15,10 +15,18 @@ The plan includes:
 - Expected outcomes and benefits
 """
 
-from agents import Agent, ModelSettings
+from typing import AsyncIterator, Iterator
+
+from agents import Agent, ModelSettings, Runner
 from src.config.settings import build_default_litellm_model
 
 
+# Upper bound for one plan generation (800-1200 words at up to 4000 tokens)
+PLAN_GENERATION_TIMEOUT_S = 180
+# Max seconds between two streamed chunks (the first one includes model latency)
+PLAN_STREAM_IDLE_TIMEOUT_S = 60
+
+
 financial_plan_agent = Agent(
     name="Financial Plan Generator",
     instructions=(
@@ -138,29 +146,14 @@ financial_plan_agent = Agent(
 )
 
 
-def generate_financial_plan(user_profile: dict, selected_products: list[dict]) -> str:
+def _build_plan_prompt(user_profile: dict, selected_products: list[dict]) -> str:
     """
-    Generate a comprehensive financial plan using the LLM agent.
-    
-    Args:
-        user_profile: Dictionary containing user's financial profile
-            Expected keys: age, marital_status, annual_income, employment_status,
-            has_children, number_of_children, risk_tolerance, financial_goals
-        
-        selected_products: List of product dictionaries
-            Expected keys: product_id, name, name_ro, description, benefits,
-            personalized_summary, score
-    
-    Returns:
-        str: Complete financial plan in markdown format
+    Validate the inputs and build the plan generation prompt.
     
     Raises:
         ValueError: If user_profile or selected_products are empty/invalid
-        RuntimeError: If LLM agent fails to generate plan
     """
     import json
-    from agents import Runner
-    import asyncio
     
     # Validation
     if not user_profile:
@@ -173,7 +166,7 @@ def generate_financial_plan(user_profile: dict, selected_products: list[dict]) -
     user_profile_json = json.dumps(user_profile, ensure_ascii=False, indent=2)
     products_json = json.dumps(selected_products, ensure_ascii=False, indent=2)
     
-    prompt = f"""
+    return f"""
 Generează un plan financiar personalizat complet și profesional în limba română.
 
 PROFIL UTILIZATOR:
@@ -194,18 +187,40 @@ Instrucțiuni:
 
 Generează planul financiar acum:
 """
+
+
+def generate_financial_plan(user_profile: dict, selected_products: list[dict]) -> str:
+    """
+    Generate a comprehensive financial plan using the LLM agent.
     
-    # Run agent
-    async def _generate():
-        result = await Runner.run(financial_plan_agent, prompt)
-        return result
+    Args:
+        user_profile: Dictionary containing user's financial profile
+            Expected keys: age, marital_status, annual_income, employment_status,
+            has_children, number_of_children, risk_tolerance, financial_goals
+        
+        selected_products: List of product dictionaries
+            Expected keys: product_id, name, name_ro, description, benefits,
+            personalized_summary, score
+    
+    Returns:
+        str: Complete financial plan in markdown format
+    
+    Raises:
+        ValueError: If user_profile or selected_products are empty/invalid
+        RuntimeError: If LLM agent fails to generate plan
+    """
+    from src.utils import llm_runtime
+    
+    prompt = _build_plan_prompt(user_profile, selected_products)
     
     try:
-        # Execute async function
-        result = asyncio.run(_generate())
+        # Run agent on the shared LLM runtime loop
+        result = llm_runtime.submit(financial_plan_agent, prompt, timeout=PLAN_GENERATION_TIMEOUT_S).result()
         
         # Extract the plan text from result
-        if hasattr(result, 'final_response'):
+        if getattr(result, 'final_output', None):
+            plan_text = result.final_output
+        elif hasattr(result, 'final_response'):
             plan_text = result.final_response
         elif hasattr(result, 'content'):
             plan_text = result.content
@@ -221,6 +236,76 @@ Generează planul financiar acum:
         raise RuntimeError(f"Failed to generate financial plan: {str(e)}") from e
 
 
+async def _stream_plan_text(prompt: str) -> AsyncIterator[str]:
+    """Yield the plan markdown as the model generates it (text deltas)."""
+    from openai.types.responses import ResponseTextDeltaEvent
+    
+    result = Runner.run_streamed(financial_plan_agent, prompt)
+    emitted = False
+    try:
+        async for event in result.stream_events():
+            if event.type != "raw_response_event" or not isinstance(event.data, ResponseTextDeltaEvent):
+                continue
+            if event.data.delta:
+                emitted = True
+                yield event.data.delta
+        # Models that do not stream text deltas still produce a final output
+        if not emitted and result.final_output:
+            yield str(result.final_output)
+    except Exception as e:
+        raise RuntimeError(f"Failed to generate financial plan: {str(e)}") from e
+    finally:
+        if not result.is_complete:
+            result.cancel()
+
+
+async def astream_financial_plan(user_profile: dict, selected_products: list[dict]) -> AsyncIterator[str]:
+    """
+    Generate the financial plan as a stream of markdown deltas.
+    
+    Concatenating the deltas gives the same text `generate_financial_plan` returns.
+    Must run on the shared LLM runtime loop (e.g. via `llm_runtime.stream`).
+    
+    Raises:
+        ValueError: If user_profile or selected_products are empty/invalid
+        RuntimeError: If LLM agent fails to generate plan
+    """
+    prompt = _build_plan_prompt(user_profile, selected_products)
+    async for delta in _stream_plan_text(prompt):
+        yield delta
+
+
+def stream_financial_plan(user_profile: dict, selected_products: list[dict]) -> Iterator[str]:
+    """
+    Sync generator of markdown deltas for Streamlit (e.g. `st.write_stream`).
+    
+    Inputs are validated before anything is sent to the model; the stream
+    runs on the shared LLM runtime loop and is cancelled if the consumer stops
+    early or PLAN_GENERATION_TIMEOUT_S (the `generate_financial_plan` cap) elapses.
+    
+    Args:
+        user_profile: Dictionary containing user's financial profile
+        selected_products: List of product dictionaries (see `generate_financial_plan`)
+    
+    Returns:
+        Iterator over markdown text deltas
+    
+    Raises:
+        ValueError: If user_profile or selected_products are empty/invalid (raised immediately)
+        RuntimeError: If LLM agent fails to generate plan
+        TimeoutError: If no chunk arrived within PLAN_STREAM_IDLE_TIMEOUT_S, or the
+            plan is not complete within PLAN_GENERATION_TIMEOUT_S
+    """
+    from src.utils import llm_runtime
+    
+    prompt = _build_plan_prompt(user_profile, selected_products)
+    return llm_runtime.stream(
+        _stream_plan_text(prompt),
+        timeout=PLAN_STREAM_IDLE_TIMEOUT_S,
+        total_timeout=PLAN_GENERATION_TIMEOUT_S,
+    )
+
+
 # Utility function for formatting plan output
 def format_plan_for_display(plan_text: str) -> str:
     """
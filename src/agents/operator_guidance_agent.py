@@ -12,9 +12,19 @@ Key Considerations:
 Output: 3-4 sentence guidance for operators on how to approach the client about each product.
 """
 
+import asyncio
+import json
+import os
+import re
+from typing import AsyncIterator, List, Tuple
+
 from agents import Agent, ModelSettings
 from src.config.settings import build_default_litellm_model
 
+# Parallel guidance calls per batch and per-call timeout (seconds)
+DEFAULT_GUIDANCE_CONCURRENCY = int(os.getenv("GUIDANCE_MAX_CONCURRENCY", "4"))
+GUIDANCE_TIMEOUT_S = float(os.getenv("GUIDANCE_TIMEOUT_SECONDS", "60"))
+
 
 operator_guidance_agent = Agent(
     name="Operator Guidance Agent",
@@ -143,22 +153,9 @@ RESPONSE FORMAT: Valid JSON only, no commentary outside JSON structure.
 )
 
 
-def generate_operator_guidance(client_profile: dict, product_info: dict) -> dict:
-    """Generate operator guidance for approaching a specific client about a product.
-    
-    Args:
-        client_profile: Dict with keys: age, education_level, annual_income, 
-                       marital_status, has_children, risk_tolerance, etc.
-        product_info: Dict with keys: product_name, description, benefits
-        
-    Returns:
-        Dict with operator guidance including tone, approach, phrases, examples
-    """
-    import asyncio
-    from agents import Runner
-    
-    # Build prompt for agent
-    prompt = f"""Generate operator communication guidance for the following scenario:
+def _build_guidance_prompt(client_profile: dict, product_info: dict) -> str:
+    """Build the agent prompt for one client-product combination."""
+    return f"""Generate operator communication guidance for the following scenario:
 
 CLIENT PROFILE:
 - Age: {client_profile.get('age', 'N/A')} years old
@@ -187,19 +184,23 @@ Consider:
 
 Return ONLY valid JSON with the structure specified in your instructions.
 """
-    
-    async def _run():
-        result = await Runner.run(operator_guidance_agent, prompt)
-        return result.final_output
-    
-    # Run agent and parse response
+
+
+def _fallback_guidance(product_info: dict) -> dict:
+    """Generic guidance used when the agent call fails."""
+    return {
+        "communication_tone": "profesional",
+        "financial_literacy_level": "mediu",
+        "recommended_approach": f"Prezentați produsul {product_info.get('product_name', '')} clientului, adaptând comunicarea la profilul său.",
+        "key_phrases_to_use": [],
+        "terms_to_avoid": [],
+        "concrete_example": ""
+    }
+
+
+def _parse_guidance_response(response_text: str) -> dict:
+    """Parse the agent's JSON answer, falling back to the raw text as approach."""
     try:
-        response_text = asyncio.run(_run())
-        
-        # Try to parse JSON from response
-        import json
-        import re
-        
         # Extract JSON from response (handle potential markdown code blocks)
         json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
         if json_match:
@@ -212,10 +213,9 @@ Return ONLY valid JSON with the structure specified in your instructions.
             else:
                 json_str = response_text
         
-        guidance = json.loads(json_str)
-        return guidance
+        return json.loads(json_str)
         
-    except json.JSONDecodeError as e:
+    except json.JSONDecodeError:
         # Fallback if JSON parsing fails
         return {
             "communication_tone": "profesional",
@@ -225,13 +225,80 @@ Return ONLY valid JSON with the structure specified in your instructions.
             "terms_to_avoid": [],
             "concrete_example": ""
         }
+
+
+async def _generate_operator_guidance_async(
+    client_profile: dict,
+    product_info: dict,
+    timeout: float = GUIDANCE_TIMEOUT_S,
+) -> dict:
+    """Async guidance generation for one product (never raises)."""
+    from agents import Runner
+
+    try:
+        result = await asyncio.wait_for(
+            Runner.run(operator_guidance_agent, _build_guidance_prompt(client_profile, product_info)),
+            timeout,
+        )
+        return _parse_guidance_response(result.final_output or "")
     except Exception as e:
-        # Generic fallback
-        return {
-            "communication_tone": "profesional",
-            "financial_literacy_level": "mediu",
-            "recommended_approach": f"Prezentați produsul {product_info.get('product_name', '')} clientului, adaptând comunicarea la profilul său.",
-            "key_phrases_to_use": [],
-            "terms_to_avoid": [],
-            "concrete_example": ""
-        }
+        print(f"⚠️ Operator guidance failed for {product_info.get('product_name', '?')}: {e}")
+        return _fallback_guidance(product_info)
+
+
+def generate_operator_guidance(client_profile: dict, product_info: dict) -> dict:
+    """Generate operator guidance for approaching a specific client about a product.
+    
+    Args:
+        client_profile: Dict with keys: age, education_level, annual_income, 
+                       marital_status, has_children, risk_tolerance, etc.
+        product_info: Dict with keys: product_name, description, benefits
+        
+    Returns:
+        Dict with operator guidance including tone, approach, phrases, examples
+    """
+    from src.utils import llm_runtime
+    
+    # Run agent on the shared LLM runtime loop; failures return the generic fallback
+    try:
+        return llm_runtime.run_sync(
+            _generate_operator_guidance_async(client_profile, product_info),
+            timeout=GUIDANCE_TIMEOUT_S + 5,
+        )
+    except Exception:
+        return _fallback_guidance(product_info)
+
+
+async def generate_operator_guidance_batch(
+    client_profile: dict,
+    products: List[dict],
+    *,
+    max_concurrency: int = DEFAULT_GUIDANCE_CONCURRENCY,
+) -> AsyncIterator[Tuple[int, dict]]:
+    """Generate guidance for several products concurrently, yielding as each finishes.
+    
+    At most `max_concurrency` agent calls run at once. Results are yielded in
+    completion order so the caller can render each card as soon as it is ready;
+    every product gets a result (JSON or generic fallback).
+    
+    Args:
+        client_profile: Same dict as for generate_operator_guidance
+        products: List of product_info dicts (product_name, description, benefits)
+        max_concurrency: Maximum number of parallel agent calls
+        
+    Yields:
+        (index into `products`, guidance dict)
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _one(index: int, product_info: dict) -> Tuple[int, dict]:
+        async with semaphore:
+            return index, await _generate_operator_guidance_async(client_profile, product_info)
+
+    tasks = [asyncio.create_task(_one(i, p)) for i, p in enumerate(products)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -35,14 +35,17 @@ litellm._async_failure_callback = []
 
 from agents import Agent, function_tool
 from typing import Annotated, List, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 import json
 import asyncio
 import re
-import threading
-import concurrent.futures
 from src.config.settings import build_default_litellm_model
-from src.utils.db import get_all_products, get_user_by_email
+from src.utils import llm_runtime
+from src.utils.db import get_user_by_email
+from src.utils.product_catalog import product_catalog
+from src.utils.product_parser import extract_product_benefits, extract_product_summary
+from src.utils.product_prescoring import prescore_products
+from src.utils.score_cache import profile_fingerprint, score_cache
 
 
 # ============================================================================
@@ -69,6 +72,9 @@ class ProductJustification(BaseModel):
     key_benefits: List[str]
     recommended_action: str
 
+    # True for neutral placeholders (errors/timeouts); these are never cached
+    _is_fallback: bool = PrivateAttr(default=False)
+
 
 class ProductRecommendationContext(BaseModel):
     """Context for product recommendation operations."""
@@ -82,135 +88,33 @@ class ProductRecommendationContext(BaseModel):
 # ============================================================================
 
 def _get_products_from_database() -> List[Dict[str, Any]]:
-    """Fetch all products from PostgreSQL database.
+    """Fetch all products (served from the shared product catalog cache).
     
     Returns:
         List of products with id, product_name, product_description
     """
-    return get_all_products()
-
-
-def _extract_product_summary(markdown_content: str) -> str:
-    """Extract a concise summary from markdown product description.
-    
-    Args:
-        markdown_content: Full markdown product description
-        
-    Returns:
-        Extracted summary (first 300 chars of general description)
-    """
-    # Try to extract content after "## Descriere Generală" or similar
-    description_match = re.search(
-        r'## Descriere.*?\n\n(.*?)(?:\n##|\Z)',
-        markdown_content,
-        re.DOTALL | re.IGNORECASE
-    )
-    
-    if description_match:
-        summary = description_match.group(1).strip()
-        # Clean up markdown formatting
-        summary = re.sub(r'\*\*', '', summary)
-        summary = re.sub(r'\n+', ' ', summary)
-        return summary[:300]
-    
-    # Fallback: return first paragraph
-    lines = markdown_content.split('\n')
-    for line in lines:
-        line = line.strip()
-        if line and not line.startswith('#'):
-            return line[:300]
-    
-    return "Produs bancar disponibil"
+    return product_catalog.get_products()
 
 
-def _extract_product_benefits(markdown_content: str) -> List[str]:
-    """Extract key benefits from markdown product description.
-    
-    Args:
-        markdown_content: Full markdown product description
-        
-    Returns:
-        List of benefit strings (up to 5)
-    """
-    benefits = []
-    
-    # Try to find "Avantaje" or "Beneficii" section
-    benefits_match = re.search(
-        r'## (?:Avantaje|Beneficii).*?\n(.*?)(?:\n##|\Z)',
-        markdown_content,
-        re.DOTALL | re.IGNORECASE
-    )
-    
-    if benefits_match:
-        content = benefits_match.group(1)
-        # Extract bullet points or numbered items
-        lines = content.split('\n')
-        for line in lines:
-            line = line.strip()
-            # Match bullets like "- text" or "* text" or "### number. text"
-            if re.match(r'^[-*]\s+', line) or re.match(r'^###\s+\d+\.', line):
-                benefit = re.sub(r'^[-*]\s+', '', line)
-                benefit = re.sub(r'^###\s+\d+\.\s+', '', benefit)
-                benefit = re.sub(r'\*\*', '', benefit)
-                if benefit:
-                    benefits.append(benefit[:150])
-                if len(benefits) >= 5:
-                    break
-    
-    # Fallback: extract from "Caracteristici Principale"
-    if not benefits:
-        char_match = re.search(
-            r'## Caracteristici.*?\n(.*?)(?:\n##|\Z)',
-            markdown_content,
-            re.DOTALL | re.IGNORECASE
-        )
-        if char_match:
-            content = char_match.group(1)
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith('#') and len(line) > 10:
-                    benefits.append(line[:150])
-                if len(benefits) >= 5:
-                    break
-    
-    return benefits[:5] if benefits else ["Consulta descrierea completa pentru detalii"]
+# Parsing helpers live in src/utils/product_parser.py (kept here for existing imports)
+_extract_product_summary = extract_product_summary
+_extract_product_benefits = extract_product_benefits
 
 
 def _get_products_catalog_dict() -> dict:
-    """Get products catalog from database with structured information.
+    """Get products catalog with structured information.
     
-    This function fetches products from the database and structures them
-    for backward compatibility with the UI components.
+    Parsed once per product version by the shared product catalog cache and
+    re-validated with a cheap max(updated_at) query.
     
     Returns:
         Dict mapping product names to structured data with keys:
         - name: Product display name
         - description: Concise product summary
         - benefits: List of key benefits
+        - sections: Dict of H2 section heading -> section body
     """
-    db_products = _get_products_from_database()
-    
-    catalog = {}
-    for product in db_products:
-        product_name = product["product_name"]
-        markdown_content = product["product_description"]
-        
-        # Extract structured data from markdown
-        summary = _extract_product_summary(markdown_content)
-        benefits = _extract_product_benefits(markdown_content)
-        
-        # Extract display name from markdown (first H1 heading) or use product_name
-        title_match = re.search(r'^#\s+(.+?)(?:\s*-\s*Raiffeisen)?$', markdown_content, re.MULTILINE)
-        display_name = title_match.group(1).strip() if title_match else product_name.replace('_', ' ').title()
-        
-        catalog[product_name] = {
-            "name": display_name,
-            "description": summary,
-            "benefits": benefits,
-        }
-    
-    return catalog
+    return product_catalog.get_catalog()
 
 
 
@@ -248,10 +152,65 @@ DO NOT use tools. DO NOT ask questions. Respond IMMEDIATELY with JSON.""",
 
 
 
+# Batched variant: scores K products in ONE request so the profile preamble and the
+# scoring guide are sent once per batch instead of once per product
+product_batch_justification_agent = Agent[ProductRecommendationContext](
+    name="Product Batch Justification Expert",
+    instructions="""You are a banking product expert. Analyze the fit between ONE user and SEVERAL products and respond IMMEDIATELY with ONLY a valid JSON array.
+
+Scoring Guide:
+- 0.9-1.0: Perfect fit
+- 0.7-0.89: Good fit
+- 0.5-0.69: Moderate fit
+- 0.3-0.49: Weak fit
+- 0.0-0.29: Poor fit
+
+Consider: age, income, family, risk tolerance, goals, life stage. Score each product independently.
+
+CRITICAL: Output ONLY a JSON array with EXACTLY one object per input product, in input order. No explanations, no markdown:
+
+[
+  {
+    "product_name": "exact product name from input",
+    "relevance_score": 0.0-1.0,
+    "justification": "2-3 sentences why this score based on user specifics",
+    "key_benefits": ["3-5 benefits relevant to THIS user"],
+    "recommended_action": "concrete next step with amounts/timeframes"
+  }
+]
+
+DO NOT use tools. DO NOT ask questions. Respond IMMEDIATELY with the JSON array.""",
+    model=build_default_litellm_model(),
+)
+
+
+
 # ============================================================================
 # SYNCHRONOUS WRAPPER FOR AGENT TOOL
 # ============================================================================
 
+def _fallback_justification(product_name: str, reason: str) -> ProductJustification:
+    """Neutral justification used when a product could not be analyzed."""
+    justification = ProductJustification(
+        product_name=product_name,
+        relevance_score=0.5,
+        justification=reason[:150],
+        key_benefits=["Review product details manually"],
+        recommended_action="Contact advisor for personalized recommendation"
+    )
+    justification._is_fallback = True
+    return justification
+
+
+def _profile_prompt_line(user_profile: UserProfile) -> str:
+    """One-line user profile used in justification prompts."""
+    return (
+        f"{user_profile.age}y, {user_profile.annual_income} RON/year, {user_profile.marital_status}, "
+        f"{user_profile.employment_status}, children={user_profile.has_children}, "
+        f"risk={user_profile.risk_tolerance}, goals={user_profile.financial_goals}"
+    )
+
+
 async def _analyze_product_fit_async(
     product_name: str,
     product_description: str,
@@ -275,7 +234,7 @@ async def _analyze_product_fit_async(
 PRODUCT: {product_name}
 DESCRIPTION: {product_description[:1500]}
 
-USER: {user_profile.age}y, {user_profile.annual_income} RON/year, {user_profile.marital_status}, {user_profile.employment_status}, children={user_profile.has_children}, risk={user_profile.risk_tolerance}, goals={user_profile.financial_goals}
+USER: {_profile_prompt_line(user_profile)}
 
 OUTPUT ONLY THIS JSON (no other text):
 {{
@@ -298,26 +257,16 @@ OUTPUT ONLY THIS JSON (no other text):
         json_match = re.search(r'\{.*\}', output, re.DOTALL)
         if json_match:
             parsed = json.loads(json_match.group())
-            return ProductJustification(**parsed)
+            justification = ProductJustification(**parsed)
+            justification.relevance_score = min(max(justification.relevance_score, 0.0), 1.0)
+            return justification
         else:
             # Fallback if JSON parsing fails
-            return ProductJustification(
-                product_name=product_name,
-                relevance_score=0.5,
-                justification="Could not generate detailed analysis",
-                key_benefits=["Please review product details"],
-                recommended_action="Contact advisor for more information"
-            )
+            return _fallback_justification(product_name, "Could not generate detailed analysis")
     except Exception as e:
         print(f"Error analyzing product {product_name}: {e}")
         # Return neutral score on error
-        return ProductJustification(
-            product_name=product_name,
-            relevance_score=0.5,
-            justification=f"Analysis error: {str(e)[:100]}",
-            key_benefits=["Review product details manually"],
-            recommended_action="Contact advisor for personalized recommendation"
-        )
+        return _fallback_justification(product_name, f"Analysis error: {str(e)[:100]}")
 
 
 def _analyze_product_fit_sync(
@@ -325,61 +274,379 @@ def _analyze_product_fit_sync(
     product_description: str,
     user_profile: UserProfile
 ) -> ProductJustification:
-    """Synchronous wrapper that handles event loop properly.
+    """Synchronous wrapper for a single product analysis.
     
-    Works in Streamlit (no event loop in thread) and tests.
-    Always creates a new event loop in a separate thread for safety.
+    Works in Streamlit (no event loop in the script thread) and tests. The call
+    runs on the shared LLM runtime loop and is cancelled there after 45 seconds.
     """
-    result_container = []
-    exception_container = []
-    
-    def run_in_thread():
-        """Run async function in a new thread with its own event loop."""
-        new_loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(new_loop)
+    try:
+        return llm_runtime.run_sync(
+            _analyze_product_fit_async(product_name, product_description, user_profile),
+            timeout=45,  # 45 second timeout per product
+        )
+    except Exception as e:
+        print(f"Error in sync wrapper for {product_name}: {e}")
+        return _fallback_justification(product_name, f"Analysis error: {str(e)[:100]}")
+
+
+def _parse_batch_justifications(output: str, product_names: List[str]) -> Dict[str, ProductJustification]:
+    """Parse a JSON array of ProductJustification objects from a batch response.
+
+    Only entries whose product_name matches one of `product_names` are kept;
+    malformed entries are skipped so the caller can fall back per product.
+
+    Returns:
+        Dict mapping requested product name -> ProductJustification
+    """
+    array_match = re.search(r'\[.*\]', output or "", re.DOTALL)
+    if not array_match:
+        return {}
+    try:
+        items = json.loads(array_match.group())
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(items, list):
+        return {}
+
+    by_key = {name.strip().lower(): name for name in product_names}
+    parsed: Dict[str, ProductJustification] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        name = by_key.get(str(item.get("product_name", "")).strip().lower())
+        if name is None or name in parsed:
+            continue
         try:
-            result = new_loop.run_until_complete(
-                _analyze_product_fit_async(product_name, product_description, user_profile)
-            )
-            result_container.append(result)
-        except Exception as e:
-            exception_container.append(e)
-        finally:
-            new_loop.close()
+            justification = ProductJustification(**{**item, "product_name": name})
+        except Exception:
+            continue
+        justification.relevance_score = min(max(justification.relevance_score, 0.0), 1.0)
+        parsed[name] = justification
+    return parsed
+
+
+async def _analyze_products_batch_async(
+    products: List[Dict[str, Any]],
+    user_profile: UserProfile
+) -> Dict[str, ProductJustification]:
+    """Score several products with ONE call to the batch justification agent.
     
-    try:
-        thread = threading.Thread(target=run_in_thread)
-        thread.start()
-        thread.join(timeout=45)  # 45 second timeout per product
+    Args:
+        products: Product rows with product_name and product_description
+        user_profile: User's financial profile
         
-        if not thread.is_alive():
-            # Thread completed
-            if exception_container:
-                raise exception_container[0]
-            if result_container:
-                return result_container[0]
-            else:
-                raise RuntimeError("Thread completed but no result returned")
-        else:
-            # Thread is still running - timeout
-            raise TimeoutError(f"Product analysis timed out after 45 seconds")
-            
+    Returns:
+        Dict mapping product name -> ProductJustification. Products missing from
+        the response (short or malformed array) are simply absent.
+    """
+    from agents import Runner
+    
+    product_names = [p["product_name"] for p in products]
+    products_block = "\n\n".join(
+        f"PRODUCT {idx}: {p['product_name']}\nDESCRIPTION: {p['product_description'][:1000]}"
+        for idx, p in enumerate(products, 1)
+    )
+    
+    prompt = f"""Analyze these {len(products)} banking products for the user and output ONLY a valid JSON array.
+
+USER: {_profile_prompt_line(user_profile)}
+
+{products_block}
+
+OUTPUT ONLY A JSON ARRAY with one object per product, using these exact product_name values: {json.dumps(product_names, ensure_ascii=False)}"""
+    
+    try:
+        result = await Runner.run(product_batch_justification_agent, prompt, max_turns=3)
+        output = result.final_output if hasattr(result, 'final_output') else str(result)
+        print(f"[Agent Output] batch of {len(products)}: {output[:100]}...")
+        return _parse_batch_justifications(output, product_names)
     except Exception as e:
-        print(f"Error in sync wrapper for {product_name}: {e}")
-        return ProductJustification(
-            product_name=product_name,
-            relevance_score=0.5,
-            justification=f"Analysis error: {str(e)[:100]}",
-            key_benefits=["Review product details manually"],
-            recommended_action="Contact advisor for personalized recommendation"
+        print(f"Error analyzing product batch {product_names}: {e}")
+        return {}
+
+
+# ============================================================================
+# CONCURRENT RANKING ENGINE
+# ============================================================================
+
+# Max number of justification requests in flight at once (Bedrock rate limits)
+DEFAULT_RANKING_CONCURRENCY = int(_env_os.getenv("RANKING_MAX_CONCURRENCY", "4"))
+
+# Deadline for the whole ranking batch, in seconds
+DEFAULT_RANKING_DEADLINE_S = float(_env_os.getenv("RANKING_DEADLINE_SECONDS", "60"))
+
+# Products scored per justification request; 1 = one request per product (default),
+# K > 1 = batched mode (one prompt for K products, per-product fallback on bad output)
+DEFAULT_SCORING_BATCH_SIZE = int(_env_os.getenv("RANKING_BATCH_SIZE", "1"))
+
+# Only the top-K products of the deterministic pre-scorer go to the LLM (0 = all)
+DEFAULT_PRESCORE_TOP_K = int(_env_os.getenv("RANKING_PRESCORE_TOP_K", "5"))
+
+
+def _scored_product_entry(product_name: str, justification: ProductJustification) -> dict:
+    """Convert a justification into the ranking dict returned to the UI."""
+    return {
+        "product_id": product_name,  # Using product_name as ID
+        "score": round(justification.relevance_score, 3),
+        "justification": justification.justification,
+        "key_benefits": justification.key_benefits,
+        "recommended_action": justification.recommended_action,
+        "is_fallback": justification._is_fallback,
+    }
+
+
+def _load_products_for_ranking(max_products: int | None = None) -> List[Dict[str, Any]]:
+    """Fetch products from the database, optionally limited to `max_products`."""
+    db_products = _get_products_from_database()
+
+    if max_products and len(db_products) > max_products:
+        print(f"[Product Recommendation] Limiting analysis to {max_products} products (out of {len(db_products)})")
+        db_products = db_products[:max_products]
+
+    return db_products
+
+
+async def _score_product_async(
+    product: Dict[str, Any],
+    user_profile: UserProfile,
+    semaphore: asyncio.Semaphore,
+) -> dict:
+    """Score a single product while holding a slot of the concurrency limit."""
+    async with semaphore:
+        justification = await _analyze_product_fit_async(
+            product_name=product["product_name"],
+            product_description=product["product_description"],
+            user_profile=user_profile,
+        )
+    return _scored_product_entry(product["product_name"], justification)
+
+
+async def _score_batch_async(
+    products: List[Dict[str, Any]],
+    user_profile: UserProfile,
+    semaphore: asyncio.Semaphore,
+) -> List[dict]:
+    """Score a chunk of products with one batched request.
+
+    Products missing from the batch response (short or malformed JSON array)
+    fall back to individual `_analyze_product_fit_async` calls.
+    """
+    if len(products) == 1:
+        return [await _score_product_async(products[0], user_profile, semaphore)]
+
+    async with semaphore:
+        justifications = await _analyze_products_batch_async(products, user_profile)
+
+    entries = [
+        _scored_product_entry(p["product_name"], justifications[p["product_name"]])
+        for p in products
+        if p["product_name"] in justifications
+    ]
+    missing = [p for p in products if p["product_name"] not in justifications]
+    if missing:
+        print(f"[Product Recommendation] Batch returned {len(entries)}/{len(products)} results; "
+              f"falling back to per-product calls for {len(missing)}")
+        entries.extend(
+            await asyncio.gather(*(_score_product_async(p, user_profile, semaphore) for p in missing))
         )
+    return entries
+
+
+async def iter_product_scores_async(
+    products: List[Dict[str, Any]],
+    user_profile: UserProfile,
+    *,
+    max_concurrency: int = DEFAULT_RANKING_CONCURRENCY,
+    deadline_s: float = DEFAULT_RANKING_DEADLINE_S,
+    batch_size: int = DEFAULT_SCORING_BATCH_SIZE,
+):
+    """Score all products concurrently on the current event loop.
+
+    Every justification request is started at once (bounded by
+    `max_concurrency`) and results are yielded in completion order, so the
+    caller can render partial results while slower products are still running.
+    Products that have not finished when `deadline_s` elapses are cancelled and
+    yielded with a neutral score.
+
+    Args:
+        products: Product rows with product_name and product_description
+        user_profile: User's financial profile
+        max_concurrency: Max number of justification requests in flight
+        deadline_s: Deadline for the whole batch, in seconds
+        batch_size: Products per request (> 1 enables batched scoring)
+
+    Yields:
+        Ranking dicts (product_id, score, justification, key_benefits, recommended_action)
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    batch_size = max(1, batch_size)
+    chunks = [products[i:i + batch_size] for i in range(0, len(products), batch_size)]
+    tasks = {
+        asyncio.create_task(_score_batch_async(chunk, user_profile, semaphore)): [p["product_name"] for p in chunk]
+        for chunk in chunks
+    }
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_s
+    pending = set(tasks)
+
+    try:
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    entries = task.result()
+                except Exception as e:
+                    print(f"[Product Recommendation] ✗ Error analyzing {tasks[task]}: {e}")
+                    entries = [
+                        _scored_product_entry(name, _fallback_justification(name, f"Could not analyze: {str(e)[:100]}"))
+                        for name in tasks[task]
+                    ]
+                for entry in entries:
+                    yield entry
+
+        for task in pending:
+            task.cancel()
+            for product_name in tasks[task]:
+                print(f"[Product Recommendation] ✗ {product_name[:50]}: deadline of {deadline_s:g}s exceeded")
+                yield _scored_product_entry(
+                    product_name,
+                    _fallback_justification(product_name, f"Analysis did not finish within {deadline_s:g} seconds"),
+                )
+    finally:
+        # Generator closed early (or deadline hit): do not leave orphaned requests running
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def iter_product_scores(
+    user_profile_json: str,
+    max_products: int | None = None,
+    *,
+    max_concurrency: int = DEFAULT_RANKING_CONCURRENCY,
+    deadline_s: float = DEFAULT_RANKING_DEADLINE_S,
+    batch_size: int = DEFAULT_SCORING_BATCH_SIZE,
+    use_cache: bool = True,
+    prescore_top_k: int | None = DEFAULT_PRESCORE_TOP_K,
+):
+    """Synchronous generator over product scores, yielded as each product finishes.
+
+    Cached scores for the same profile fingerprint (see src/utils/score_cache.py)
+    are yielded first without any LLM call. The remaining candidates run on the
+    shared LLM runtime loop (src/utils/llm_runtime.py) instead of one thread +
+    loop per product, and results are streamed back so it is safe to consume
+    from the Streamlit script thread. Products pruned by the deterministic
+    pre-scorer (see src/utils/product_prescoring.py) come last, after every
+    candidate, whatever their rule-based score.
+
+    Args:
+        user_profile_json: JSON string of UserProfile
+        max_products: Optional limit on number of products to analyze
+        max_concurrency: Max number of justification requests in flight
+        deadline_s: Deadline for the whole batch, in seconds
+        batch_size: Products per request (> 1 enables batched scoring)
+        use_cache: Serve/store scores through the recommendation score cache
+        prescore_top_k: Send only the top-K pre-scored products to the LLM (None/0 = all)
+
+    Yields:
+        Ranking dicts in completion order (NOT sorted by score)
+    """
+    profile = UserProfile.model_validate_json(user_profile_json)
+    all_products = _load_products_for_ranking(max_products)
+
+    if not all_products:
+        print("Warning: No products found in database. Returning empty list.")
+        return
+
+    all_products, pruned = prescore_products(profile.model_dump(), all_products, prescore_top_k)
+    yield from _iter_candidate_scores(
+        profile,
+        all_products,
+        max_concurrency=max_concurrency,
+        deadline_s=deadline_s,
+        batch_size=batch_size,
+        use_cache=use_cache,
+    )
+    for entry in pruned:
+        print(f"[Product Recommendation] – {entry['product_id'][:50]}: pruned by pre-scorer ({entry['score']:.2f})")
+        yield entry
+
+
+def _iter_candidate_scores(
+    profile: UserProfile,
+    all_products: list[dict],
+    *,
+    max_concurrency: int,
+    deadline_s: float,
+    batch_size: int,
+    use_cache: bool,
+):
+    """Cached + LLM scores for the pre-scoring candidates (see `iter_product_scores`)."""
+    profile_hash = profile_fingerprint(profile)
+    cached = score_cache.get_many(profile_hash, all_products) if use_cache else {}
+    for product in all_products:
+        if product["product_name"] in cached:
+            print(f"[Product Recommendation] ✓ {product['product_name'][:50]}: cached score {cached[product['product_name']]['score']:.2f}")
+            yield cached[product["product_name"]]
+
+    db_products = [p for p in all_products if p["product_name"] not in cached]
+    if not db_products:
+        return
+    products_by_name = {p["product_name"]: p for p in db_products}
+
+    print(f"[Product Recommendation] Analyzing {len(db_products)} products (concurrency={max_concurrency}, batch_size={batch_size}, deadline={deadline_s:g}s)...")
+
+    engine = iter_product_scores_async(
+        db_products,
+        profile,
+        max_concurrency=max_concurrency,
+        deadline_s=deadline_s,
+        batch_size=batch_size,
+    )
+
+    seen: set[str] = set()
+    to_cache: list[tuple[dict, dict]] = []
+    try:
+        # The engine enforces the deadline itself; the grace period only guards a stuck loop
+        for item in llm_runtime.stream(engine, timeout=deadline_s + 15):
+            seen.add(item["product_id"])
+            print(f"[Product Recommendation] ✓ {item['product_id'][:50]}: Score {item['score']:.2f}")
+            if use_cache and not item.get("is_fallback"):
+                to_cache.append((products_by_name[item["product_id"]], item))
+            yield item
+    except Exception as e:
+        print(f"[Product Recommendation] ✗ Ranking batch failed: {e}")
+    finally:
+        # One write for the whole batch; partial results are cached too
+        if to_cache:
+            score_cache.put_many(profile_hash, to_cache)
+
+    # Products lost to a stuck/failed batch still get a neutral entry
+    for product in db_products:
+        if product["product_name"] not in seen:
+            yield _scored_product_entry(
+                product["product_name"],
+                _fallback_justification(product["product_name"], "Analysis did not complete"),
+            )
 
 
 # ============================================================================
 # MAIN RANKING FUNCTION (NEW AI-POWERED APPROACH)
 # ============================================================================
 
-def rank_products_for_profile(user_profile_json: str, max_products: int = None) -> list[dict]:
+def rank_products_for_profile(
+    user_profile_json: str,
+    max_products: int = None,
+    *,
+    max_concurrency: int = DEFAULT_RANKING_CONCURRENCY,
+    deadline_s: float = DEFAULT_RANKING_DEADLINE_S,
+    batch_size: int = DEFAULT_SCORING_BATCH_SIZE,
+    use_cache: bool = True,
+    prescore_top_k: int | None = DEFAULT_PRESCORE_TOP_K,
+) -> list[dict]:
     """MAIN RANKING FUNCTION: Rank all products using AI-powered justification agent.
     
     This is the core output of the Product Recommendation Agent. Instead of heuristic
@@ -387,13 +654,27 @@ def rank_products_for_profile(user_profile_json: str, max_products: int = None)
     
     Architecture:
     1. Fetch all products from database
-    2. For each product, call the Justification Agent Tool
+    1b. Deterministic pre-scoring keeps only the top-K candidates for the LLM
+    2. Call the Justification Agent Tool for ALL candidates concurrently (one shared loop)
     3. Agent analyzes product-user fit and returns score + justification
     4. Sort products by relevance score
     
+    Latency follows the slowest product instead of the sum of all products, and a
+    repeat lookup for the same profile is served from the score cache.
+    Use `iter_product_scores` to consume partial results as they finish.
+    
     Args:
         user_profile_json: JSON string of UserProfile
         max_products: Optional limit on number of products to analyze (for performance)
+        max_concurrency: Max number of justification requests in flight
+        deadline_s: Deadline for the whole batch; unfinished products get a neutral score
+        batch_size: Products per justification request. 1 = one request per product;
+            K > 1 sends K products in one prompt (profile + scoring guide sent once)
+            and falls back to per-product calls for anything missing from the reply
+        use_cache: Reuse scores cached for the same profile fingerprint and product
+            description (in-process LRU + Postgres tier, see src/utils/score_cache.py)
+        prescore_top_k: Only the top-K products of the deterministic pre-scorer are
+            sent to the LLM; the rest get a rule-based score and templated justification
     
     Returns:
         List of dicts with keys: product_id, score, justification
@@ -413,63 +694,24 @@ def rank_products_for_profile(user_profile_json: str, max_products: int = None)
     """
     print(f"[Product Recommendation] Starting analysis for user profile...")
     
-    # Parse user profile
-    profile = UserProfile.model_validate_json(user_profile_json)
-    
-    # Fetch products from database
-    db_products = _get_products_from_database()
+    scored_products = list(
+        iter_product_scores(
+            user_profile_json,
+            max_products,
+            max_concurrency=max_concurrency,
+            deadline_s=deadline_s,
+            batch_size=batch_size,
+            use_cache=use_cache,
+            prescore_top_k=prescore_top_k,
+        )
+    )
     
-    if not db_products:
-        print("Warning: No products found in database. Returning empty list.")
+    if not scored_products:
         return []
     
-    # Optionally limit number of products for performance
-    if max_products and len(db_products) > max_products:
-        print(f"[Product Recommendation] Limiting analysis to {max_products} products (out of {len(db_products)})")
-        db_products = db_products[:max_products]
-    
-    print(f"[Product Recommendation] Analyzing {len(db_products)} products...")
-    
-    # Score all products using AI agent
-    scored_products = []
-    
-    for idx, product in enumerate(db_products, 1):
-        product_name = product["product_name"]
-        product_description = product["product_description"]
-        
-        print(f"[Product Recommendation] {idx}/{len(db_products)}: Analyzing {product_name[:50]}...")
-        
-        try:
-            # Call the AI justification agent
-            justification = _analyze_product_fit_sync(
-                product_name=product_name,
-                product_description=product_description,
-                user_profile=profile
-            )
-            
-            scored_products.append({
-                "product_id": product_name,  # Using product_name as ID
-                "score": round(justification.relevance_score, 3),
-                "justification": justification.justification,
-                "key_benefits": justification.key_benefits,
-                "recommended_action": justification.recommended_action,
-            })
-            
-            print(f"[Product Recommendation] ✓ {product_name[:50]}: Score {justification.relevance_score:.2f}")
-            
-        except Exception as e:
-            print(f"[Product Recommendation] ✗ Error analyzing {product_name}: {e}")
-            # Add product with neutral score on error
-            scored_products.append({
-                "product_id": product_name,
-                "score": 0.5,
-                "justification": f"Could not analyze: {str(e)[:100]}",
-                "key_benefits": ["Contact advisor for details"],
-                "recommended_action": "Contact advisor",
-            })
-    
-    # Sort by score descending (highest relevance first)
-    scored_products.sort(key=lambda x: x["score"], reverse=True)
+    # Sort by score descending (highest relevance first); pruned products always
+    # rank below the candidates the LLM analyzed
+    scored_products.sort(key=lambda x: (not x.get("pruned"), x["score"]), reverse=True)
     
     print(f"[Product Recommendation] Analysis complete. Top product: {scored_products[0]['product_id'][:50]} ({scored_products[0]['score']})")
     
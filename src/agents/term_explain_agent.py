@@ -10,18 +10,22 @@ Usage:
     text = explain_term(term, summary_text, education_level, product_name, product_markdown)
 
 The function returns a short Romanian explanation (1-2 sentences).
+Explanations are stored per (term, education bucket, product) in
+src/utils/explanation_cache.py, so repeated selections are lookups.
+`stream_explanation` yields the same explanation as text deltas (used by the
+streaming voice pipeline).
 """
 
 from __future__ import annotations
 
-import asyncio
-import threading
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from pydantic import BaseModel
 
 from agents import Agent, Runner  # from openai-agents SDK
 from src.config.settings import build_default_litellm_model, AWS_BEDROCK_API_KEY
+from src.utils import llm_runtime
+from src.utils.explanation_cache import explanation_cache
 
 
 class ExplainContext(BaseModel):
@@ -30,20 +34,38 @@ class ExplainContext(BaseModel):
     product_name: str | None = None
 
 
-def _education_guidance(level: Optional[str]) -> str:
-    """Map UI education level to guidance for tone/detail."""
+# UI education levels (page 2 selectbox)
+EDUCATION_LEVELS = ["Fără studii superioare", "Liceu", "Facultate", "Master", "Doctorat"]
+
+_EDUCATION_GUIDANCE = {
+    "unspecified": "Folosește un limbaj clar și accesibil, evită jargonul în exces.",
+    "fara_studii": "Explică foarte simplu, cu cuvinte uzuale, fără termeni tehnici. 1-2 propoziții maxime.",
+    "liceu": "Explică pe scurt (1-2 propoziții), evită jargonul și formulele.",
+    "facultate": "Explicație succintă (1-2 propoziții), poți folosi termeni uzuali din domeniul financiar.",
+    "postuniversitar": "Explicație concisă (1-2 propoziții), poți include un termen tehnic dacă adaugă claritate.",
+    "other": "Explică pe scurt, clar, fără fraze lungi.",
+}
+
+
+def education_bucket(level: Optional[str]) -> str:
+    """Map a UI education level to its guidance bucket (levels with the same guidance share one)."""
     if not level:
-        return "Folosește un limbaj clar și accesibil, evită jargonul în exces."
+        return "unspecified"
     level = level.lower()
     if "fără" in level or "fara" in level:
-        return "Explică foarte simplu, cu cuvinte uzuale, fără termeni tehnici. 1-2 propoziții maxime."
+        return "fara_studii"
     if "liceu" in level:
-        return "Explică pe scurt (1-2 propoziții), evită jargonul și formulele."
+        return "liceu"
     if "facultate" in level:
-        return "Explicație succintă (1-2 propoziții), poți folosi termeni uzuali din domeniul financiar."
+        return "facultate"
     if "master" in level or "doctorat" in level:
-        return "Explicație concisă (1-2 propoziții), poți include un termen tehnic dacă adaugă claritate."
-    return "Explică pe scurt, clar, fără fraze lungi."
+        return "postuniversitar"
+    return "other"
+
+
+def _education_guidance(level: Optional[str]) -> str:
+    """Map UI education level to guidance for tone/detail."""
+    return _EDUCATION_GUIDANCE[education_bucket(level)]
 
 
 # Create the agent that crafts the short explanation
@@ -60,14 +82,17 @@ term_explain_agent = Agent[ExplainContext](
 )
 
 
-async def _explain_term_async(
+# Maximum explanation length (characters) to ensure brevity
+MAX_EXPLANATION_CHARS = 300
+
+
+def _build_explain_prompt(
     term: str,
     summary_text: str,
     education_level: Optional[str],
     product_name: Optional[str],
     product_markdown: Optional[str],
 ) -> str:
-    context = ExplainContext(term=term, education_level=education_level, product_name=product_name)
     guidance = _education_guidance(education_level)
 
     # Keep inputs short to reduce latency and cost
@@ -82,10 +107,79 @@ DOCUMENT PRODUS (fragment markdown):\n{product_snippet}
 
 CERINȚĂ: {guidance}
 """
+    return prompt
+
+
+async def _explain_term_async(
+    term: str,
+    summary_text: str,
+    education_level: Optional[str],
+    product_name: Optional[str],
+    product_markdown: Optional[str],
+) -> str:
+    prompt = _build_explain_prompt(term, summary_text, education_level, product_name, product_markdown)
     result = await Runner.run(term_explain_agent, prompt, max_turns=1)
     output = getattr(result, "final_output", str(result))
     # Return at most ~300 chars to ensure brevity
-    return (output or "").strip()[:300]
+    return (output or "").strip()[:MAX_EXPLANATION_CHARS]
+
+
+async def stream_explanation(
+    term: str,
+    summary_text: str,
+    education_level: Optional[str],
+    product_name: Optional[str],
+    product_markdown: Optional[str],
+    *,
+    product_key: Optional[str] = None,
+    use_cache: bool = True,
+) -> AsyncIterator[str]:
+    """Yield the explanation text as it is generated (text deltas).
+
+    A stored explanation is yielded at once; a freshly generated one is stored
+    when the stream completes. Must run on the shared LLM runtime loop
+    (e.g. via `llm_runtime.stream`).
+    """
+    from openai.types.responses import ResponseTextDeltaEvent
+
+    bucket = education_bucket(education_level)
+    cache_product = product_key or product_name
+    if use_cache:
+        # Postgres tier awaited through src/utils/async_db.py (never blocks the loop)
+        cached = await explanation_cache.aget(term, bucket, cache_product)
+        if cached:
+            yield cached
+            return
+
+    if not AWS_BEDROCK_API_KEY:
+        yield "Setați AWS_BEARER_TOKEN_BEDROCK în .env pentru a genera explicația."
+        return
+
+    prompt = _build_explain_prompt(term, summary_text, education_level, product_name, product_markdown)
+    result = Runner.run_streamed(term_explain_agent, prompt, max_turns=1)
+    parts: list[str] = []
+    emitted = 0
+    try:
+        async for event in result.stream_events():
+            if event.type != "raw_response_event" or not isinstance(event.data, ResponseTextDeltaEvent):
+                continue
+            delta = event.data.delta
+            if not emitted:
+                delta = delta.lstrip()
+            delta = delta[: MAX_EXPLANATION_CHARS - emitted]
+            if delta:
+                parts.append(delta)
+                emitted += len(delta)
+                yield delta
+            if emitted >= MAX_EXPLANATION_CHARS:
+                break
+    finally:
+        if not result.is_complete:
+            result.cancel()
+
+    text = "".join(parts).strip()
+    if text:
+        await explanation_cache.aput(term, bucket, cache_product, text)
 
 
 def explain_term(
@@ -94,37 +188,41 @@ def explain_term(
     education_level: Optional[str],
     product_name: Optional[str],
     product_markdown: Optional[str],
+    *,
+    product_key: Optional[str] = None,
+    use_cache: bool = True,
 ) -> str:
     """Thread-safe sync wrapper for Streamlit.
 
-    Always runs the coroutine in a separate thread with its own event loop
-    to avoid event loop conflicts inside Streamlit.
+    Runs the coroutine on the shared LLM runtime loop (src/utils/llm_runtime.py);
+    on timeout the call is cancelled there instead of leaving a thread behind.
+
+    Args:
+        product_key: Stable product identifier for the explanation store
+            (defaults to product_name)
+        use_cache: Serve/store the explanation from/in the explanation store
     """
+    bucket = education_bucket(education_level)
+    cache_product = product_key or product_name
+    if use_cache:
+        cached = explanation_cache.get(term, bucket, cache_product)
+        if cached:
+            return cached
+
     if not AWS_BEDROCK_API_KEY:
         return "Setați AWS_BEARER_TOKEN_BEDROCK în .env pentru a genera explicația."
 
-    result_container: list[str] = []
-    exc_container: list[BaseException] = []
-
-    def _runner():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            text = loop.run_until_complete(
-                _explain_term_async(term, summary_text, education_level, product_name, product_markdown)
-            )
-            result_container.append(text)
-        except BaseException as e:  # noqa: BLE001
-            exc_container.append(e)
-        finally:
-            loop.close()
-
-    t = threading.Thread(target=_runner, daemon=True)
-    t.start()
-    t.join(timeout=30)
-
-    if t.is_alive():
+    try:
+        text = llm_runtime.run_sync(
+            _explain_term_async(term, summary_text, education_level, product_name, product_markdown),
+            timeout=30,
+        )
+    except TimeoutError:
         return "Explicația a depășit timpul alocat. Reîncercați."
-    if exc_container:
-        return f"Nu am putut genera explicația: {str(exc_container[0])[:120]}"
-    return result_container[0] if result_container else "Nu am putut genera explicația."
+    except Exception as e:  # noqa: BLE001
+        return f"Nu am putut genera explicația: {str(e)[:120]}"
+    if not text:
+        return "Nu am putut genera explicația."
+    # Only successful explanations are stored (errors above are retried next time)
+    explanation_cache.put(term, bucket, cache_product, text)
+    return text
@@ -5,79 +5,129 @@ It can reuse the existing text explanation from `term_explain_agent`, or generat
 if not provided.
 
 Outputs audio bytes (MP3 by default) to be played in Streamlit via st.audio.
+
+`stream_explain_term_voice` is the low-latency variant: the explanation is
+streamed from the LLM, split into sentences, and each sentence is sent to TTS
+as soon as it is complete, so the first sentence plays while the rest is still
+being written. `audio_duration_seconds` lets the caller queue the sentence
+clips back to back.
 """
 
 from __future__ import annotations
 
-from io import BytesIO
-from typing import Optional, Tuple
+import asyncio
 import os
-import tempfile
-import pathlib
+import re
+import threading
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+from src.agents.term_explain_agent import explain_term, stream_explanation
+from src.utils import llm_runtime
+from src.utils.tts_cache import audio_cache, audio_key
+
+TTS_MODEL = "gpt-4o-mini-tts"
+# Max seconds to wait for each streamed sentence (text + audio)
+STREAM_SENTENCE_TIMEOUT_S = 30
+
+# Sentence boundary: terminal punctuation followed by whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
+
+
+def _get_openai_client():
+    """Process-wide OpenAI client (one HTTP connection pool for all TTS requests)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                return None
+            from openai import OpenAI
+            _client = OpenAI(api_key=api_key)
+        return _client
+
 
-from src.agents.term_explain_agent import explain_term
+def _get_async_openai_client():
+    """Async OpenAI client for the shared LLM runtime loop (src/utils/llm_runtime.py)."""
+    global _async_client
+    with _client_lock:
+        if _async_client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                return None
+            from openai import AsyncOpenAI
+            _async_client = AsyncOpenAI(api_key=api_key)
+        return _async_client
 
 
-def text_to_speech_openai(text: str, voice: str = "alloy", audio_format: str = "mp3") -> bytes:
+def _synthesize(client, text: str, voice: str, audio_format: str) -> bytes:
+    """Call the TTS endpoint and return the audio bytes (kept in memory, no temp file)."""
+    # Some SDK versions support with_streaming_response
+    try:
+        with client.audio.speech.with_streaming_response.create(
+            model=TTS_MODEL,
+            voice=voice,
+            input=text,
+            response_format=audio_format,
+        ) as response:
+            return response.read()
+    except Exception:
+        # Fallback to non-streaming create
+        resp = client.audio.speech.create(
+            model=TTS_MODEL,
+            voice=voice,
+            input=text,
+            response_format=audio_format,
+        )
+        # Try various response shapes
+        if hasattr(resp, "read"):
+            return resp.read()
+        if hasattr(resp, "content"):
+            return resp.content  # type: ignore[attr-defined]
+        if isinstance(resp, (bytes, bytearray)):
+            return bytes(resp)
+        # Last-resort: try attribute 'audio' or 'data'
+        return getattr(resp, "audio", b"") or getattr(resp, "data", b"")
+
+
+def text_to_speech_openai(
+    text: str,
+    voice: str = "alloy",
+    audio_format: str = "mp3",
+    *,
+    use_cache: bool = True,
+) -> bytes:
     """Convert text to speech using OpenAI's TTS (gpt-4o-mini-tts).
 
     Returns raw audio bytes (e.g., MP3). Requires OPENAI_API_KEY in env.
-    Uses streaming to a temporary file for maximum compatibility across OpenAI SDK versions.
+    Audio is cached on disk by (text, voice, format) (src/utils/tts_cache.py),
+    so repeated requests for the same explanation are served from disk.
     """
     if not isinstance(text, str) or not text.strip():
         return b""
 
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
+    audio_format = audio_format or "mp3"
+    key = audio_key(text, voice, audio_format, TTS_MODEL)
+    if use_cache:
+        cached = audio_cache.get(key, audio_format)
+        if cached:
+            return cached
+
+    client = _get_openai_client()
+    if client is None:
         # Graceful message in audio not possible; return empty bytes and let caller show warning
         return b""
 
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-
-        # Use streaming response to a temp file; avoids API differences between SDK versions
-        suffix = f".{audio_format}" if audio_format else ".mp3"
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp_path = tmp.name
-
-        # Some SDK versions support with_streaming_response
-        try:
-            with client.audio.speech.with_streaming_response.create(
-                model="gpt-4o-mini-tts",
-                voice=voice,
-                input=text,
-            ) as response:
-                response.stream_to_file(tmp_path)
-        except Exception:
-            # Fallback to non-streaming create, writing bytes to file
-            resp = client.audio.speech.create(
-                model="gpt-4o-mini-tts",
-                voice=voice,
-                input=text,
-                format=audio_format,
-            )
-            # Try various response shapes
-            data: bytes
-            if hasattr(resp, "read"):
-                data = resp.read()
-            elif hasattr(resp, "content"):
-                data = resp.content  # type: ignore[attr-defined]
-            elif isinstance(resp, (bytes, bytearray)):
-                data = bytes(resp)
-            else:
-                # Last-resort: try attribute 'audio' or 'data'
-                data = getattr(resp, "audio", b"") or getattr(resp, "data", b"")
-            pathlib.Path(tmp_path).write_bytes(data)
-
-        audio_bytes = pathlib.Path(tmp_path).read_bytes()
-        try:
-            os.unlink(tmp_path)
-        except Exception:
-            pass
-        return audio_bytes
+        audio_bytes = _synthesize(client, text, voice, audio_format)
     except Exception:
         return b""
+    if audio_bytes:
+        audio_cache.put(key, audio_format, audio_bytes)
+    return audio_bytes
 
 
 def explain_term_voice(
@@ -87,6 +137,7 @@ def explain_term_voice(
     product_name: Optional[str],
     product_markdown: Optional[str],
     *,
+    product_key: Optional[str] = None,
     voice: str = "alloy",
     audio_format: str = "mp3",
 ) -> Tuple[str, bytes]:
@@ -101,7 +152,142 @@ def explain_term_voice(
         education_level=education_level,
         product_name=product_name,
         product_markdown=product_markdown,
+        product_key=product_key,
     )
 
     audio_bytes = text_to_speech_openai(text, voice=voice, audio_format=audio_format)
     return text, audio_bytes
+
+
+    audio_format = (audio_format or "mp3").lower()
+    if audio_format == "mp3":
+        return _mp3_duration_seconds(audio)
+    if audio_format == "pcm":
+        return len(audio) / _PCM_BYTES_PER_SECOND
+    if audio_format == "wav" and audio[:4] == b"RIFF" and len(audio) >= 44:
+        byte_rate = int.from_bytes(audio[28:32], "little")
+        return (len(audio) - 44) / byte_rate if byte_rate else None
+    return None
+
+
+async def asynthesize_speech(text: str, voice: str = "alloy", audio_format: str = "mp3") -> bytes:
+    """Synthesize `text` on the shared LLM runtime loop and return the audio bytes.
+
+    The whole clip is returned at once: st.audio can only play complete clips,
+    so the stream is cut at sentence level instead (see `astream_term_voice`).
+    """
+    client = _get_async_openai_client()
+    if client is None or not text.strip():
+        return b""
+    response = await client.audio.speech.create(
+        model=TTS_MODEL,
+        voice=voice,
+        input=text,
+        response_format=audio_format,
+    )
+    return response.content
+
+
+async def _split_sentences(deltas: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Re-chunk streamed text deltas into complete sentences."""
+    buffer = ""
+    async for delta in deltas:
+        buffer += delta
+        *complete, buffer = _SENTENCE_END.split(buffer)
+        for sentence in complete:
+            if sentence.strip():
+                yield sentence.strip()
+    if buffer.strip():
+        yield buffer.strip()
+
+
+async def astream_term_voice(
+    term: str,
+    summary_text: str,
+    education_level: Optional[str],
+    product_name: Optional[str],
+    product_markdown: Optional[str],
+    *,
+    product_key: Optional[str] = None,
+    voice: str = "alloy",
+    audio_format: str = "mp3",
+) -> AsyncIterator[Tuple[str, bytes]]:
+    """Yield (sentence, audio bytes) pairs as soon as each sentence is synthesized.
+
+    Text generation keeps running while earlier sentences are synthesized.
+    Sentence audio is cached individually, and the full explanation's audio is
+    cached under the full text once the stream completes. Disk cache access runs
+    in a worker thread so the shared loop is never blocked.
+    """
+    sentences: asyncio.Queue = asyncio.Queue()
+    deltas: List[str] = []
+
+    async def _collect() -> AsyncIterator[str]:
+        async for delta in stream_explanation(
+            term, summary_text, education_level, product_name, product_markdown, product_key=product_key
+        ):
+            deltas.append(delta)
+            yield delta
+
+    async def _produce() -> None:
+        try:
+            async for sentence in _split_sentences(_collect()):
+                await sentences.put(sentence)
+        finally:
+            await sentences.put(None)
+
+    producer = asyncio.create_task(_produce())
+    audio_parts: List[bytes] = []
+    try:
+        while (sentence := await sentences.get()) is not None:
+            key = audio_key(sentence, voice, audio_format, TTS_MODEL)
+            audio = await asyncio.to_thread(audio_cache.get, key, audio_format)
+            if not audio:
+                audio = await asynthesize_speech(sentence, voice, audio_format)
+                await asyncio.to_thread(audio_cache.put, key, audio_format, audio)
+            audio_parts.append(audio)
+            yield sentence, audio
+        # Surface text generation errors
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+
+    text = "".join(deltas).strip()
+    if text and audio_parts and all(audio_parts):
+        await asyncio.to_thread(
+            audio_cache.put, audio_key(text, voice, audio_format, TTS_MODEL), audio_format, b"".join(audio_parts)
+        )
+
+
+def stream_explain_term_voice(
+    term: str,
+    summary_text: str,
+    education_level: Optional[str],
+    product_name: Optional[str],
+    product_markdown: Optional[str],
+    *,
+    product_key: Optional[str] = None,
+    voice: str = "alloy",
+    audio_format: str = "mp3",
+) -> Iterator[Tuple[str, bytes]]:
+    """Sync generator over `astream_term_voice` for Streamlit (runs on the shared LLM loop).
+
+    Yields (sentence, audio bytes); concatenating the audio gives the full explanation.
+
+    Raises:
+        TimeoutError: If a sentence took longer than STREAM_SENTENCE_TIMEOUT_S
+    """
+    return llm_runtime.stream(
+        astream_term_voice(
+            term,
+            summary_text,
+            education_level,
+            product_name,
+            product_markdown,
+            product_key=product_key,
+            voice=voice,
+            audio_format=audio_format,
+        ),
+        timeout=STREAM_SENTENCE_TIMEOUT_S,
+    )
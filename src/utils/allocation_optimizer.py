@@ -0,0 +1,182 @@
+"""Allocation optimizer: split monthly savings across the selected products.
+
+`plan_analytics.analyze_plan_risk_return` only averages the fixed per-category
+returns and risk scores of a plan. This module picks the monthly split itself:
+
+1. Emergency fund first: while the fund (6 months of expenses) is not built,
+   part of the savings goes to the most liquid selected product
+   (savings account, then deposit) so the fund is complete within
+   EMERGENCY_FUND_BUILD_MONTHS.
+2. The rest is split by a mean-variance grid search over the product
+   categories: maximize  return - risk_aversion / 2 * variance  subject to a
+   maximum weighted risk score (PRODUCT_RISK_SCORES scale). Products in the
+   same category share their category's weight equally.
+
+Returns and risk scores come from plan_analytics; volatilities from
+CATEGORY_VOLATILITY, with a constant correlation between categories. The grid
+(weights in steps of `step`, at most 5 categories) is built once per shape and
+evaluated with matrix products, so a call takes about a millisecond.
+Credit and card products are not savings destinations and are excluded.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.utils.plan_analytics import (
+    CATEGORY_VOLATILITY,
+    PRODUCT_RISK_SCORES,
+    calculate_savings_capacity,
+    estimate_product_returns,
+)
+
+# Maximum weighted risk score per risk tolerance (1 = very low ... 4 = medium-high)
+MAX_RISK_BY_TOLERANCE = {"scăzută": 2.0, "medie": 3.0, "ridicată": 4.0}
+# Mean-variance risk aversion per risk tolerance
+RISK_AVERSION = {"scăzută": 8.0, "medie": 4.0, "ridicată": 2.0}
+CROSS_CATEGORY_CORRELATION = 0.3
+EMERGENCY_FUND_BUILD_MONTHS = 12
+RISK_FREE_RATE = 0.02
+
+LIQUID_CATEGORIES = ("cont_economii", "depozit")  # Emergency fund destinations, in order
+NON_INVESTABLE_KEYWORDS = ("credit", "card")
+
+
+@lru_cache(maxsize=32)
+def _simplex_grid(dimensions: int, units: int) -> np.ndarray:
+    """All weight vectors with `dimensions` entries in multiples of 1/units summing to 1."""
+    if dimensions == 1:
+        return np.ones((1, 1))
+    # Stars and bars: each choice of bar positions is one composition of `units`
+    bars = np.array(list(combinations(range(units + dimensions - 1), dimensions - 1)))
+    edges = np.concatenate(
+        [np.full((len(bars), 1), -1), bars, np.full((len(bars), 1), units + dimensions - 1)], axis=1
+    )
+    grid = (np.diff(edges, axis=1) - 1) / units
+    grid.setflags(write=False)
+    return grid
+
+
+def _is_investable(product: str) -> bool:
+    product_lower = product.lower()
+    return not any(keyword in product_lower for keyword in NON_INVESTABLE_KEYWORDS)
+
+
+def optimize_allocation(
+    user_profile: dict,
+    products: List[str],
+    savings_capacity: Optional[Dict] = None,
+    max_risk_score: Optional[float] = None,
+    emergency_fund_first: bool = True,
+    current_emergency_savings: float = 0.0,
+    step: float = 0.05,
+) -> Dict:
+    """
+    Compute the monthly contribution split across the selected products.
+
+    Args:
+        user_profile: User profile dictionary
+        products: Selected product names/IDs
+        savings_capacity: Precomputed `calculate_savings_capacity` result (computed if omitted)
+        max_risk_score: Maximum weighted risk score (default: by the profile's risk tolerance)
+        emergency_fund_first: Reserve savings for the emergency fund before investing
+        current_emergency_savings: Amount already set aside for emergencies (RON)
+        step: Weight granularity of the grid search (0.05 = 5%)
+
+    Returns:
+        Dictionary with per-product allocations, the emergency fund plan and portfolio statistics
+    """
+    if savings_capacity is None:
+        savings_capacity = calculate_savings_capacity(user_profile)
+    monthly_savings = max(savings_capacity["monthly_savings_potential"], 0.0)
+    risk_level = user_profile.get("risk_tolerance", "medie").lower()
+    if max_risk_score is None:
+        max_risk_score = MAX_RISK_BY_TOLERANCE.get(risk_level, MAX_RISK_BY_TOLERANCE["medie"])
+    risk_aversion = RISK_AVERSION.get(risk_level, RISK_AVERSION["medie"])
+
+    investable = [p for p in dict.fromkeys(products) if _is_investable(p)]
+    excluded = [p for p in dict.fromkeys(products) if not _is_investable(p)]
+    product_returns = estimate_product_returns(user_profile, investable)
+
+    # Emergency fund: reserved monthly amount and the product that receives it
+    shortfall = max(savings_capacity["emergency_fund_target"] - current_emergency_savings, 0.0)
+    reserved = min(monthly_savings, shortfall / EMERGENCY_FUND_BUILD_MONTHS) if emergency_fund_first else 0.0
+    emergency_product = None
+    for category in LIQUID_CATEGORIES:
+        emergency_product = next((p for p in investable if product_returns[p]["category"] == category), None)
+        if emergency_product:
+            break
+    investable_savings = monthly_savings - reserved
+
+    # Mean-variance grid search over the distinct categories
+    category_return = {r["category"]: r["annual_return_rate"] for r in product_returns.values()}
+    categories = list(category_return)
+    weights = np.zeros(0)
+    feasible = True
+    if categories:
+        mean = np.array([category_return[c] for c in categories])
+        volatility = np.array([CATEGORY_VOLATILITY[c] for c in categories])
+        risk = np.array([float(PRODUCT_RISK_SCORES.get(c, 2)) for c in categories])
+        correlation = np.full((len(categories), len(categories)), CROSS_CATEGORY_CORRELATION)
+        np.fill_diagonal(correlation, 1.0)
+        covariance = correlation * np.outer(volatility, volatility)
+
+        grid = _simplex_grid(len(categories), max(1, int(round(1 / step))))
+        grid_return = grid @ mean
+        grid_variance = np.einsum("ij,jk,ik->i", grid, covariance, grid)
+        grid_risk = grid @ risk
+        allowed = grid_risk <= max_risk_score + 1e-9
+        if allowed.any():
+            utility = np.where(allowed, grid_return - 0.5 * risk_aversion * grid_variance, -np.inf)
+            best = int(np.argmax(utility))
+        else:
+            # Every mix exceeds the limit: fall back to the least risky one
+            feasible = False
+            best = int(np.argmin(grid_risk))
+        weights = grid[best]
+        portfolio_return = float(grid_return[best])
+        portfolio_volatility = float(np.sqrt(grid_variance[best]))
+        portfolio_risk = float(grid_risk[best])
+    else:
+        portfolio_return = portfolio_volatility = portfolio_risk = 0.0
+
+    category_weight = dict(zip(categories, weights.tolist()))
+    category_size = {c: sum(1 for p in investable if product_returns[p]["category"] == c) for c in categories}
+    allocations = []
+    for product in investable:
+        category = product_returns[product]["category"]
+        weight = category_weight[category] / category_size[category]
+        amount = weight * investable_savings + (reserved if product == emergency_product else 0.0)
+        allocations.append({
+            "product": product,
+            "category": category,
+            "weight": round(weight * 100, 1),
+            "monthly_amount": round(amount, 2),
+            "annual_return_rate": product_returns[product]["annual_return_rate"],
+            "risk_score": PRODUCT_RISK_SCORES.get(category, 2),
+        })
+
+    return {
+        "monthly_savings": round(monthly_savings, 2),
+        "emergency_fund": {
+            "target": savings_capacity["emergency_fund_target"],
+            "shortfall": round(shortfall, 2),
+            "monthly_amount": round(reserved, 2),
+            "product": emergency_product if reserved > 0 else None,
+            "months_to_target": round(shortfall / reserved, 1) if reserved > 0 else 0,
+        },
+        "allocations": allocations,
+        "portfolio": {
+            "expected_return": round(portfolio_return * 100, 2),
+            "volatility": round(portfolio_volatility * 100, 2),
+            "risk_score": round(portfolio_risk, 2),
+            "max_risk_score": max_risk_score,
+            "sharpe_ratio": round((portfolio_return - RISK_FREE_RATE) / portfolio_volatility, 3) if portfolio_volatility > 0 else 0,
+        },
+        "excluded_products": excluded,
+        "feasible": feasible,
+    }
@@ -0,0 +1,175 @@
+"""Async counterpart of src/utils/db.py for code running on an event loop.
+
+Same surface and return values as the blocking helpers, built on
+psycopg.AsyncConnection connections borrowed from the process-wide
+AsyncConnectionPool (`db.get_async_pool`). Agents and the ranking/guidance
+pipelines can await these next to their LLM calls without blocking the loop.
+
+SQL statements and row mappers are shared with db.py so both APIs stay in sync.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+from src.utils.db import (
+    _GET_ALL_PRODUCTS_SQL,
+    _GET_CACHED_EXPLANATION_SQL,
+    _GET_USER_BY_EMAIL_SQL,
+    _SAVE_CACHED_EXPLANATION_SQL,
+    _SAVE_PLAN_SQL,
+    _UPSERT_PRODUCT_SQL,
+    _build_user_upsert,
+    _find_product_files,
+    _product_row_to_dict,
+    _product_upsert_params,
+    _user_row_to_dict,
+    get_async_pool,
+)
+
+
+async def aget_user_by_email(email: str) -> Dict[str, Any] | None:
+    """Async get_user_by_email: user dict (incl. password_hash) or None."""
+    if not email:
+        return None
+
+    try:
+        pool = await get_async_pool()
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(_GET_USER_BY_EMAIL_SQL, (email,))
+                row = await cur.fetchone()
+                return _user_row_to_dict(row) if row is not None else None
+    except Exception:
+        # If database is not configured or connection fails, return None
+        return None
+
+
+async def aget_all_products() -> List[Dict[str, Any]]:
+    """Async get_all_products: list of product dictionaries ([] on error)."""
+    try:
+        pool = await get_async_pool()
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(_GET_ALL_PRODUCTS_SQL)
+                return [_product_row_to_dict(row) for row in await cur.fetchall()]
+    except Exception as e:
+        print(f"Error retrieving products: {e}")
+        return []
+
+
+async def aupsert_user(data: Dict[str, Any]) -> None:
+    """Async upsert_user: insert or update a user by email.
+
+    Raises:
+        ValueError: If email or password_hash is missing
+    """
+    sql, values = _build_user_upsert(data)
+
+    pool = await get_async_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(sql, values)
+
+
+async def asave_financial_plan(email: str, plan_text: str) -> bool:
+    """Async save_financial_plan: True if the user's plan was updated."""
+    try:
+        pool = await get_async_pool()
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(_SAVE_PLAN_SQL, (plan_text, email))
+                return cur.rowcount > 0
+    except Exception as e:
+        print(f"Error saving financial plan: {e}")
+        return False
+
+
+async def apopulate_products(products_dir: str | None = None) -> int:
+    """Async populate_products: load products/*.md into the products table.
+
+    Files are read and parsed in a worker thread; cached recommendation scores of
+    changed products are invalidated in the same connection.
+
+    Returns:
+        Number of products inserted/updated
+    """
+    md_files = _find_product_files(products_dir)
+    if not md_files:
+        return 0
+
+    def _read_all() -> List[tuple]:
+        # File reads + parsing happen off the event loop
+        contents = []
+        for md_file in md_files:
+            try:
+                contents.append(_product_upsert_params(md_file.stem, md_file.read_text(encoding='utf-8')))
+            except Exception as e:
+                print(f"✗ Error reading {md_file.name}: {e}")
+        return contents
+
+    products = await asyncio.to_thread(_read_all)
+
+    count = 0
+    changed: List[str] = []
+    try:
+        pool = await get_async_pool()
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                for params in products:
+                    product_name = params[0]
+                    await cur.execute(_UPSERT_PRODUCT_SQL, params)
+                    count += 1
+                    if await cur.fetchone() is not None:
+                        changed.append(product_name)
+                        print(f"✓ Inserted/Updated: {product_name}")
+                    else:
+                        print(f"= Unchanged: {product_name}")
+
+                # Cached recommendation scores for changed descriptions are stale
+                if changed:
+                    await cur.execute(
+                        "DELETE FROM recommendation_score_cache WHERE product_name = ANY(%s);",
+                        (changed,),
+                    )
+    except Exception as e:
+        print(f"Error populating products: {e}")
+        return 0
+
+    return count
+
+
+async def aget_cached_explanation(cache_key: str) -> Tuple[str, float] | None:
+    """Async get_cached_explanation: (explanation, seconds until expiry) or None."""
+    try:
+        pool = await get_async_pool()
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(_GET_CACHED_EXPLANATION_SQL, (cache_key,))
+                row = await cur.fetchone()
+                return (row[0], float(row[1])) if row else None
+    except Exception as e:
+        print(f"Error retrieving cached explanation: {e}")
+        return None
+
+
+async def asave_cached_explanation(
+    cache_key: str,
+    term: str,
+    education_bucket: str,
+    product_key: str,
+    explanation: str,
+    ttl_seconds: int,
+) -> None:
+    """Async save_cached_explanation: insert or refresh a cached term explanation."""
+    try:
+        pool = await get_async_pool()
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    _SAVE_CACHED_EXPLANATION_SQL,
+                    (cache_key, term, education_bucket, product_key, explanation, ttl_seconds),
+                )
+    except Exception as e:
+        print(f"Error saving cached explanation: {e}")
@@ -0,0 +1,350 @@
+"""Deterministic bank term matching with a word-start trie.
+
+Highlighting used to need a full `bank_term_extractor_agent` round-trip for
+every text, on every Streamlit rerun. This module matches a curated RO/EN
+lexicon of Products/Rates/Fees terms - plus every term the LLM extracted
+before - in a single pass over the text and returns the same
+`ExtractionResult` schema as the agent.
+
+Matching is:
+- diacritic- and case-insensitive (each character folds to exactly one
+  character, so offsets map 1:1 back to the original text; runs of
+  whitespace match a single space)
+- word-boundary aware (no matches inside words)
+- non-overlapping, longest match first
+
+The LLM is only a fallback for text with no lexicon hits
+(see `extract_bank_terms`); its terms are learned and persisted so the next
+text containing them is matched locally.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.agents.bank_term_extractor_agent import ExtractionResult
+
+CATEGORIES = ("Products", "Rates", "Fees")
+
+# Curated lexicon (Romanian forms include common inflections; matching ignores
+# case and diacritics, so "dobanda" and "Dobânda" both hit "dobânda").
+CURATED_TERMS: Dict[str, List[str]] = {
+    "Products": [
+        # EN
+        "credit card", "debit card", "mortgage", "personal loan", "consumer loan", "loan",
+        "overdraft", "checking account", "current account", "savings account",
+        "term deposit", "time deposit", "deposit", "investment fund", "investment funds",
+        "pension fund", "private pension", "bonds", "government bonds", "custody account",
+        # RO
+        "card de credit", "cardul de credit", "carduri de credit", "card de debit", "cardul de debit",
+        "credit imobiliar", "credit ipotecar", "credit de nevoi personale", "credit", "creditul",
+        "descoperit de cont", "cont curent", "contul curent", "cont de economii", "contul de economii",
+        "conturi de economii", "depozit", "depozitul", "depozite", "depozitele", "depozit la termen",
+        "depozitul la termen", "depozite la termen", "flexidepozit", "fond de investiții",
+        "fondul de investiții", "fonduri de investiții", "fond de pensii", "fondul de pensii",
+        "fonduri de pensii", "pensie privată", "pensie facultativă", "pilonul iii", "pilon iii",
+        "titluri de stat", "titluri cu venit fix", "obligațiuni", "obligațiuni de stat",
+        "cont de custodie", "custodie", "savingbox",
+    ],
+    "Rates": [
+        # EN
+        "interest rate", "interest", "fixed rate", "variable rate", "floating rate", "apr", "apy",
+        "annual percentage rate", "annual percentage yield", "compound interest", "yield",
+        # RO
+        "dobândă", "dobânda", "dobânzi", "dobânzii", "dobânzile", "dobânzilor", "rata dobânzii",
+        "rată fixă", "rata fixă", "rată variabilă", "rata variabilă", "dobândă fixă", "dobânda fixă",
+        "dobândă variabilă", "dobânda variabilă", "dobândă progresivă", "dobândă compusă",
+        "dae", "randament", "randamentul", "randamente", "ircc", "robor",
+    ],
+    "Fees": [
+        # EN
+        "fee", "fees", "commission", "maintenance fee", "late fee", "late fees", "penalty",
+        "penalties", "foreclosure penalty", "annual fee", "management fee",
+        # RO
+        "comision", "comisionul", "comisioane", "comisioanele", "comision de administrare",
+        "comision de administrare lunar", "comision de gestiune", "taxă", "taxa", "taxe", "taxele",
+        "penalitate", "penalități", "penalitățile", "impozit", "impozitul", "impozit pe venit",
+        "cost de administrare",
+    ],
+}
+
+# Guards for terms learned from LLM output: short tokens and common words
+# would match everywhere once added to the lexicon
+MIN_LEARNED_TERM_LENGTH = 4
+STOPWORDS = frozenset({
+    # RO (folded: lowercase, no diacritics)
+    "acea", "aceasta", "aceea", "acest", "acesta", "aceste", "acestea", "acestei", "acestui",
+    "acolo", "acum", "aici", "asta", "asupra", "avea", "aveti", "catre", "care", "cand", "ceea",
+    "cele", "celor", "cine", "cum", "dintre", "dupa", "este", "fara", "fiecare", "foarte",
+    "inainte", "intre", "intr", "intr-o", "intr-un", "lunar", "lunara", "mult", "multe", "pana",
+    "pentru", "poate", "prin", "sau", "suma", "sunt", "toate", "totul", "unei", "unor", "unui",
+    "valoare",
+    # EN
+    "also", "from", "have", "into", "more", "than", "that", "their", "there", "these", "this",
+    "with", "your",
+})
+
+
+@lru_cache(maxsize=8192)
+def fold_char(ch: str) -> str:
+    """Fold one character for matching: lowercase, no diacritics, whitespace -> ' '.
+
+    Always returns exactly one character so folded offsets equal original offsets.
+    """
+    if ch.isspace():
+        return " "
+    base = unicodedata.normalize("NFD", ch)[0]
+    lowered = base.lower()
+    return lowered[0] if lowered else base
+
+
+class _FoldTable(dict):
+    """str.translate table that folds characters on first sight."""
+
+    def __missing__(self, code: int) -> str:
+        folded = fold_char(chr(code))
+        self[code] = folded
+        return folded
+
+
+_FOLD_TABLE = _FoldTable()
+
+
+def fold_text(text: str) -> str:
+    """Fold a whole string (same length as the input)."""
+    return text.translate(_FOLD_TABLE)
+
+
+def _normalize_term(term: str) -> str:
+    """Folded term with inner whitespace collapsed to single spaces."""
+    return " ".join(fold_text(term).split())
+
+
+@lru_cache(maxsize=8192)
+def is_word_char(ch: str) -> bool:
+    """Letters, digits and combining marks are part of a word."""
+    if not ch:
+        return False
+    cat = unicodedata.category(ch)
+    return cat.startswith("L") or cat.startswith("N") or cat.startswith("M")
+
+
+class WordStartTrie:
+    """Multi-pattern matcher over folded text.
+
+    Patterns are folded terms stored in a trie; each pattern maps to a payload
+    (the category). Matching walks the trie from each word start only.
+    """
+
+    def __init__(self, patterns: Dict[str, str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._terminal: Dict[int, str] = {}  # state -> payload of the pattern ending exactly there
+
+        for pattern, payload in patterns.items():
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                state = nxt
+            self._terminal[state] = payload
+
+        # Word starts whose first character can begin a pattern; the lookbehind
+        # rejects letters/digits (combining marks are re-checked in Python)
+        roots = "".join(re.escape(ch) for ch in self._goto[0])
+        self._word_start = re.compile(rf"(?<![^\W_])[{roots}]") if roots else None
+
+    def iter_word_matches(self, text: str) -> Iterable[Tuple[int, int, str]]:
+        """Yield (start, end, payload) for every pattern occurrence starting at a word boundary.
+
+        Offsets refer to the original text. Consecutive whitespace is consumed
+        as a single space, so "cont  de\\neconomii" matches "cont de economii".
+        The Python loop runs per word start, not per character.
+        """
+        if self._word_start is None:
+            return
+        folded = fold_text(text)
+        goto, terminal = self._goto, self._terminal
+        n = len(folded)
+        for m in self._word_start.finditer(folded):
+            start = m.start()
+            if start > 0 and is_word_char(text[start - 1]):
+                continue
+            state, i = 0, start
+            while i < n:
+                ch = folded[i]
+                state = goto[state].get(ch)
+                if state is None:
+                    break
+                i += 1
+                if ch == " ":
+                    # A run of whitespace matches a single space
+                    while i < n and folded[i] == " ":
+                        i += 1
+                    continue
+                payload = terminal.get(state)
+                if payload is not None:
+                    yield start, i, payload
+
+
+def select_longest_non_overlapping(candidates: Iterable[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+    """Keep the longest candidates first, dropping any that overlap a kept one.
+
+    Returns:
+        Selected (start, end, payload) sorted by start
+    """
+    ordered = sorted(set(candidates), key=lambda c: (-(c[1] - c[0]), c[0]))
+    occupied = bytearray(max((c[1] for c in ordered), default=0))
+    selected = []
+    for start, end, payload in ordered:
+        if any(occupied[start:end]):
+            continue
+        occupied[start:end] = b"\x01" * (end - start)
+        selected.append((start, end, payload))
+    selected.sort()
+    return selected
+
+
+def find_word_spans(trie: WordStartTrie, text: str) -> List[Tuple[int, int, str]]:
+    """Single scan of `text`: word-bounded matches, longest first, non-overlapping.
+
+    Returns:
+        Selected (start, end, payload) sorted by start
+    """
+    candidates = [
+        (start, end, payload)
+        for start, end, payload in trie.iter_word_matches(text)
+        if not (end < len(text) and is_word_char(text[end]))
+    ]
+    return select_longest_non_overlapping(candidates)
+
+
+class BankTermLexicon:
+    """Curated + learned bank terms compiled into a word-start trie."""
+
+    def __init__(self, load_learned: bool = True) -> None:
+        self._lock = threading.Lock()
+        self._terms: Dict[str, str] = {}  # folded term -> category
+        for category in CATEGORIES:
+            for term in CURATED_TERMS.get(category, []):
+                self._terms.setdefault(_normalize_term(term), category)
+        self._load_learned = load_learned
+        self._learned_loaded = False
+        self._trie: WordStartTrie | None = None
+
+    def _ensure_trie(self) -> WordStartTrie:
+        with self._lock:
+            if self._load_learned and not self._learned_loaded:
+                self._learned_loaded = True
+                from src.utils.db import get_learned_bank_terms
+
+                for term, category in get_learned_bank_terms():
+                    if category in CATEGORIES:
+                        self._terms.setdefault(_normalize_term(term), category)
+                self._trie = None
+            if self._trie is None:
+                self._trie = WordStartTrie(self._terms)
+            return self._trie
+
+    def find_spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """Word-bounded, non-overlapping (start, end, category) matches in `text`."""
+        if not text:
+            return []
+        return find_word_spans(self._ensure_trie(), text)
+
+    def extract(self, text: str) -> ExtractionResult:
+        """Match the lexicon against `text` and return an agent-compatible result."""
+        categories: Dict[str, List[str]] = {c: [] for c in CATEGORIES}
+        seen = set()
+        spans = []
+        for start, end, category in self.find_spans(text):
+            surface = text[start:end]
+            key = (category, surface.lower())
+            if key not in seen:
+                seen.add(key)
+                categories[category].append(surface)
+            spans.append({"start": start, "end": end, "category": category, "text": surface})
+        return ExtractionResult.model_validate({"categories": categories, "spans": spans})
+
+    def learn(self, result: ExtractionResult | None, text: str) -> int:
+        """Add the terms of an (LLM) extraction result to the lexicon and persist them.
+
+        Only terms found (word-bounded) in `text` are learned; short terms,
+        stopwords and terms without letters are skipped.
+
+        Args:
+            result: Extraction result to learn from
+            text: The text the result was extracted from
+
+        Returns:
+            Number of new terms
+        """
+        if result is None or not text:
+            return 0
+        candidates: Dict[str, Tuple[str, str]] = {}  # folded term -> (term, category)
+        for category in CATEGORIES:
+            for term in getattr(result.categories, category):
+                folded = _normalize_term(term or "")
+                if (
+                    len(folded) < MIN_LEARNED_TERM_LENGTH
+                    or folded in STOPWORDS
+                    or not any(ch.isalpha() for ch in folded)
+                ):
+                    continue
+                candidates.setdefault(folded, (term.strip(), category))
+        if not candidates:
+            return 0
+        # Drop hallucinated terms: keep only those occurring in the source text
+        occurring = {
+            payload
+            for start, end, payload in WordStartTrie({f: f for f in candidates}).iter_word_matches(text)
+            if not (end < len(text) and is_word_char(text[end]))
+        }
+
+        new_terms: List[Tuple[str, str]] = []
+        with self._lock:
+            for folded, (term, category) in candidates.items():
+                if folded not in occurring or folded in self._terms:
+                    continue
+                self._terms[folded] = category
+                new_terms.append((term, category))
+            if new_terms:
+                self._trie = None
+        if new_terms and self._load_learned:
+            from src.utils.db import save_learned_bank_terms
+
+            save_learned_bank_terms(new_terms)
+        return len(new_terms)
+
+
+bank_term_lexicon = BankTermLexicon()
+
+
+def extract_bank_terms(
+    text: str,
+    llm_fallback: Optional[Callable[[str], Optional[ExtractionResult]]] = None,
+) -> Optional[ExtractionResult]:
+    """Extract bank terms with the lexicon, falling back to the LLM on no hits.
+
+    Args:
+        text: Text to analyze
+        llm_fallback: Blocking LLM extraction (e.g. the page's agent call); its
+            terms are learned so later texts match locally
+
+    Returns:
+        ExtractionResult (lexicon or LLM), or None if the fallback failed
+    """
+    result = bank_term_lexicon.extract(text)
+    if result.spans or llm_fallback is None or not (text or "").strip():
+        return result
+    llm_result = llm_fallback(text)
+    bank_term_lexicon.learn(llm_result, text)
+    return llm_result
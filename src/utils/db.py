@@ -3,20 +3,38 @@
 Uses psycopg (v3) and environment variables for configuration:
 APP_DB_HOST, APP_DB_PORT, APP_DB_USER, APP_DB_PASSWORD, APP_DB_NAME, APP_DB_SSLMODE
 
+Connections come from a process-wide psycopg_pool pool, configured with:
+APP_DB_POOL_MIN_SIZE, APP_DB_POOL_MAX_SIZE, APP_DB_POOL_MAX_LIFETIME,
+APP_DB_POOL_MAX_IDLE, APP_DB_POOL_TIMEOUT
+
 Schema: 
 - `users` table with core columns and an `extra` JSONB column
-- `products` table for banking products from markdown files
+- `products` table for banking products from markdown files, with fields parsed
+  once at ingestion (`parsed` JSONB, `content_hash`, `category`)
+- `recommendation_score_cache` table for cached product scores per profile
+- `recommendation_snapshots` table for precomputed operator recommendations per user
+- `bank_terms` table for bank terms learned from LLM extractions (term highlighting)
+- `term_extraction_cache` table for LLM term extraction results keyed by text hash
+- `term_explanations` table for cached term explanations (term, education level, product)
 """
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import json
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, ContextManager, Dict, List, Tuple
 
 import psycopg
 from dotenv import load_dotenv
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from src.utils.plan_analytics import infer_product_category
+from src.utils.product_parser import PARSER_VERSION, content_hash, parse_product
 
 # Load environment variables from .env file
 load_dotenv()
@@ -36,8 +54,8 @@ KNOWN_COLUMNS = {
 }
 
 
-def _conn() -> psycopg.Connection:
-    dsn = psycopg.conninfo.make_conninfo(
+def _conninfo() -> str:
+    return psycopg.conninfo.make_conninfo(
         host=os.getenv("APP_DB_HOST", os.getenv("PGHOST", "localhost")),
         port=os.getenv("APP_DB_PORT", os.getenv("PGPORT", "5432")),
         user=os.getenv("APP_DB_USER", os.getenv("PGUSER")),
@@ -45,7 +63,120 @@ def _conn() -> psycopg.Connection:
         dbname=os.getenv("APP_DB_NAME", os.getenv("PGDATABASE")),
         sslmode=os.getenv("APP_DB_SSLMODE", os.getenv("PGSSLMODE")),
     )
-    return psycopg.connect(dsn, autocommit=True)
+
+
+# Connection pool configuration (see psycopg_pool docs for semantics)
+POOL_MIN_SIZE = int(os.getenv("APP_DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("APP_DB_POOL_MAX_SIZE", "10"))
+POOL_MAX_LIFETIME_S = float(os.getenv("APP_DB_POOL_MAX_LIFETIME", "1800"))
+POOL_MAX_IDLE_S = float(os.getenv("APP_DB_POOL_MAX_IDLE", "300"))
+POOL_TIMEOUT_S = float(os.getenv("APP_DB_POOL_TIMEOUT", "5"))
+
+_pool: ConnectionPool | None = None
+_async_pool: AsyncConnectionPool | None = None
+_async_pool_loop: asyncio.AbstractEventLoop | None = None
+_async_pool_lock: asyncio.Lock | None = None
+_async_pool_lock_loop: asyncio.AbstractEventLoop | None = None
+_pool_lock = threading.Lock()
+
+
+def _pool_kwargs() -> Dict[str, Any]:
+    return {
+        "min_size": POOL_MIN_SIZE,
+        "max_size": max(POOL_MIN_SIZE, POOL_MAX_SIZE),
+        "max_lifetime": POOL_MAX_LIFETIME_S,
+        "max_idle": POOL_MAX_IDLE_S,
+        "timeout": POOL_TIMEOUT_S,
+        "kwargs": {"autocommit": True},
+    }
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, opening it on first use.
+
+    Connections are health-checked when handed out, recycled after
+    APP_DB_POOL_MAX_LIFETIME seconds and closed after APP_DB_POOL_MAX_IDLE
+    seconds unused (down to APP_DB_POOL_MIN_SIZE).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            _pool = ConnectionPool(
+                _conninfo(),
+                check=ConnectionPool.check_connection,
+                open=False,
+                name="app-db",
+                **_pool_kwargs(),
+            )
+            # Don't block startup if the database is down; first checkout raises instead
+            _pool.open(wait=False)
+        return _pool
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """Return the process-wide async connection pool, opening it on first use.
+
+    The pool belongs to the event loop that opened it - in practice the shared
+    loop of src.utils.llm_runtime, where all async callers run. Concurrent first
+    callers share one pool; if the owning loop has been closed, a new pool is
+    built for the calling loop.
+
+    Raises:
+        RuntimeError: If the pool is owned by another, still open event loop
+    """
+    global _async_pool, _async_pool_loop, _async_pool_lock, _async_pool_lock_loop
+    loop = asyncio.get_running_loop()
+    if _async_pool is not None and not _async_pool.closed and _async_pool_loop is loop:
+        return _async_pool
+
+    with _pool_lock:
+        if _async_pool_lock is None or _async_pool_lock_loop is not loop:
+            _async_pool_lock, _async_pool_lock_loop = asyncio.Lock(), loop
+        lock = _async_pool_lock
+
+    async with lock:
+        if _async_pool is not None and not _async_pool.closed:
+            if _async_pool_loop is loop:
+                return _async_pool
+            if _async_pool_loop is not None and not _async_pool_loop.is_closed():
+                raise RuntimeError(
+                    "The async connection pool belongs to another event loop; "
+                    "run async DB calls on the src.utils.llm_runtime loop"
+                )
+            # The owning loop is gone; its pool can no longer be used or closed
+        pool = AsyncConnectionPool(
+            _conninfo(),
+            check=AsyncConnectionPool.check_connection,
+            open=False,
+            name="app-db-async",
+            **_pool_kwargs(),
+        )
+        await pool.open(wait=False)
+        _async_pool, _async_pool_loop = pool, loop
+    return _async_pool
+
+
+def close_pools() -> None:
+    """Close both pools (registered at exit)."""
+    global _pool, _async_pool
+    with _pool_lock:
+        if _pool is not None and not _pool.closed:
+            _pool.close()
+        _pool = None
+    if _async_pool is not None and not _async_pool.closed and _async_pool_loop is not None:
+        try:
+            asyncio.run_coroutine_threadsafe(_async_pool.close(), _async_pool_loop).result(timeout=5)
+        except Exception:
+            pass
+    _async_pool = None
+
+
+atexit.register(close_pools)
+
+
+def _conn() -> ContextManager[psycopg.Connection]:
+    """Borrow an autocommit connection from the pool (returned on exit)."""
+    return get_pool().connection()
 
 
 def init_users_table() -> None:
@@ -85,17 +216,57 @@ def init_products_table() -> None:
         updated_at TIMESTAMPTZ DEFAULT now()
     );
     CREATE INDEX IF NOT EXISTS products_name_idx ON products (product_name);
+    -- Fields precomputed at ingestion (see src/utils/product_parser.py)
+    ALTER TABLE products ADD COLUMN IF NOT EXISTS parsed JSONB;
+    ALTER TABLE products ADD COLUMN IF NOT EXISTS content_hash TEXT;
+    ALTER TABLE products ADD COLUMN IF NOT EXISTS category TEXT;
     """
     with _conn() as conn:
         with conn.cursor() as cur:
             cur.execute(sql)
 
 
-def upsert_user(data: Dict[str, Any]) -> None:
-    """Insert or update a user by email. Extra keys go into `extra` JSONB.
+def init_score_cache_table() -> None:
+    """Create the recommendation score cache table if missing (see src/utils/score_cache.py)."""
+    sql = """
+    CREATE TABLE IF NOT EXISTS recommendation_score_cache (
+        cache_key TEXT PRIMARY KEY,
+        profile_hash TEXT NOT NULL,
+        product_name TEXT NOT NULL,
+        description_hash TEXT NOT NULL,
+        payload JSONB NOT NULL,
+        created_at TIMESTAMPTZ DEFAULT now(),
+        expires_at TIMESTAMPTZ NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS recommendation_score_cache_product_idx ON recommendation_score_cache (product_name);
+    CREATE INDEX IF NOT EXISTS recommendation_score_cache_expires_idx ON recommendation_score_cache (expires_at);
+    """
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql)
 
-    Required keys: email, password_hash
+
+def init_recommendation_snapshots_table() -> None:
+    """Create the recommendation snapshots table if missing (see precompute_recommendations.py)."""
+    sql = """
+    CREATE TABLE IF NOT EXISTS recommendation_snapshots (
+        email TEXT PRIMARY KEY,
+        input_hash TEXT NOT NULL,
+        profile_hash TEXT NOT NULL,
+        catalog_hash TEXT NOT NULL,
+        payload JSONB NOT NULL,
+        created_at TIMESTAMPTZ DEFAULT now(),
+        generated_at TIMESTAMPTZ DEFAULT now()
+    );
+    CREATE INDEX IF NOT EXISTS recommendation_snapshots_generated_idx ON recommendation_snapshots (generated_at);
     """
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+
+
+def _build_user_upsert(data: Dict[str, Any]) -> tuple[str, List[Any]]:
+    """Build the users upsert statement and its parameters (shared with async_db)."""
     email = data.get("email")
     pwd = data.get("password_hash")
     if not email or not pwd:
@@ -134,12 +305,97 @@ def upsert_user(data: Dict[str, Any]) -> None:
 
     values = [payload[c] for c in columns]
     values.append(json.dumps(extra, ensure_ascii=False))
+    return sql, values
+
+
+def init_bank_terms_table() -> None:
+    """Create the learned bank terms table if missing (see src/utils/bank_term_lexicon.py)."""
+    sql = """
+    CREATE TABLE IF NOT EXISTS bank_terms (
+        term TEXT PRIMARY KEY,
+        category TEXT NOT NULL,
+        source TEXT NOT NULL DEFAULT 'llm',
+        created_at TIMESTAMPTZ DEFAULT now()
+    );
+    """
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+
+
+def init_extraction_cache_table() -> None:
+    """Create the term extraction cache table if missing (see src/utils/term_extraction.py)."""
+    sql = """
+    CREATE TABLE IF NOT EXISTS term_extraction_cache (
+        cache_key TEXT PRIMARY KEY,
+        prompt_version TEXT NOT NULL,
+        payload JSONB NOT NULL,
+        created_at TIMESTAMPTZ DEFAULT now()
+    );
+    """
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+
+
+def init_term_explanations_table() -> None:
+    """Create the term explanations table if missing (see src/utils/explanation_cache.py)."""
+    sql = """
+    CREATE TABLE IF NOT EXISTS term_explanations (
+        cache_key TEXT PRIMARY KEY,
+        term TEXT NOT NULL,
+        education_bucket TEXT NOT NULL,
+        product_key TEXT NOT NULL,
+        explanation TEXT NOT NULL,
+        created_at TIMESTAMPTZ DEFAULT now(),
+        expires_at TIMESTAMPTZ NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS term_explanations_expires_idx ON term_explanations (expires_at);
+    """
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+
+
+def upsert_user(data: Dict[str, Any]) -> None:
+    """Insert or update a user by email. Extra keys go into `extra` JSONB.
+
+    Required keys: email, password_hash
+    """
+    sql, values = _build_user_upsert(data)
 
     with _conn() as conn:
         with conn.cursor() as cur:
             cur.execute(sql, values)
 
 
+_GET_USER_BY_EMAIL_SQL = """
+SELECT email, password_hash, first_name, last_name, age, 
+       marital_status, employment_status, has_children, 
+       number_of_children, user_plan, extra
+FROM users
+WHERE email = %s
+LIMIT 1;
+"""
+
+
+def _user_row_to_dict(row: tuple) -> Dict[str, Any]:
+    """Map a _GET_USER_BY_EMAIL_SQL row to a dictionary."""
+    return {
+        "email": row[0],
+        "password_hash": row[1],
+        "first_name": row[2],
+        "last_name": row[3],
+        "age": row[4],
+        "marital_status": row[5],
+        "employment_status": row[6],
+        "has_children": row[7],
+        "number_of_children": row[8],
+        "user_plan": row[9],
+        "extra": row[10] if row[10] else {},
+    }
+
+
 def get_user_by_email(email: str) -> Dict[str, Any] | None:
     """Retrieve user by email from database.
     
@@ -148,82 +404,126 @@ def get_user_by_email(email: str) -> Dict[str, Any] | None:
     if not email:
         return None
     
-    sql = """
-    SELECT email, password_hash, first_name, last_name, age, 
-           marital_status, employment_status, has_children, 
-           number_of_children, user_plan, extra
-    FROM users
-    WHERE email = %s
-    LIMIT 1;
-    """
-    
     try:
         with _conn() as conn:
             with conn.cursor() as cur:
-                cur.execute(sql, (email,))
+                cur.execute(_GET_USER_BY_EMAIL_SQL, (email,))
                 row = cur.fetchone()
                 
                 if row is None:
                     return None
                 
-                # Map row to dictionary
-                return {
-                    "email": row[0],
-                    "password_hash": row[1],
-                    "first_name": row[2],
-                    "last_name": row[3],
-                    "age": row[4],
-                    "marital_status": row[5],
-                    "employment_status": row[6],
-                    "has_children": row[7],
-                    "number_of_children": row[8],
-                    "user_plan": row[9],
-                    "extra": row[10] if row[10] else {},
-                }
+                return _user_row_to_dict(row)
     except Exception:
         # If database is not configured or connection fails, return None
         return None
 
 
-def save_financial_plan(email: str, plan_text: str) -> bool:
+def get_users_page(after_id: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
     """
-    Save or update the financial plan for a user.
+    Retrieve a page of users ordered by id (keyset pagination).
     
     Args:
-        email: User's email address
-        plan_text: The markdown text of the financial plan
+        after_id: Return users with id greater than this value
+        limit: Maximum number of users to return
         
     Returns:
-        True if successful, False otherwise
+        List of user dictionaries (same keys as get_user_by_email plus id, without password_hash)
     """
     sql = """
-    UPDATE users
-    SET user_plan = %s,
-        updated_at = now()
-    WHERE email = %s;
+    SELECT id, email, first_name, last_name, age,
+           marital_status, employment_status, has_children,
+           number_of_children, extra
+    FROM users
+    WHERE id > %s
+    ORDER BY id
+    LIMIT %s;
     """
     
     try:
         with _conn() as conn:
             with conn.cursor() as cur:
-                cur.execute(sql, (plan_text, email))
-                conn.commit()
-                return cur.rowcount > 0
+                cur.execute(sql, (after_id, limit))
+                return [
+                    {
+                        "id": row[0],
+                        "email": row[1],
+                        "first_name": row[2],
+                        "last_name": row[3],
+                        "age": row[4],
+                        "marital_status": row[5],
+                        "employment_status": row[6],
+                        "has_children": row[7],
+                        "number_of_children": row[8],
+                        "extra": row[9] if row[9] else {},
+                    }
+                    for row in cur.fetchall()
+                ]
     except Exception as e:
-        print(f"Error saving financial plan: {e}")
-        return False
+        print(f"Error retrieving users: {e}")
+        return []
 
 
-def populate_products(products_dir: str | None = None) -> int:
+_SAVE_PLAN_SQL = """
+UPDATE users
+SET user_plan = %s,
+    updated_at = now()
+WHERE email = %s;
+"""
+
+
+def save_financial_plan(email: str, plan_text: str) -> bool:
     """
-    Populate products table from markdown files in products directory.
+    Save or update the financial plan for a user.
     
     Args:
-        products_dir: Path to products directory. If None, uses default '../products'
+        email: User's email address
+        plan_text: The markdown text of the financial plan
         
     Returns:
-        Number of products inserted/updated
+        True if successful, False otherwise
     """
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(_SAVE_PLAN_SQL, (plan_text, email))
+                conn.commit()
+                return cur.rowcount > 0
+    except Exception as e:
+        print(f"Error saving financial plan: {e}")
+        return False
+
+
+# Only touch rows whose content (or parser version) changed so updated_at stays meaningful
+_UPSERT_PRODUCT_SQL = """
+INSERT INTO products (product_name, product_description, parsed, content_hash, category)
+VALUES (%s, %s, %s::jsonb, %s, %s)
+ON CONFLICT (product_name) DO UPDATE SET
+    product_description = EXCLUDED.product_description,
+    parsed = EXCLUDED.parsed,
+    content_hash = EXCLUDED.content_hash,
+    category = EXCLUDED.category,
+    updated_at = now()
+WHERE products.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+   OR products.parsed->>'version' IS DISTINCT FROM EXCLUDED.parsed->>'version'
+RETURNING product_name;
+"""
+
+
+def _product_upsert_params(product_name: str, product_description: str) -> tuple:
+    """Parse a product once at ingestion and build the _UPSERT_PRODUCT_SQL parameters."""
+    parsed = parse_product(product_name, product_description)
+    return (
+        product_name,
+        product_description,
+        json.dumps(parsed, ensure_ascii=False),
+        content_hash(product_description),
+        infer_product_category(product_name),
+    )
+
+
+def _find_product_files(products_dir: str | None = None) -> List[Path]:
+    """Return the product markdown files (default: <repo>/products/*.md)."""
     if products_dir is None:
         # Get the directory relative to this file
         current_file = Path(__file__)
@@ -233,27 +533,43 @@ def populate_products(products_dir: str | None = None) -> int:
     
     if not products_dir.exists():
         print(f"Products directory not found: {products_dir}")
-        return 0
+        return []
     
     # Find all .md files
     md_files = list(products_dir.glob("*.md"))
     
     if not md_files:
         print(f"No markdown files found in {products_dir}")
+    return md_files
+
+
+def populate_products(products_dir: str | None = None, incremental: bool = False) -> int:
+    """
+    Populate products table from markdown files in products directory.
+    
+    Args:
+        products_dir: Path to products directory. If None, uses default '../products'
+        incremental: Use sync_products (hash-skip, parallel parse, bulk COPY merge,
+            removal of products whose files are gone) instead of per-row upserts
+        
+    Returns:
+        Number of products inserted/updated
+    """
+    if incremental:
+        stats = sync_products(products_dir)
+        return stats["inserted"] + stats["updated"] + stats["unchanged"]
+    
+    md_files = _find_product_files(products_dir)
+    if not md_files:
         return 0
     
     count = 0
-    sql = """
-    INSERT INTO products (product_name, product_description)
-    VALUES (%s, %s)
-    ON CONFLICT (product_name) DO UPDATE SET
-        product_description = EXCLUDED.product_description,
-        updated_at = now();
-    """
+    sql = _UPSERT_PRODUCT_SQL
     
     try:
         with _conn() as conn:
             with conn.cursor() as cur:
+                changed: List[str] = []
                 for md_file in md_files:
                     # Use filename without extension as product_name
                     product_name = md_file.stem
@@ -261,14 +577,22 @@ def populate_products(products_dir: str | None = None) -> int:
                     # Read file content as product_description
                     try:
                         product_description = md_file.read_text(encoding='utf-8')
-                        cur.execute(sql, (product_name, product_description))
+                        cur.execute(sql, _product_upsert_params(product_name, product_description))
                         count += 1
-                        print(f"✓ Inserted/Updated: {product_name}")
+                        if cur.fetchone() is not None:
+                            changed.append(product_name)
+                            print(f"✓ Inserted/Updated: {product_name}")
+                        else:
+                            print(f"= Unchanged: {product_name}")
                     except Exception as e:
                         print(f"✗ Error reading {md_file.name}: {e}")
                         continue
                 
                 conn.commit()
+        
+        # Cached recommendation scores for changed descriptions are stale
+        for product_name in changed:
+            delete_cached_scores_for_product(product_name)
     except Exception as e:
         print(f"Error populating products: {e}")
         return 0
@@ -276,6 +600,182 @@ def populate_products(products_dir: str | None = None) -> int:
     return count
 
 
+# Parallel parsing only pays off past this many changed files
+_PARALLEL_INGEST_MIN_FILES = 16
+INGEST_WORKERS = int(os.getenv("PRODUCT_INGEST_WORKERS", str(os.cpu_count() or 2)))
+
+_STAGING_PRODUCTS_SQL = """
+CREATE TEMP TABLE products_staging (
+    product_name TEXT PRIMARY KEY,
+    product_description TEXT NOT NULL,
+    parsed JSONB,
+    content_hash TEXT,
+    category TEXT
+) ON COMMIT DROP;
+"""
+
+_MERGE_STAGING_SQL = """
+INSERT INTO products (product_name, product_description, parsed, content_hash, category)
+SELECT product_name, product_description, parsed, content_hash, category
+FROM products_staging
+ON CONFLICT (product_name) DO UPDATE SET
+    product_description = EXCLUDED.product_description,
+    parsed = EXCLUDED.parsed,
+    content_hash = EXCLUDED.content_hash,
+    category = EXCLUDED.category,
+    updated_at = now()
+WHERE products.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+   OR products.parsed->>'version' IS DISTINCT FROM EXCLUDED.parsed->>'version'
+RETURNING product_name, (xmax = 0) AS inserted;
+"""
+
+
+def _ingest_product_file(path: str, known_hash: str | None) -> tuple:
+    """Read, hash and (if changed) parse one product file. Runs in worker processes.
+    
+    Returns:
+        (product_name, upsert params or None if unchanged, error message or None)
+    """
+    md_file = Path(path)
+    try:
+        product_description = md_file.read_text(encoding='utf-8')
+    except Exception as e:
+        return md_file.stem, None, str(e)
+    if known_hash is not None and content_hash(product_description) == known_hash:
+        return md_file.stem, None, None
+    return md_file.stem, _product_upsert_params(md_file.stem, product_description), None
+
+
+def sync_products(
+    products_dir: str | None = None,
+    workers: int | None = None,
+    delete_missing: bool = True,
+) -> Dict[str, int]:
+    """
+    Incrementally sync the products table with the markdown files.
+    
+    Files whose content hash (and parser version) match the stored row are
+    skipped. Changed files are parsed in a process pool, bulk-loaded with COPY
+    into a temporary staging table and merged with a single INSERT ... ON
+    CONFLICT. Products whose files were removed are deleted. Everything runs in
+    one transaction; cached scores of changed/deleted products are invalidated.
+    
+    Args:
+        products_dir: Path to products directory. If None, uses default '../products'
+        workers: Parser processes (default PRODUCT_INGEST_WORKERS / CPU count)
+        delete_missing: Delete products that no longer have a file
+        
+    Returns:
+        Dict with counts: inserted, updated, unchanged, deleted, failed
+    """
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0, "failed": 0}
+    md_files = _find_product_files(products_dir)
+    if not md_files:
+        return stats
+    
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                # Stored hashes from an older parser version don't count as unchanged
+                cur.execute(
+                    "SELECT product_name, content_hash FROM products WHERE parsed->>'version' = %s;",
+                    (PARSER_VERSION,),
+                )
+                known = dict(cur.fetchall())
+            
+            tasks = [(str(f), known.get(f.stem)) for f in md_files]
+            if len(tasks) >= _PARALLEL_INGEST_MIN_FILES and (workers or INGEST_WORKERS) > 1:
+                with ProcessPoolExecutor(max_workers=workers or INGEST_WORKERS) as pool:
+                    results = list(pool.map(_ingest_product_file, *zip(*tasks), chunksize=8))
+            else:
+                results = [_ingest_product_file(path, known_hash) for path, known_hash in tasks]
+            
+            staged = []
+            for product_name, params, error in results:
+                if error:
+                    stats["failed"] += 1
+                    print(f"✗ Error reading {product_name}: {error}")
+                elif params is None:
+                    stats["unchanged"] += 1
+                else:
+                    staged.append(params)
+            
+            file_names = [f.stem for f in md_files]
+            with conn.transaction():
+                with conn.cursor() as cur:
+                    changed: List[str] = []
+                    if staged:
+                        cur.execute(_STAGING_PRODUCTS_SQL)
+                        with cur.copy(
+                            "COPY products_staging (product_name, product_description, parsed, content_hash, category) FROM STDIN"
+                        ) as copy:
+                            for params in staged:
+                                copy.write_row(params)
+                        cur.execute(_MERGE_STAGING_SQL)
+                        for product_name, inserted in cur.fetchall():
+                            changed.append(product_name)
+                            stats["inserted" if inserted else "updated"] += 1
+                            print(f"✓ {'Inserted' if inserted else 'Updated'}: {product_name}")
+                        # Staged rows the merge left untouched were identical already
+                        stats["unchanged"] += len(staged) - len(changed)
+                    
+                    if delete_missing:
+                        cur.execute(
+                            "DELETE FROM products WHERE product_name <> ALL(%s) RETURNING product_name;",
+                            (file_names,),
+                        )
+                        for (product_name,) in cur.fetchall():
+                            changed.append(product_name)
+                            stats["deleted"] += 1
+                            print(f"✗ Deleted (file removed): {product_name}")
+                    
+                    # Cached recommendation scores for changed/removed products are stale
+                    if changed:
+                        cur.execute(
+                            "DELETE FROM recommendation_score_cache WHERE product_name = ANY(%s);",
+                            (changed,),
+                        )
+    except Exception as e:
+        print(f"Error syncing products: {e}")
+        return stats
+    
+    print(
+        f"Products sync: {stats['inserted']} inserted, {stats['updated']} updated, "
+        f"{stats['unchanged']} unchanged, {stats['deleted']} deleted, {stats['failed']} failed"
+    )
+    return stats
+
+
+_PRODUCT_COLUMNS = "id, product_name, product_description, created_at, updated_at, parsed, content_hash, category"
+
+_GET_ALL_PRODUCTS_SQL = f"""
+SELECT {_PRODUCT_COLUMNS}
+FROM products
+ORDER BY product_name;
+"""
+
+
+def _product_row_to_dict(row: tuple) -> Dict[str, Any]:
+    """Map a products row (_PRODUCT_COLUMNS) to a dictionary.
+    
+    `parsed` holds the ingestion-time structure (name, description, benefits,
+    sections); rows loaded before it existed are parsed on the fly.
+    """
+    parsed = row[5]
+    if not parsed or parsed.get("version") != PARSER_VERSION:
+        parsed = parse_product(row[1], row[2])
+    return {
+        "id": row[0],
+        "product_name": row[1],
+        "product_description": row[2],
+        "created_at": row[3],
+        "updated_at": row[4],
+        "parsed": parsed,
+        "content_hash": row[6] or content_hash(row[2]),
+        "category": row[7] or infer_product_category(row[1]),
+    }
+
+
 def get_all_products() -> List[Dict[str, Any]]:
     """
     Retrieve all products from database.
@@ -283,33 +783,37 @@ def get_all_products() -> List[Dict[str, Any]]:
     Returns:
         List of dictionaries with product data
     """
-    sql = """
-    SELECT id, product_name, product_description, created_at, updated_at
-    FROM products
-    ORDER BY product_name;
-    """
-    
     try:
         with _conn() as conn:
             with conn.cursor() as cur:
-                cur.execute(sql)
+                cur.execute(_GET_ALL_PRODUCTS_SQL)
                 rows = cur.fetchall()
                 
-                return [
-                    {
-                        "id": row[0],
-                        "product_name": row[1],
-                        "product_description": row[2],
-                        "created_at": row[3],
-                        "updated_at": row[4],
-                    }
-                    for row in rows
-                ]
+                return [_product_row_to_dict(row) for row in rows]
     except Exception as e:
         print(f"Error retrieving products: {e}")
         return []
 
 
+def get_products_version() -> tuple | None:
+    """
+    Cheap change marker for the products table.
+    
+    Returns:
+        (product count, max(updated_at)) or None if the database is unavailable
+    """
+    sql = "SELECT count(*), max(updated_at) FROM products;"
+    
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql)
+                return tuple(cur.fetchone())
+    except Exception as e:
+        print(f"Error checking products version: {e}")
+        return None
+
+
 def get_product_by_name(product_name: str) -> Dict[str, Any] | None:
     """
     Retrieve a specific product by name.
@@ -320,8 +824,8 @@ def get_product_by_name(product_name: str) -> Dict[str, Any] | None:
     Returns:
         Dictionary with product data or None if not found
     """
-    sql = """
-    SELECT id, product_name, product_description, created_at, updated_at
+    sql = f"""
+    SELECT {_PRODUCT_COLUMNS}
     FROM products
     WHERE product_name = %s
     LIMIT 1;
@@ -336,18 +840,388 @@ def get_product_by_name(product_name: str) -> Dict[str, Any] | None:
                 if row is None:
                     return None
                 
+                return _product_row_to_dict(row)
+    except Exception as e:
+        print(f"Error retrieving product: {e}")
+        return None
+
+
+def get_cached_scores(cache_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Retrieve non-expired cached recommendation scores.
+    
+    Args:
+        cache_keys: Cache keys built by src.utils.score_cache
+        
+    Returns:
+        Dictionary mapping cache_key -> cached ranking entry (missing keys are absent)
+    """
+    if not cache_keys:
+        return {}
+    
+    sql = """
+    SELECT cache_key, payload
+    FROM recommendation_score_cache
+    WHERE cache_key = ANY(%s) AND expires_at > now();
+    """
+    
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (list(cache_keys),))
+                return {row[0]: row[1] for row in cur.fetchall()}
+    except Exception as e:
+        print(f"Error retrieving cached scores: {e}")
+        return {}
+
+
+def save_cached_scores(rows: List[Dict[str, Any]], ttl_seconds: int) -> None:
+    """
+    Insert or refresh cached recommendation scores and purge expired ones.
+    
+    Args:
+        rows: Dicts with keys cache_key, profile_hash, product_name, description_hash, payload
+        ttl_seconds: Time-to-live for the new entries
+    """
+    if not rows:
+        return
+    
+    sql = """
+    INSERT INTO recommendation_score_cache
+        (cache_key, profile_hash, product_name, description_hash, payload, expires_at)
+    VALUES (%s, %s, %s, %s, %s::jsonb, now() + make_interval(secs => %s))
+    ON CONFLICT (cache_key) DO UPDATE SET
+        payload = EXCLUDED.payload,
+        created_at = now(),
+        expires_at = EXCLUDED.expires_at;
+    """
+    
+    values = [
+        (
+            row["cache_key"],
+            row["profile_hash"],
+            row["product_name"],
+            row["description_hash"],
+            json.dumps(row["payload"], ensure_ascii=False),
+            ttl_seconds,
+        )
+        for row in rows
+    ]
+    
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.executemany(sql, values)
+                cur.execute("DELETE FROM recommendation_score_cache WHERE expires_at <= now();")
+    except Exception as e:
+        print(f"Error saving cached scores: {e}")
+
+
+def delete_cached_scores_for_product(product_name: str) -> int:
+    """
+    Invalidate every cached recommendation score for a product.
+    
+    Args:
+        product_name: Name of the product whose description changed
+        
+    Returns:
+        Number of cache entries removed
+    """
+    sql = "DELETE FROM recommendation_score_cache WHERE product_name = %s;"
+    
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (product_name,))
+                return cur.rowcount
+    except Exception as e:
+        print(f"Error invalidating cached scores: {e}")
+        return 0
+
+
+def get_recommendation_snapshot(email: str) -> Dict[str, Any] | None:
+    """
+    Retrieve the stored recommendation snapshot for a user.
+    
+    Args:
+        email: User's email address
+        
+    Returns:
+        Dictionary with input_hash, profile_hash, catalog_hash, payload, generated_at
+        and age_seconds, or None if no snapshot exists
+    """
+    if not email:
+        return None
+    
+    sql = """
+    SELECT input_hash, profile_hash, catalog_hash, payload, generated_at,
+           EXTRACT(EPOCH FROM (now() - generated_at))
+    FROM recommendation_snapshots
+    WHERE email = %s;
+    """
+    
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (email,))
+                row = cur.fetchone()
+                if row is None:
+                    return None
                 return {
-                    "id": row[0],
-                    "product_name": row[1],
-                    "product_description": row[2],
-                    "created_at": row[3],
-                    "updated_at": row[4],
+                    "input_hash": row[0],
+                    "profile_hash": row[1],
+                    "catalog_hash": row[2],
+                    "payload": row[3],
+                    "generated_at": row[4],
+                    "age_seconds": float(row[5]),
                 }
     except Exception as e:
-        print(f"Error retrieving product: {e}")
+        print(f"Error retrieving recommendation snapshot: {e}")
+        return None
+
+
+def save_recommendation_snapshot(
+    email: str,
+    input_hash: str,
+    profile_hash: str,
+    catalog_hash: str,
+    payload: Any,
+) -> bool:
+    """
+    Insert or replace the recommendation snapshot for a user.
+    
+    Args:
+        email: User's email address
+        input_hash: Combined hash of profile + product catalog used for the snapshot
+        profile_hash: Fingerprint of the user profile
+        catalog_hash: Hash of the product catalog
+        payload: JSON-serializable ranked products with operator guidance
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    sql = """
+    INSERT INTO recommendation_snapshots
+        (email, input_hash, profile_hash, catalog_hash, payload, generated_at)
+    VALUES (%s, %s, %s, %s, %s::jsonb, now())
+    ON CONFLICT (email) DO UPDATE SET
+        input_hash = EXCLUDED.input_hash,
+        profile_hash = EXCLUDED.profile_hash,
+        catalog_hash = EXCLUDED.catalog_hash,
+        payload = EXCLUDED.payload,
+        generated_at = now();
+    """
+    
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (email, input_hash, profile_hash, catalog_hash, json.dumps(payload, ensure_ascii=False)))
+                return True
+    except Exception as e:
+        print(f"Error saving recommendation snapshot: {e}")
+        return False
+
+
+def get_learned_bank_terms() -> List[tuple]:
+    """
+    Retrieve bank terms previously extracted by the LLM.
+    
+    Returns:
+        List of (term, category) tuples ([] if unavailable)
+    """
+    sql = "SELECT term, category FROM bank_terms;"
+    
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql)
+                return [tuple(row) for row in cur.fetchall()]
+    except Exception as e:
+        print(f"Error retrieving learned bank terms: {e}")
+        return []
+
+
+def save_learned_bank_terms(terms: List[tuple]) -> None:
+    """
+    Persist bank terms extracted by the LLM (existing terms are kept as-is).
+    
+    Args:
+        terms: List of (term, category) tuples
+    """
+    if not terms:
+        return
+    
+    sql = """
+    INSERT INTO bank_terms (term, category)
+    VALUES (%s, %s)
+    ON CONFLICT (term) DO NOTHING;
+    """
+    
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.executemany(sql, terms)
+    except Exception as e:
+        print(f"Error saving learned bank terms: {e}")
+
+
+def get_cached_extraction(cache_key: str) -> Dict[str, Any] | None:
+    """
+    Retrieve a cached term extraction result.
+    
+    Args:
+        cache_key: Content hash built by src.utils.term_extraction
+        
+    Returns:
+        ExtractionResult payload dict or None if missing
+    """
+    sql = "SELECT payload FROM term_extraction_cache WHERE cache_key = %s;"
+    
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (cache_key,))
+                row = cur.fetchone()
+                return row[0] if row else None
+    except Exception as e:
+        print(f"Error retrieving cached extraction: {e}")
+        return None
+
+
+def save_cached_extraction(cache_key: str, prompt_version: str, payload: Dict[str, Any]) -> None:
+    """
+    Store a term extraction result.
+    
+    Args:
+        cache_key: Content hash built by src.utils.term_extraction
+        prompt_version: Extractor prompt version the result was produced with
+        payload: ExtractionResult as dict
+    """
+    sql = """
+    INSERT INTO term_extraction_cache (cache_key, prompt_version, payload)
+    VALUES (%s, %s, %s::jsonb)
+    ON CONFLICT (cache_key) DO UPDATE SET
+        payload = EXCLUDED.payload,
+        created_at = now();
+    """
+    
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (cache_key, prompt_version, json.dumps(payload, ensure_ascii=False)))
+    except Exception as e:
+        print(f"Error saving cached extraction: {e}")
+
+
+_GET_CACHED_EXPLANATION_SQL = """
+SELECT explanation, EXTRACT(EPOCH FROM (expires_at - now()))
+FROM term_explanations
+WHERE cache_key = %s AND expires_at > now();
+"""
+
+_SAVE_CACHED_EXPLANATION_SQL = """
+INSERT INTO term_explanations
+    (cache_key, term, education_bucket, product_key, explanation, expires_at)
+VALUES (%s, %s, %s, %s, %s, now() + make_interval(secs => %s))
+ON CONFLICT (cache_key) DO UPDATE SET
+    explanation = EXCLUDED.explanation,
+    created_at = now(),
+    expires_at = EXCLUDED.expires_at;
+"""
+
+
+def get_cached_explanation(cache_key: str) -> Tuple[str, float] | None:
+    """
+    Retrieve a non-expired cached term explanation.
+    
+    Args:
+        cache_key: Key built by src.utils.explanation_cache
+        
+    Returns:
+        (explanation, seconds until expiry) or None if missing/expired
+    """
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(_GET_CACHED_EXPLANATION_SQL, (cache_key,))
+                row = cur.fetchone()
+                return (row[0], float(row[1])) if row else None
+    except Exception as e:
+        print(f"Error retrieving cached explanation: {e}")
         return None
 
 
+def save_cached_explanation(
+    cache_key: str,
+    term: str,
+    education_bucket: str,
+    product_key: str,
+    explanation: str,
+    ttl_seconds: int,
+) -> None:
+    """
+    Insert or refresh a cached term explanation.
+    
+    Args:
+        cache_key: Key built by src.utils.explanation_cache
+        term: Normalized term
+        education_bucket: Education level bucket (see term_explain_agent.education_bucket)
+        product_key: Product the explanation refers to
+        explanation: Explanation text
+        ttl_seconds: Time-to-live of the entry
+    """
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(_SAVE_CACHED_EXPLANATION_SQL, (cache_key, term, education_bucket, product_key, explanation, ttl_seconds))
+    except Exception as e:
+        print(f"Error saving cached explanation: {e}")
+
+
+def get_cached_explanations() -> List[Dict[str, Any]]:
+    """
+    Retrieve all non-expired cached term explanations.
+    
+    Returns:
+        List of dicts with term, education_bucket, product_key and explanation
+    """
+    sql = """
+    SELECT term, education_bucket, product_key, explanation
+    FROM term_explanations
+    WHERE expires_at > now()
+    ORDER BY product_key, term, education_bucket;
+    """
+    
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql)
+                return [
+                    {"term": row[0], "education_bucket": row[1], "product_key": row[2], "explanation": row[3]}
+                    for row in cur.fetchall()
+                ]
+    except Exception as e:
+        print(f"Error retrieving cached explanations: {e}")
+        return []
+
+
+def purge_expired_explanations() -> int:
+    """
+    Delete expired cached term explanations.
+    
+    Returns:
+        Number of entries removed
+    """
+    try:
+        with _conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM term_explanations WHERE expires_at <= now();")
+                return cur.rowcount
+    except Exception as e:
+        print(f"Error purging cached explanations: {e}")
+        return 0
+
+
 def init_database() -> None:
     """
     Initialize all database tables and populate products.
@@ -362,11 +1236,31 @@ def init_database() -> None:
     print("Creating products table...")
     init_products_table()
     
+    print("Creating recommendation score cache table...")
+    init_score_cache_table()
+    
+    print("Creating recommendation snapshots table...")
+    init_recommendation_snapshots_table()
+    
+    print("Creating bank terms table...")
+    init_bank_terms_table()
+    
+    print("Creating term extraction cache table...")
+    init_extraction_cache_table()
+    
+    print("Creating term explanations table...")
+    init_term_explanations_table()
+    
     # Populate products
     print("Populating products from markdown files...")
-    count = populate_products()
+    count = populate_products(incremental=True)
     
     print(f"\n✓ Database initialized successfully!")
     print(f"  - Users table: ready")
     print(f"  - Products table: {count} products loaded")
+    print(f"  - Score cache table: ready")
+    print(f"  - Recommendation snapshots table: ready")
+    print(f"  - Bank terms table: ready")
+    print(f"  - Term extraction cache table: ready")
+    print(f"  - Term explanations table: ready")
 
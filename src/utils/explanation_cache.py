@@ -0,0 +1,139 @@
+"""Term explanation store keyed by (term, education bucket, product).
+
+`explain_term` used to call Bedrock on every click, yet the same term is
+explained for the same product and education level to many users. This module
+stores generated explanations in two tiers, like src/utils/score_cache.py:
+
+- In-process: thread-safe LRU with TTL (survives Streamlit reruns, not restarts)
+- Postgres: `term_explanations` table (shared across processes/restarts)
+
+Key = sha256(version, folded term, education bucket, product key). The term is
+case/diacritic/whitespace-insensitive (same folding as the bank term lexicon);
+education levels that get the same prompt guidance share a bucket.
+`precompute_term_explanations.py` fills the store for every lexicon term.
+Code running on an event loop uses `aget`/`aput`, which reach Postgres through
+src/utils/async_db.py instead of blocking the loop.
+
+Configuration (env):
+EXPLANATION_CACHE_TTL_SECONDS (default 604800), EXPLANATION_CACHE_MAX_ENTRIES (default 4096),
+EXPLANATION_CACHE_USE_DB (default "true")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from src.utils.async_db import aget_cached_explanation, asave_cached_explanation
+from src.utils.bank_term_lexicon import _normalize_term
+from src.utils.db import get_cached_explanation, save_cached_explanation
+
+# Bump when the explanation prompt/agent changes so old explanations stop matching
+EXPLANATION_CACHE_VERSION = "v1"
+
+
+def explanation_key(term: str, education_bucket: str, product_key: Optional[str]) -> str:
+    """Cache key for an explanation."""
+    product = " ".join((product_key or "").lower().split())
+    raw = f"{EXPLANATION_CACHE_VERSION}|{_normalize_term(term or '')}|{education_bucket}|{product}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ExplanationCache:
+    """Two-tier (in-process LRU + Postgres) store for term explanations."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int, use_database: bool = True) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.use_database = use_database
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_local(self, key: str) -> str | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, text = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return text
+
+    def _put_local(self, key: str, text: str, ttl_seconds: float | None = None) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (ttl_seconds or self.ttl_seconds), text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, term: str, education_bucket: str, product_key: Optional[str]) -> str | None:
+        """Stored explanation or None if missing/expired."""
+        key = explanation_key(term, education_bucket, product_key)
+        text = self._get_local(key)
+        if text is None and self.use_database:
+            cached = get_cached_explanation(key)
+            if cached is not None:
+                text, remaining_seconds = cached
+                self._put_local(key, text, remaining_seconds)
+        return text
+
+    def put(self, term: str, education_bucket: str, product_key: Optional[str], text: str) -> None:
+        """Store an explanation (empty texts are ignored)."""
+        if not text:
+            return
+        key = explanation_key(term, education_bucket, product_key)
+        self._put_local(key, text)
+        if self.use_database:
+            save_cached_explanation(
+                key,
+                term=_normalize_term(term or ""),
+                education_bucket=education_bucket,
+                product_key=product_key or "",
+                explanation=text,
+                ttl_seconds=self.ttl_seconds,
+            )
+
+    async def aget(self, term: str, education_bucket: str, product_key: Optional[str]) -> str | None:
+        """Async `get` for event-loop code (the Postgres tier is awaited)."""
+        key = explanation_key(term, education_bucket, product_key)
+        text = self._get_local(key)
+        if text is None and self.use_database:
+            cached = await aget_cached_explanation(key)
+            if cached is not None:
+                text, remaining_seconds = cached
+                self._put_local(key, text, remaining_seconds)
+        return text
+
+    async def aput(self, term: str, education_bucket: str, product_key: Optional[str], text: str) -> None:
+        """Async `put` for event-loop code (the Postgres tier is awaited)."""
+        if not text:
+            return
+        key = explanation_key(term, education_bucket, product_key)
+        self._put_local(key, text)
+        if self.use_database:
+            await asave_cached_explanation(
+                key,
+                term=_normalize_term(term or ""),
+                education_bucket=education_bucket,
+                product_key=product_key or "",
+                explanation=text,
+                ttl_seconds=self.ttl_seconds,
+            )
+
+    def clear(self) -> None:
+        """Drop the in-process tier (the Postgres tier expires via TTL)."""
+        with self._lock:
+            self._entries.clear()
+
+
+explanation_cache = ExplanationCache(
+    ttl_seconds=int(os.getenv("EXPLANATION_CACHE_TTL_SECONDS", "604800")),
+    max_entries=int(os.getenv("EXPLANATION_CACHE_MAX_ENTRIES", "4096")),
+    use_database=os.getenv("EXPLANATION_CACHE_USE_DB", "true").lower() == "true",
+)
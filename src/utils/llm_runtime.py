@@ -0,0 +1,165 @@
+"""Shared process-wide async runtime for agent calls.
+
+Agents are async at their core, but Streamlit runs page scripts synchronously.
+Instead of spawning a thread + new event loop per call (or `asyncio.run` /
+`nest_asyncio` in pages), every agent call is scheduled on ONE long-lived
+background event loop owned by this module. HTTP connections and LiteLLM client
+state are reused across calls, and a timed-out call is cancelled on the loop
+instead of leaving an orphaned thread behind.
+
+Usage:
+    from src.utils import llm_runtime
+
+    future = llm_runtime.submit(agent, prompt, timeout=30)   # concurrent.futures.Future
+    result = future.result()                                 # RunResult
+
+    text = llm_runtime.run_sync(some_coroutine(), timeout=30)
+    for item in llm_runtime.stream(some_async_generator()):
+        ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+import time
+from typing import Any, AsyncIterable, Awaitable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_thread: threading.Thread | None = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting it on first use."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed() or _loop_thread is None or not _loop_thread.is_alive():
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run, name="llm-runtime-loop", daemon=True)
+            thread.start()
+            ready.wait()
+            _loop, _loop_thread = loop, thread
+        return _loop
+
+
+def in_runtime_loop() -> bool:
+    """True when called from code already running on the shared loop."""
+    try:
+        return asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        return False
+
+
+async def _with_timeout(awaitable: Awaitable[T], timeout: float | None) -> T:
+    if timeout is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, timeout)
+
+
+def run_coroutine(coro: Awaitable[T], timeout: float | None = None) -> concurrent.futures.Future:
+    """Schedule a coroutine on the shared loop and return a thread-safe future.
+
+    When `timeout` elapses the coroutine is cancelled on the loop and the
+    future raises `TimeoutError`.
+    """
+    if in_runtime_loop():
+        raise RuntimeError("run_coroutine() called from the runtime loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(_with_timeout(coro, timeout), get_loop())
+
+
+def run_sync(coro: Awaitable[T], timeout: float | None = None) -> T:
+    """Run a coroutine on the shared loop and block until it finishes.
+
+    Raises:
+        TimeoutError: If `timeout` elapsed (the coroutine is cancelled)
+    """
+    future = run_coroutine(coro, timeout)
+    try:
+        return future.result()
+    except concurrent.futures.CancelledError as e:
+        raise TimeoutError("Agent call was cancelled") from e
+
+
+def submit(agent: Any, prompt: Any, timeout: float | None = None, **run_kwargs: Any) -> concurrent.futures.Future:
+    """Run `Runner.run(agent, prompt, **run_kwargs)` on the shared loop.
+
+    Args:
+        agent: OpenAI Agents SDK agent
+        prompt: Input for the agent (string or input items)
+        timeout: Seconds before the run is cancelled (None = no limit)
+        **run_kwargs: Extra keyword arguments for Runner.run (e.g. max_turns, context)
+
+    Returns:
+        concurrent.futures.Future resolving to the RunResult
+    """
+    from agents import Runner
+
+    return run_coroutine(Runner.run(agent, prompt, **run_kwargs), timeout)
+
+
+def stream(
+    source: AsyncIterable[T],
+    timeout: float | None = None,
+    total_timeout: float | None = None,
+) -> Iterator[T]:
+    """Consume an async iterable on the shared loop from synchronous code.
+
+    Items are handed over through a queue as soon as they are produced, so a
+    Streamlit script can render partial results. Closing the iterator early
+    cancels the producer on the loop.
+
+    Args:
+        source: Async generator/iterable to drain on the shared loop
+        timeout: Max seconds to wait for EACH item (None = no limit)
+        total_timeout: Max seconds for the whole stream (None = no limit)
+
+    Raises:
+        TimeoutError: If no item arrived within `timeout`, or the stream is not
+            finished within `total_timeout`
+    """
+    items: queue.Queue = queue.Queue()
+    done_marker = object()
+
+    async def _pump() -> None:
+        try:
+            async for item in source:
+                items.put((item, None))
+        except Exception as e:  # surface producer errors to the consumer
+            items.put((done_marker, e))
+        else:
+            items.put((done_marker, None))
+
+    deadline = time.monotonic() + total_timeout if total_timeout is not None else None
+    future = run_coroutine(_pump())
+    try:
+        while True:
+            wait = timeout
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+                wait = remaining if wait is None else min(wait, remaining)
+            try:
+                item, error = items.get(timeout=wait)
+            except queue.Empty as e:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"Stream not finished within {total_timeout:g} seconds") from e
+                raise TimeoutError(f"No result within {timeout:g} seconds") from e
+            if item is done_marker:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        if not future.done():
+            future.cancel()
@@ -9,10 +9,53 @@ This module provides rational, justified calculations based on:
 All functions are deterministic and mathematically justified - no hallucinations.
 """
 
+import copy
+import hashlib
+import json
+import os
 import re
-from typing import Dict, List, Tuple
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
+
+import numpy as np
+
+from src.utils.projection_engine import months_to_targets, project_investments
+
+
+_PRODUCT_SECTION_RE = re.compile(r'### 3\.\d+')
+_GOALS_SECTION_RE = re.compile(r'\*\*Obiective Financiare:\*\*(.*?)(?=\n##|\Z)', re.DOTALL)
+_SHORT_TERM_RE = re.compile(r'termen scurt.*?:(.*?)(?=termen mediu|\Z)', re.DOTALL | re.IGNORECASE)
+_MEDIUM_TERM_RE = re.compile(r'termen mediu.*?:(.*?)(?=termen lung|\Z)', re.DOTALL | re.IGNORECASE)
+_LONG_TERM_RE = re.compile(r'termen lung.*?:(.*?)(?=\n##|\Z)', re.DOTALL | re.IGNORECASE)
+
+
+def _goal_lines(match: Optional[re.Match]) -> Tuple[str, ...]:
+    if not match:
+        return ()
+    return tuple(g.strip('- \n') for g in match.group(1).split('\n') if g.strip('- \n'))
+
+
+@lru_cache(maxsize=256)
+def _parse_plan_text(plan_text: str) -> Tuple[int, Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    """Regex pass over a plan text (memoized per text): product count and goals per term."""
+    # Count products mentioned (look for "### 3." pattern)
+    total_products = len(_PRODUCT_SECTION_RE.findall(plan_text))
+    
+    # Extract goals from the objectives section
+    goals_section = _GOALS_SECTION_RE.search(plan_text)
+    if not goals_section:
+        return total_products, (), (), ()
+    goals_text = goals_section.group(1)
+    return (
+        total_products,
+        _goal_lines(_SHORT_TERM_RE.search(goals_text)),   # Short term (1-3 years)
+        _goal_lines(_MEDIUM_TERM_RE.search(goals_text)),  # Medium term (3-7 years)
+        _goal_lines(_LONG_TERM_RE.search(goals_text)),    # Long term (7+ years)
+    )
 
 
 def extract_plan_metrics(plan_text: str, user_profile: dict) -> Dict:
@@ -26,43 +69,18 @@ def extract_plan_metrics(plan_text: str, user_profile: dict) -> Dict:
     Returns:
         Dictionary with extracted metrics
     """
-    metrics = {
-        "total_products": 0,
-        "short_term_goals": [],
-        "medium_term_goals": [],
-        "long_term_goals": [],
+    total_products, short_term, medium_term, long_term = _parse_plan_text(plan_text)
+    return {
+        "total_products": total_products,
+        "short_term_goals": list(short_term),
+        "medium_term_goals": list(medium_term),
+        "long_term_goals": list(long_term),
         "monthly_income": user_profile.get("annual_income", 0) / 12,
         "annual_income": user_profile.get("annual_income", 0),
         "age": user_profile.get("age", 30),
         "has_children": user_profile.get("has_children", False),
         "risk_level": user_profile.get("risk_tolerance", "medie"),
     }
-    
-    # Count products mentioned (look for "### 3." pattern)
-    product_sections = re.findall(r'### 3\.\d+', plan_text)
-    metrics["total_products"] = len(product_sections)
-    
-    # Extract goals from the objectives section
-    goals_section = re.search(r'\*\*Obiective Financiare:\*\*(.*?)(?=\n##|\Z)', plan_text, re.DOTALL)
-    if goals_section:
-        goals_text = goals_section.group(1)
-        
-        # Short term (1-3 years)
-        short_match = re.search(r'termen scurt.*?:(.*?)(?=termen mediu|\Z)', goals_text, re.DOTALL | re.IGNORECASE)
-        if short_match:
-            metrics["short_term_goals"] = [g.strip('- \n') for g in short_match.group(1).split('\n') if g.strip('- \n')]
-        
-        # Medium term (3-7 years)
-        medium_match = re.search(r'termen mediu.*?:(.*?)(?=termen lung|\Z)', goals_text, re.DOTALL | re.IGNORECASE)
-        if medium_match:
-            metrics["medium_term_goals"] = [g.strip('- \n') for g in medium_match.group(1).split('\n') if g.strip('- \n')]
-        
-        # Long term (7+ years)
-        long_match = re.search(r'termen lung.*?:(.*?)(?=\n##|\Z)', goals_text, re.DOTALL | re.IGNORECASE)
-        if long_match:
-            metrics["long_term_goals"] = [g.strip('- \n') for g in long_match.group(1).split('\n') if g.strip('- \n')]
-    
-    return metrics
 
 
 def calculate_savings_capacity(user_profile: dict) -> Dict:
@@ -128,6 +146,9 @@ def calculate_investment_projections(
     """
     Calculate year-by-year investment growth projections.
     
+    Thin wrapper over the vectorized engine (src/utils/projection_engine.py);
+    use `project_investments` directly to project many scenarios at once.
+    
     Args:
         initial_amount: Starting investment amount
         monthly_contribution: Monthly contribution
@@ -137,29 +158,43 @@ def calculate_investment_projections(
     Returns:
         List of yearly projections with breakdown
     """
-    projections = []
-    current_balance = initial_amount
-    total_contributions = initial_amount
+    if years <= 0:
+        return []
+    return project_investments(initial_amount, monthly_contribution, annual_return_rate, years).to_records()
+
+
+# Risk score per product category (1 = very low ... 4 = medium-high)
+PRODUCT_RISK_SCORES = {
+    "cont_economii": 1,      # Very low risk
+    "depozit": 1,            # Very low risk
+    "titluri_venit_fix": 2,  # Low risk
+    "pensie_privata": 3,     # Medium risk
+    "fond_investitii": 4,    # Medium-high risk
+}
+
+
+def infer_product_category(product: str) -> str:
+    """
+    Map a product name/ID to one of the return-estimate categories.
     
-    for year in range(1, years + 1):
-        # Add monthly contributions
-        yearly_contributions = monthly_contribution * 12
-        total_contributions += yearly_contributions
-        current_balance += yearly_contributions
-        
-        # Apply annual return
-        yearly_return = current_balance * annual_return_rate
-        current_balance += yearly_return
-        
-        projections.append({
-            "year": year,
-            "balance": round(current_balance, 2),
-            "total_contributions": round(total_contributions, 2),
-            "total_returns": round(current_balance - total_contributions, 2),
-            "yearly_return": round(yearly_return, 2),
-        })
+    Args:
+        product: Product name or ID (Romanian or English)
     
-    return projections
+    Returns:
+        Category key (cont_economii, depozit, fond_investitii, pensie_privata, titluri_venit_fix)
+    """
+    product_lower = product.lower()
+    if "economii" in product_lower or "savings" in product_lower:
+        return "cont_economii"
+    if "depozit" in product_lower or "deposit" in product_lower:
+        return "depozit"
+    if "fond" in product_lower or "invest" in product_lower:
+        return "fond_investitii"
+    if "pensie" in product_lower or "pension" in product_lower:
+        return "pensie_privata"
+    if "titlu" in product_lower or "bond" in product_lower:
+        return "titluri_venit_fix"
+    return "cont_economii"  # Default
 
 
 def estimate_product_returns(user_profile: dict, products: List[str]) -> Dict:
@@ -208,19 +243,7 @@ def estimate_product_returns(user_profile: dict, products: List[str]) -> Dict:
     estimated_returns = {}
     for product in products:
         # Match product to category
-        product_lower = product.lower()
-        if "economii" in product_lower or "savings" in product_lower:
-            category = "cont_economii"
-        elif "depozit" in product_lower or "deposit" in product_lower:
-            category = "depozit"
-        elif "fond" in product_lower or "invest" in product_lower:
-            category = "fond_investitii"
-        elif "pensie" in product_lower or "pension" in product_lower:
-            category = "pensie_privata"
-        elif "titlu" in product_lower or "bond" in product_lower:
-            category = "titluri_venit_fix"
-        else:
-            category = "cont_economii"  # Default
+        category = infer_product_category(product)
         
         estimated_returns[product] = {
             "annual_return_rate": return_estimates[category].get(risk_level, return_estimates[category]["medie"]),
@@ -231,77 +254,162 @@ def estimate_product_returns(user_profile: dict, products: List[str]) -> Dict:
     return estimated_returns
 
 
-def calculate_goal_timeline(user_profile: dict, goal: str) -> Dict:
+# Goal estimates (conservative amounts in RON), matched in this priority order
+GOAL_AMOUNTS = {
+    "economii pe termen scurt": 15000,
+    "economii pe termen lung": 100000,
+    "investiții": 50000,
+    "cumpărare casă": 150000,  # Down payment (30% of 500K)
+    "cumpărare locuință": 150000,
+    "educație copii": 80000,  # University costs
+    "pensionare": 500000,  # Retirement fund
+    "călătorii": 20000,
+    "achiziții mari": 30000,
+    "fond urgență": None,  # Emergency fund target from the savings capacity
+}
+DEFAULT_GOAL_AMOUNT = 50000
+GOAL_SAVINGS_RETURN = 0.05  # Assumed annual return on goal savings
+MILESTONE_FRACTIONS = np.array([0.25, 0.5, 0.75, 1.0])  # 25%, 50%, 75%, 100%
+
+_GOAL_KEYWORD_PRIORITY = {keyword: rank for rank, keyword in enumerate(GOAL_AMOUNTS)}
+# One pass over the goal text; the lookahead also reports overlapping keywords
+_GOAL_KEYWORD_RE = re.compile("(?=(" + "|".join(re.escape(k) for k in GOAL_AMOUNTS) + "))")
+
+
+def match_goal_keyword(goal: str) -> Optional[str]:
     """
-    Calculate realistic timeline for achieving specific financial goals.
+    Find the highest-priority `GOAL_AMOUNTS` keyword contained in a goal.
     
     Args:
-        user_profile: User profile dictionary
         goal: Financial goal name
     
     Returns:
-        Dictionary with timeline and milestones
+        Matching keyword or None
     """
-    savings_capacity = calculate_savings_capacity(user_profile)
-    monthly_savings = savings_capacity["monthly_savings_potential"]
-    age = user_profile.get("age", 35)
+    found = {m.group(1) for m in _GOAL_KEYWORD_RE.finditer(goal.lower())}
+    return min(found, key=_GOAL_KEYWORD_PRIORITY.__getitem__) if found else None
+
+
+def _format_month_offsets(offsets: np.ndarray, start: datetime) -> np.ndarray:
+    """'%B %Y' labels for start + offsets months (each distinct month formatted once)."""
+    absolute = start.year * 12 + (start.month - 1) + offsets.astype(np.int64)
+    unique, inverse = np.unique(absolute, return_inverse=True)
+    labels = np.array([datetime(int(m // 12), int(m % 12) + 1, 1).strftime("%B %Y") for m in unique], dtype=object)
+    return labels[inverse].reshape(offsets.shape)
+
+
+def solve_goal_timelines(
+    targets,
+    monthly_contributions,
+    annual_returns=GOAL_SAVINGS_RETURN,
+    start: Optional[datetime] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Solve many goals at once: months to each target and milestone dates.
+    
+    Inputs broadcast against each other. Goals without positive contributions
+    get 0 months, no completion date and no milestones (like `calculate_goal_timeline`).
     
-    # Goal estimates (conservative amounts in RON)
-    goal_amounts = {
-        "economii pe termen scurt": 15000,
-        "economii pe termen lung": 100000,
-        "investiții": 50000,
-        "cumpărare casă": 150000,  # Down payment (30% of 500K)
-        "cumpărare locuință": 150000,
-        "educație copii": 80000,  # University costs
-        "pensionare": 500000,  # Retirement fund
-        "călătorii": 20000,
-        "achiziții mari": 30000,
-        "fond urgență": savings_capacity["emergency_fund_target"],
+    Args:
+        targets: Target amounts
+        monthly_contributions: Monthly contributions
+        annual_returns: Annual return rates (e.g., 0.05 for 5%)
+        start: Date the contributions start (default: now)
+    
+    Returns:
+        Dictionary of arrays: months_needed (N,), years_needed (N,), completion (N,),
+        milestone_months (N, 4), milestone_dates (N, 4), reachable (N,) bool
+    """
+    start = start or datetime.now()
+    targets, contributions, rates = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(targets, dtype=float)),
+        np.atleast_1d(np.asarray(monthly_contributions, dtype=float)),
+        np.atleast_1d(np.asarray(annual_returns, dtype=float)),
+    )
+    reachable = contributions > 0
+    months_needed = np.where(reachable, months_to_targets(targets, contributions, rates), 0.0)
+    milestone_months = np.floor(months_needed[:, None] * MILESTONE_FRACTIONS[None, :]).astype(np.int64)
+    dates = _format_month_offsets(
+        np.concatenate([milestone_months, np.floor(months_needed).astype(np.int64)[:, None]], axis=1),
+        start,
+    )
+    return {
+        "months_needed": months_needed,
+        "years_needed": months_needed / 12,
+        "completion": np.where(months_needed > 0, dates[:, -1], "N/A"),
+        "milestone_months": milestone_months,
+        "milestone_dates": dates[:, :-1],
+        "reachable": reachable,
     }
+
+
+def calculate_goal_timelines(user_profile: dict, goals: List[str], savings_capacity: Optional[Dict] = None) -> List[Dict]:
+    """
+    Calculate realistic timelines for several financial goals in one vectorized pass.
     
-    # Find matching goal
-    goal_lower = goal.lower()
-    target_amount = 50000  # Default
+    Args:
+        user_profile: User profile dictionary
+        goals: Financial goal names
+        savings_capacity: Precomputed `calculate_savings_capacity` result (computed if omitted)
     
-    for key, amount in goal_amounts.items():
-        if key in goal_lower:
-            target_amount = amount
-            break
+    Returns:
+        One timeline dictionary per goal (see `calculate_goal_timeline`)
+    """
+    if not goals:
+        return []
+    if savings_capacity is None:
+        savings_capacity = calculate_savings_capacity(user_profile)
+    monthly_savings = savings_capacity["monthly_savings_potential"]
     
-    # Calculate timeline
-    if monthly_savings > 0:
-        # Assuming 5% annual return on savings
-        months_needed = calculate_months_to_goal(target_amount, monthly_savings, 0.05)
+    targets = []
+    for goal in goals:
+        keyword = match_goal_keyword(goal)
+        amount = GOAL_AMOUNTS[keyword] if keyword else DEFAULT_GOAL_AMOUNT
+        targets.append(savings_capacity["emergency_fund_target"] if amount is None else amount)
+    
+    solved = solve_goal_timelines(targets, monthly_savings, GOAL_SAVINGS_RETURN)
+    timelines = []
+    for i, goal in enumerate(goals):
+        target_amount = targets[i]
+        months_needed = float(solved["months_needed"][i])
         years_needed = months_needed / 12
-    else:
-        months_needed = 0
-        years_needed = 0
-    
-    # Create milestones
-    milestones = []
-    if years_needed > 0:
-        milestone_intervals = [0.25, 0.5, 0.75, 1.0]  # 25%, 50%, 75%, 100%
-        for interval in milestone_intervals:
-            milestone_months = int(months_needed * interval)
-            milestone_date = datetime.now() + relativedelta(months=milestone_months)
-            milestones.append({
-                "percentage": int(interval * 100),
-                "amount": round(target_amount * interval, 2),
-                "date": milestone_date.strftime("%B %Y"),
-                "months_from_now": milestone_months,
-            })
+        milestones = []
+        if years_needed > 0:
+            milestones = [
+                {
+                    "percentage": int(fraction * 100),
+                    "amount": round(target_amount * fraction, 2),
+                    "date": solved["milestone_dates"][i, j],
+                    "months_from_now": int(solved["milestone_months"][i, j]),
+                }
+                for j, fraction in enumerate(MILESTONE_FRACTIONS.tolist())
+            ]
+        timelines.append({
+            "goal": goal,
+            "target_amount": round(target_amount, 2),
+            "monthly_contribution": round(monthly_savings, 2),
+            "months_needed": round(months_needed, 1),
+            "years_needed": round(years_needed, 1),
+            "estimated_completion": str(solved["completion"][i]),
+            "milestones": milestones,
+            "feasibility": "realistic" if years_needed < 10 else "long-term" if years_needed < 20 else "ambitious",
+        })
+    return timelines
+
+
+def calculate_goal_timeline(user_profile: dict, goal: str, savings_capacity: Optional[Dict] = None) -> Dict:
+    """
+    Calculate realistic timeline for achieving specific financial goals.
     
-    return {
-        "goal": goal,
-        "target_amount": round(target_amount, 2),
-        "monthly_contribution": round(monthly_savings, 2),
-        "months_needed": round(months_needed, 1),
-        "years_needed": round(years_needed, 1),
-        "estimated_completion": (datetime.now() + relativedelta(months=int(months_needed))).strftime("%B %Y") if months_needed > 0 else "N/A",
-        "milestones": milestones,
-        "feasibility": "realistic" if years_needed < 10 else "long-term" if years_needed < 20 else "ambitious",
-    }
+    Args:
+        user_profile: User profile dictionary
+        goal: Financial goal name
+        savings_capacity: Precomputed `calculate_savings_capacity` result (computed if omitted)
+    
+    Returns:
+        Dictionary with timeline and milestones
+    """
+    return calculate_goal_timelines(user_profile, [goal], savings_capacity=savings_capacity)[0]
 
 
 def calculate_months_to_goal(target: float, monthly_contribution: float, annual_return: float) -> float:
@@ -316,58 +424,34 @@ def calculate_months_to_goal(target: float, monthly_contribution: float, annual_
     Returns:
         Number of months needed
     """
-    if monthly_contribution <= 0:
-        return float('inf')
-    
-    if annual_return <= 0:
-        # Simple division without interest
-        return target / monthly_contribution
-    
-    # Monthly interest rate
-    monthly_rate = annual_return / 12
-    
-    # Future value of annuity formula solved for n (periods)
-    # FV = PMT * ((1 + r)^n - 1) / r
-    # Solving for n when FV = target
-    import math
-    
-    try:
-        if monthly_rate == 0:
-            return target / monthly_contribution
-        
-        numerator = math.log(1 + (target * monthly_rate) / monthly_contribution)
-        denominator = math.log(1 + monthly_rate)
-        months = numerator / denominator
-        
-        return max(1, months)  # At least 1 month
-    except:
-        # Fallback to simple calculation
-        return target / monthly_contribution
+    return float(months_to_targets(target, monthly_contribution, annual_return)[0])
+
 
+# Conservative return rates based on risk
+WEALTH_RETURN_RATES = {
+    "scăzută": 0.04,   # 4% conservative
+    "medie": 0.06,     # 6% balanced
+    "ridicată": 0.08,  # 8% growth
+}
 
-def calculate_wealth_projection(user_profile: dict, years: int = 10) -> Dict:
+
+def calculate_wealth_projection(user_profile: dict, years: int = 10, savings_capacity: Optional[Dict] = None) -> Dict:
     """
     Project wealth growth over time based on profile and savings.
     
     Args:
         user_profile: User profile dictionary
         years: Number of years to project
+        savings_capacity: Precomputed `calculate_savings_capacity` result (computed if omitted)
     
     Returns:
         Dictionary with wealth projection data
     """
-    savings_capacity = calculate_savings_capacity(user_profile)
+    if savings_capacity is None:
+        savings_capacity = calculate_savings_capacity(user_profile)
     monthly_savings = savings_capacity["monthly_savings_potential"]
     risk_level = user_profile.get("risk_tolerance", "medie").lower()
-    
-    # Conservative return rates based on risk
-    return_rates = {
-        "scăzută": 0.04,   # 4% conservative
-        "medie": 0.06,     # 6% balanced
-        "ridicată": 0.08,  # 8% growth
-    }
-    
-    annual_return = return_rates.get(risk_level, 0.06)
+    annual_return = WEALTH_RETURN_RATES.get(risk_level, 0.06)
     
     # Calculate projections
     projections = calculate_investment_projections(
@@ -396,31 +480,191 @@ def calculate_wealth_projection(user_profile: dict, years: int = 10) -> Dict:
     }
 
 
-def analyze_plan_risk_return(user_profile: dict, products: List[str]) -> Dict:
+# Annual return volatility per product category (conservative historical ranges)
+CATEGORY_VOLATILITY = {
+    "cont_economii": 0.005,
+    "depozit": 0.01,
+    "titluri_venit_fix": 0.04,
+    "pensie_privata": 0.08,
+    "fond_investitii": 0.14,
+}
+
+# Portfolio simulated when the plan has no products yet
+DEFAULT_RISK_PORTFOLIOS = {
+    "scăzută": ["depozit"],
+    "medie": ["depozit", "fond_investitii"],
+    "ridicată": ["fond_investitii"],
+}
+
+MONTE_CARLO_PATHS = 20000
+MONTE_CARLO_SEED = 42
+# Paths simulated per chunk (bounds memory to chunk x months x categories floats)
+MONTE_CARLO_CHUNK_SIZE = 4096
+
+
+def simulate_wealth_paths(
+    initial_amount: float,
+    monthly_contribution: float,
+    category_returns: Dict[str, float],
+    years: int,
+    n_paths: int = MONTE_CARLO_PATHS,
+    seed: int = MONTE_CARLO_SEED,
+    chunk_size: int = MONTE_CARLO_CHUNK_SIZE,
+) -> np.ndarray:
+    """
+    Simulate year-end balances over random monthly return paths.
+    
+    Each category gets lognormal monthly returns with its expected annual
+    return and CATEGORY_VOLATILITY; the portfolio holds the categories in
+    equal weights, rebalanced monthly. Each month the contribution is added,
+    then the month's return is applied. Paths come in antithetic pairs
+    (shocks z and -z), which halves the random draws and reduces variance.
+    The seeded generator makes results reproducible (and independent of
+    `chunk_size`).
+    
+    Args:
+        initial_amount: Starting amount
+        monthly_contribution: Monthly contribution
+        category_returns: Category -> expected annual return (e.g., 0.05 for 5%)
+        years: Number of years to simulate
+        n_paths: Number of simulated paths
+        seed: Seed for numpy.random.Generator
+        chunk_size: Paths simulated at once
+    
+    Returns:
+        Array of shape (n_paths, years) with the balance at the end of each year
+    """
+    if years <= 0 or n_paths <= 0:
+        return np.zeros((max(n_paths, 0), max(years, 0)))
+    if not category_returns:
+        category_returns = {"cont_economii": 0.0}
+
+    categories = sorted(category_returns)
+    mean_return = np.array([category_returns[c] for c in categories])
+    monthly_sigma = np.array([CATEGORY_VOLATILITY.get(c, 0.05) for c in categories]) / np.sqrt(12)
+    # Drift chosen so the expected compounded annual growth equals the expected return
+    monthly_drift = np.log1p(mean_return) / 12 - monthly_sigma ** 2 / 2
+    # exp(drift + sigma*z) = exp(drift) * exp(sigma*z): fold exp(drift) and the weights together
+    drift_weights = (np.exp(monthly_drift) / len(categories)).astype(np.float32)
+    monthly_sigma = monthly_sigma.astype(np.float32)
+
+    months = years * 12
+    chunk_size += chunk_size % 2  # keep antithetic pairs inside a chunk
+    rng = np.random.default_rng(seed)
+    year_end_balances = np.empty((n_paths, years))
+    for start in range(0, n_paths, chunk_size):
+        paths = min(chunk_size, n_paths - start)
+        shocks = rng.standard_normal(((paths + 1) // 2, months, len(categories)), dtype=np.float32)
+        np.multiply(shocks, monthly_sigma, out=shocks)
+        np.exp(shocks, out=shocks)
+        # Portfolio gross return per month; path 2k uses z, path 2k+1 uses -z
+        portfolio_growth = np.empty((2 * shocks.shape[0], months))
+        portfolio_growth[0::2] = shocks @ drift_weights
+        portfolio_growth[1::2] = np.reciprocal(shocks, out=shocks) @ drift_weights
+        portfolio_growth = portfolio_growth[:paths]
+
+        cumulative = np.cumprod(portfolio_growth, axis=1)
+        previous = np.concatenate([np.ones((paths, 1)), cumulative[:, :-1]], axis=1)
+        # B_m = G_m * (B_0 + c * sum_{k<=m} 1 / G_{k-1})
+        balances = cumulative * (initial_amount + monthly_contribution * np.cumsum(1 / previous, axis=1))
+        year_end_balances[start:start + paths] = balances[:, 11::12]
+    return year_end_balances
+
+
+def simulate_wealth_monte_carlo(
+    user_profile: dict,
+    products: List[str],
+    years: int = 10,
+    goals: Optional[Dict[str, float]] = None,
+    n_paths: int = MONTE_CARLO_PATHS,
+    seed: int = MONTE_CARLO_SEED,
+    savings_capacity: Optional[Dict] = None,
+    product_returns: Optional[Dict] = None,
+) -> Dict:
+    """
+    Monte Carlo wealth projection with percentile bands and goal probabilities.
+    
+    Args:
+        user_profile: User profile dictionary
+        products: List of products in the plan (their categories are simulated)
+        years: Number of years to project
+        goals: Goal name -> target amount (RON)
+        n_paths: Number of simulated paths
+        seed: Seed for reproducible results
+        savings_capacity: Precomputed `calculate_savings_capacity` result (computed if omitted)
+        product_returns: Precomputed `estimate_product_returns(user_profile, products)` result
+    
+    Returns:
+        Dictionary with yearly P10/P50/P90 bands (fan chart) and goal success probabilities
+    """
+    if savings_capacity is None:
+        savings_capacity = calculate_savings_capacity(user_profile)
+    monthly_savings = max(savings_capacity["monthly_savings_potential"], 0)
+    risk_level = user_profile.get("risk_tolerance", "medie").lower()
+
+    if not products:
+        products = DEFAULT_RISK_PORTFOLIOS.get(risk_level, DEFAULT_RISK_PORTFOLIOS["medie"])
+        product_returns = None
+    if product_returns is None:
+        product_returns = estimate_product_returns(user_profile, products)
+    category_returns = {
+        estimate["category"]: estimate["annual_return_rate"]
+        for estimate in product_returns.values()
+    }
+
+    balances = simulate_wealth_paths(0, monthly_savings, category_returns, years, n_paths=n_paths, seed=seed)
+    p10, p50, p90 = np.percentile(balances, [10, 50, 90], axis=0) if years > 0 else ([], [], [])
+
+    goal_probabilities = []
+    for goal, target in (goals or {}).items():
+        reached_by_year = (balances >= target).mean(axis=0) if years > 0 else np.array([])
+        goal_probabilities.append({
+            "goal": goal,
+            "target_amount": round(target, 2),
+            "probability": round(float(reached_by_year[-1]) * 100, 1) if years > 0 else 0,
+            "probability_by_year": [round(float(p) * 100, 1) for p in reached_by_year],
+        })
+
+    return {
+        "years": list(range(1, years + 1)),
+        "fan_chart": {
+            "p10": [round(float(v), 2) for v in p10],
+            "p50": [round(float(v), 2) for v in p50],
+            "p90": [round(float(v), 2) for v in p90],
+        },
+        "total_contributions": [round(monthly_savings * 12 * y, 2) for y in range(1, years + 1)],
+        "goal_probabilities": goal_probabilities,
+        "summary": {
+            "paths": n_paths,
+            "seed": seed,
+            "monthly_contribution": round(monthly_savings, 2),
+            "categories": {c: round(r * 100, 2) for c, r in sorted(category_returns.items())},
+            "median_final_balance": round(float(p50[-1]), 2) if years > 0 else 0,
+        },
+    }
+
+
+def analyze_plan_risk_return(user_profile: dict, products: List[str], product_returns: Optional[Dict] = None) -> Dict:
     """
     Analyze the risk-return profile of the financial plan.
     
     Args:
         user_profile: User profile dictionary
         products: List of products in the plan
+        product_returns: Precomputed `estimate_product_returns` result (computed if omitted)
     
     Returns:
         Dictionary with risk-return analysis
     """
-    product_returns = estimate_product_returns(user_profile, products)
+    if product_returns is None:
+        product_returns = estimate_product_returns(user_profile, products)
     
     # Calculate weighted average return
     total_return = sum(p["annual_return_rate"] for p in product_returns.values())
     avg_return = total_return / len(product_returns) if product_returns else 0
     
     # Risk categorization
-    risk_scores = {
-        "cont_economii": 1,      # Very low risk
-        "depozit": 1,            # Very low risk
-        "titluri_venit_fix": 2,  # Low risk
-        "pensie_privata": 3,     # Medium risk
-        "fond_investitii": 4,    # Medium-high risk
-    }
+    risk_scores = PRODUCT_RISK_SCORES
     
     # Calculate portfolio risk
     total_risk_score = 0
@@ -455,44 +699,67 @@ def analyze_plan_risk_return(user_profile: dict, products: List[str]) -> Dict:
     }
 
 
-def generate_key_statistics(user_profile: dict, plan_text: str, products: List[str]) -> Dict:
+# Memoized key statistics (plan page re-renders call this with the same inputs)
+KEY_STATS_CACHE_TTL_SECONDS = int(os.getenv("KEY_STATS_CACHE_TTL_SECONDS", "3600"))
+KEY_STATS_CACHE_MAX_ENTRIES = int(os.getenv("KEY_STATS_CACHE_MAX_ENTRIES", "256"))
+
+_key_stats_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+_key_stats_lock = threading.Lock()
+
+
+def key_statistics_cache_key(user_profile: dict, plan_text: str, products: List[str]) -> str:
     """
-    Generate all key statistics for the plan view page.
-    
-    Args:
-        user_profile: Complete user profile
-        plan_text: Financial plan text
-        products: List of product names/IDs
+    Cache key for `generate_key_statistics`: profile hash + plan-text hash + products.
     
-    Returns:
-        Comprehensive statistics dictionary
+    The profile is hashed exactly (sorted-key JSON), so every field that feeds
+    the statistics - including diacritics in risk_tolerance - changes the key.
     """
-    # Extract metrics from plan
+    profile_hash = hashlib.sha256(
+        json.dumps(user_profile, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+    plan_hash = hashlib.sha256((plan_text or "").encode("utf-8")).hexdigest()
+    raw = f"{profile_hash}|{plan_hash}|{json.dumps(list(products or []), ensure_ascii=False)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def clear_key_statistics_cache() -> None:
+    """Drop all memoized key statistics."""
+    with _key_stats_lock:
+        _key_stats_cache.clear()
+    _parse_plan_text.cache_clear()
+
+
+def _plan_goals(plan_metrics: Dict) -> List[str]:
+    """Top 3 goals of a plan (short, then medium, then long term)."""
+    all_goals = (
+        plan_metrics.get("short_term_goals", []) +
+        plan_metrics.get("medium_term_goals", []) +
+        plan_metrics.get("long_term_goals", [])
+    )
+    return [goal for goal in all_goals[:3] if goal and len(goal) > 5]
+
+
+def _compute_key_statistics(
+    user_profile: dict,
+    plan_text: str,
+    products: List[str],
+    include_simulation: bool = True,
+) -> Dict:
+    """Uncached `generate_key_statistics`; every intermediate is computed once."""
     plan_metrics = extract_plan_metrics(plan_text, user_profile)
-    
-    # Calculate savings capacity
     savings_capacity = calculate_savings_capacity(user_profile)
+    product_returns = estimate_product_returns(user_profile, products)
     
     # Calculate wealth projection (10 years)
-    wealth_projection = calculate_wealth_projection(user_profile, years=10)
+    wealth_projection = calculate_wealth_projection(user_profile, years=10, savings_capacity=savings_capacity)
     
     # Analyze risk-return
-    risk_return = analyze_plan_risk_return(user_profile, products)
-    
-    # Calculate timelines for goals
-    goal_timelines = []
-    all_goals = (
-        plan_metrics.get("short_term_goals", []) +
-        plan_metrics.get("medium_term_goals", []) +
-        plan_metrics.get("long_term_goals", [])
-    )
+    risk_return = analyze_plan_risk_return(user_profile, products, product_returns=product_returns)
     
-    for goal in all_goals[:3]:  # Top 3 goals
-        if goal and len(goal) > 5:
-            timeline = calculate_goal_timeline(user_profile, goal)
-            goal_timelines.append(timeline)
+    # Calculate timelines for the top 3 goals
+    goal_timelines = calculate_goal_timelines(user_profile, _plan_goals(plan_metrics), savings_capacity=savings_capacity)
     
-    return {
+    statistics = {
         "plan_metrics": plan_metrics,
         "savings_capacity": savings_capacity,
         "wealth_projection": wealth_projection,
@@ -500,3 +767,125 @@ def generate_key_statistics(user_profile: dict, plan_text: str, products: List[s
         "goal_timelines": goal_timelines,
         "generated_at": datetime.now().isoformat(),
     }
+    if include_simulation:
+        # Percentile bands + goal success probabilities (10 years)
+        statistics["wealth_simulation"] = simulate_wealth_monte_carlo(
+            user_profile,
+            products,
+            years=10,
+            goals={t["goal"]: t["target_amount"] for t in goal_timelines},
+            savings_capacity=savings_capacity,
+            product_returns=product_returns,
+        )
+    return statistics
+
+
+def generate_key_statistics(user_profile: dict, plan_text: str, products: List[str], use_cache: bool = True) -> Dict:
+    """
+    Generate all key statistics for the plan view page.
+    
+    Results are memoized in-process for KEY_STATS_CACHE_TTL_SECONDS, keyed by
+    `key_statistics_cache_key`; callers get their own copy.
+    
+    Args:
+        user_profile: Complete user profile
+        plan_text: Financial plan text
+        products: List of product names/IDs
+        use_cache: Set False to bypass the memoization layer
+    
+    Returns:
+        Comprehensive statistics dictionary
+    """
+    if not use_cache or KEY_STATS_CACHE_MAX_ENTRIES <= 0:
+        return _compute_key_statistics(user_profile, plan_text, products)
+    
+    key = key_statistics_cache_key(user_profile, plan_text, products)
+    now = time.monotonic()
+    with _key_stats_lock:
+        item = _key_stats_cache.get(key)
+        if item is not None and item[0] > now:
+            _key_stats_cache.move_to_end(key)
+            return copy.deepcopy(item[1])
+    
+    statistics = _compute_key_statistics(user_profile, plan_text, products)
+    with _key_stats_lock:
+        _key_stats_cache[key] = (now + KEY_STATS_CACHE_TTL_SECONDS, statistics)
+        _key_stats_cache.move_to_end(key)
+        while len(_key_stats_cache) > KEY_STATS_CACHE_MAX_ENTRIES:
+            _key_stats_cache.popitem(last=False)
+    return copy.deepcopy(statistics)
+
+
+def generate_key_statistics_frame(users: Iterable[Dict[str, Any]], include_simulation: bool = False, years: int = 10):
+    """
+    Compute summary statistics for many users at once (portfolio-wide dashboards).
+    
+    Each item needs a "user_profile" and may carry "user_id", "plan_text" and
+    "products". The wealth projections of all users are computed in a single
+    vectorized `project_investments` call; the Monte Carlo simulation (~0.1s
+    per user) only runs when `include_simulation` is True.
+    
+    Args:
+        users: Iterable of {"user_id", "user_profile", "plan_text", "products"} dicts
+        include_simulation: Add P10/P50/P90 final wealth from the Monte Carlo simulation
+        years: Projection horizon in years
+    
+    Returns:
+        pandas DataFrame with one row per user
+    """
+    import pandas as pd
+    
+    rows = []
+    monthly_savings, annual_returns = [], []
+    for index, user in enumerate(users):
+        user_profile = user.get("user_profile") or {}
+        products = list(user.get("products") or [])
+        plan_metrics = extract_plan_metrics(user.get("plan_text") or "", user_profile)
+        savings_capacity = calculate_savings_capacity(user_profile)
+        product_returns = estimate_product_returns(user_profile, products)
+        risk_return = analyze_plan_risk_return(user_profile, products, product_returns=product_returns)
+        risk_level = user_profile.get("risk_tolerance", "medie").lower()
+        
+        row = {
+            "user_id": user.get("user_id", index),
+            "age": plan_metrics["age"],
+            "risk_tolerance": plan_metrics["risk_level"],
+            "annual_income": plan_metrics["annual_income"],
+            "monthly_savings_potential": savings_capacity["monthly_savings_potential"],
+            "savings_ratio": savings_capacity["savings_ratio"],
+            "emergency_fund_target": savings_capacity["emergency_fund_target"],
+            "months_to_emergency_fund": savings_capacity["months_to_emergency_fund"],
+            "total_products": plan_metrics["total_products"],
+            "total_goals": len(_plan_goals(plan_metrics)),
+            "average_return": risk_return["average_return"],
+            "plan_risk_level": risk_return["risk_level"],
+            "risk_score": risk_return["risk_score"],
+            "sharpe_ratio": risk_return["sharpe_ratio"],
+            "diversification_score": risk_return["diversification_score"],
+        }
+        if include_simulation:
+            simulation = simulate_wealth_monte_carlo(
+                user_profile,
+                products,
+                years=years,
+                savings_capacity=savings_capacity,
+                product_returns=product_returns,
+            )
+            fan_chart = simulation["fan_chart"]
+            row.update({
+                "wealth_p10": fan_chart["p10"][-1] if fan_chart["p10"] else 0.0,
+                "wealth_p50": fan_chart["p50"][-1] if fan_chart["p50"] else 0.0,
+                "wealth_p90": fan_chart["p90"][-1] if fan_chart["p90"] else 0.0,
+            })
+        rows.append(row)
+        monthly_savings.append(savings_capacity["monthly_savings_potential"])
+        annual_returns.append(WEALTH_RETURN_RATES.get(risk_level, 0.06))
+    
+    frame = pd.DataFrame(rows)
+    if rows and years > 0:
+        # Same projection as calculate_wealth_projection, for every user in one call
+        projection = project_investments(0.0, np.asarray(monthly_savings), np.asarray(annual_returns), years)
+        frame["projected_wealth"] = np.round(projection.balance[:, -1], 2)
+        frame["projected_contributions"] = np.round(projection.total_contributions[:, -1], 2)
+        frame["projected_returns"] = np.round(projection.total_returns[:, -1], 2)
+    return frame
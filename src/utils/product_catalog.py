@@ -0,0 +1,89 @@
+"""Process-wide product catalog cache with change detection.
+
+The recommendation flow needs the raw product rows (ranking) and the parsed
+catalog (title, summary, benefits, sections) for the UI, several times per
+request. This cache keeps both in memory and re-validates them with one cheap
+`SELECT count(*), max(updated_at)` query instead of downloading and re-parsing
+every markdown description.
+
+When the marker changes the rows are reloaded. The parsed structure comes
+precomputed from the `parsed` column filled at ingestion, so no regex work
+happens on the request path.
+"""
+
+from __future__ import annotations
+
+import copy
+import difflib
+import threading
+from typing import Any, Dict, List
+
+from src.utils.db import get_all_products, get_products_version
+
+
+class ProductCatalogCache:
+    """Cached product rows + parsed catalog, invalidated by products.updated_at."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version: tuple | None = None
+        self._rows: List[Dict[str, Any]] = []
+        self._parsed: Dict[str, Dict[str, Any]] = {}  # product_name -> parsed structure
+
+    def _refresh(self) -> None:
+        """Reload rows if the products table changed (caller holds the lock)."""
+        version = get_products_version()
+        if version is not None and version == self._version and self._rows:
+            return
+        if version is None and self._rows:
+            # Database unreachable: keep serving the last good catalog
+            return
+
+        rows = get_all_products()
+        if not rows:
+            return
+
+        self._rows = rows
+        self._parsed = {row["product_name"]: row["parsed"] for row in rows}
+        self._version = version
+
+    def get_products(self) -> List[Dict[str, Any]]:
+        """Product rows (id, product_name, product_description, timestamps, parsed, content_hash, category)."""
+        with self._lock:
+            self._refresh()
+            return [dict(row) for row in self._rows]
+
+    def find(self, product_name: str, min_ratio: float = 0.4) -> Dict[str, Any] | None:
+        """Fuzzy-match a product by name or display title.
+
+        Returns:
+            Product row (with `parsed`) or None if nothing is similar enough
+        """
+        wanted = (product_name or "").lower().strip()
+        if not wanted:
+            return None
+
+        def score(row: Dict[str, Any]) -> float:
+            candidates = (row["product_name"].replace("_", " "), row["parsed"].get("name", ""))
+            return max(difflib.SequenceMatcher(None, wanted, c.lower()).ratio() for c in candidates)
+
+        rows = self.get_products()
+        if not rows:
+            return None
+        best = max(rows, key=score)
+        return best if score(best) >= min_ratio else None
+
+    def get_catalog(self) -> Dict[str, Dict[str, Any]]:
+        """Parsed catalog: product_name -> {name, description, benefits, sections}."""
+        with self._lock:
+            self._refresh()
+            return copy.deepcopy(self._parsed)
+
+    def clear(self) -> None:
+        """Drop the cached catalog (next access reloads from the database)."""
+        with self._lock:
+            self._version = None
+            self._rows, self._parsed = [], {}
+
+
+product_catalog = ProductCatalogCache()
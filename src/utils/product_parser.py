@@ -0,0 +1,163 @@
+"""Product markdown parsing - title, summary, benefits and sections.
+
+Pure functions shared by the product catalog cache, the recommendation agent
+and ingestion. No database or agent imports, so any module can use them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Any, Dict, List
+
+# Bump when the parsing rules change so stored `parsed` fields are recomputed
+PARSER_VERSION = "1"
+
+_TITLE_RE = re.compile(r'^#\s+(.+?)(?:\s*-\s*Raiffeisen)?$', re.MULTILINE)
+_SECTION_RE = re.compile(r'^##\s+(.+?)\s*$', re.MULTILINE)
+
+
+def content_hash(markdown_content: str) -> str:
+    """Return the sha256 of a product description."""
+    return hashlib.sha256((markdown_content or "").encode("utf-8")).hexdigest()
+
+
+def extract_product_title(markdown_content: str, product_name: str) -> str:
+    """Return the display name (first H1 heading) or a title-cased product_name."""
+    title_match = _TITLE_RE.search(markdown_content)
+    return title_match.group(1).strip() if title_match else product_name.replace('_', ' ').title()
+
+
+def extract_product_summary(markdown_content: str) -> str:
+    """Extract a concise summary from markdown product description.
+    
+    Args:
+        markdown_content: Full markdown product description
+        
+    Returns:
+        Extracted summary (first 300 chars of general description)
+    """
+    # Try to extract content after "## Descriere Generală" or similar
+    description_match = re.search(
+        r'## Descriere.*?\n\n(.*?)(?:\n##|\Z)',
+        markdown_content,
+        re.DOTALL | re.IGNORECASE
+    )
+    
+    if description_match:
+        summary = description_match.group(1).strip()
+        # Clean up markdown formatting
+        summary = re.sub(r'\*\*', '', summary)
+        summary = re.sub(r'\n+', ' ', summary)
+        return summary[:300]
+    
+    # Fallback: return first paragraph
+    lines = markdown_content.split('\n')
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            return line[:300]
+    
+    return "Produs bancar disponibil"
+
+
+def extract_product_benefits(markdown_content: str) -> List[str]:
+    """Extract key benefits from markdown product description.
+    
+    Args:
+        markdown_content: Full markdown product description
+        
+    Returns:
+        List of benefit strings (up to 5)
+    """
+    benefits = []
+    
+    # Try to find "Avantaje" or "Beneficii" section
+    benefits_match = re.search(
+        r'## (?:Avantaje|Beneficii).*?\n(.*?)(?:\n##|\Z)',
+        markdown_content,
+        re.DOTALL | re.IGNORECASE
+    )
+    
+    if benefits_match:
+        content = benefits_match.group(1)
+        # Extract bullet points or numbered items
+        lines = content.split('\n')
+        for line in lines:
+            line = line.strip()
+            # Match bullets like "- text" or "* text" or "### number. text"
+            if re.match(r'^[-*]\s+', line) or re.match(r'^###\s+\d+\.', line):
+                benefit = re.sub(r'^[-*]\s+', '', line)
+                benefit = re.sub(r'^###\s+\d+\.\s+', '', benefit)
+                benefit = re.sub(r'\*\*', '', benefit)
+                if benefit:
+                    benefits.append(benefit[:150])
+                if len(benefits) >= 5:
+                    break
+    
+    # Fallback: extract from "Caracteristici Principale"
+    if not benefits:
+        char_match = re.search(
+            r'## Caracteristici.*?\n(.*?)(?:\n##|\Z)',
+            markdown_content,
+            re.DOTALL | re.IGNORECASE
+        )
+        if char_match:
+            content = char_match.group(1)
+            lines = content.split('\n')
+            for line in lines:
+                line = line.strip()
+                if line and not line.startswith('#') and len(line) > 10:
+                    benefits.append(line[:150])
+                if len(benefits) >= 5:
+                    break
+    
+    return benefits[:5] if benefits else ["Consulta descrierea completa pentru detalii"]
+
+
+def extract_product_sections(markdown_content: str) -> Dict[str, str]:
+    """Split a product description into its H2 sections.
+
+    Returns:
+        Dict mapping section heading -> section body (including H3+ subsections)
+    """
+    matches = list(_SECTION_RE.finditer(markdown_content))
+    sections: Dict[str, str] = {}
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(markdown_content)
+        sections[match.group(1)] = markdown_content[match.end():end].strip()
+    return sections
+
+
+def parse_product(product_name: str, markdown_content: str) -> Dict[str, Any]:
+    """Parse a product description into the structure used by the catalog.
+
+    Returns:
+        Dict with keys version, name, description (summary), benefits, sections
+    """
+    return {
+        "version": PARSER_VERSION,
+        "name": extract_product_title(markdown_content, product_name),
+        "description": extract_product_summary(markdown_content),
+        "benefits": extract_product_benefits(markdown_content),
+        "sections": extract_product_sections(markdown_content),
+    }
+
+
+def build_term_context(parsed: Dict[str, Any], term: str, max_chars: int = 2000) -> str:
+    """Build a product excerpt for explaining `term` from precomputed sections.
+
+    The summary comes first, then the sections mentioning the term, then the
+    remaining sections in document order, until `max_chars` is reached.
+    """
+    term_lower = (term or "").lower().strip()
+    sections = parsed.get("sections") or {}
+    matching = [h for h, body in sections.items() if term_lower and (term_lower in h.lower() or term_lower in body.lower())]
+    ordered = matching + [h for h in sections if h not in matching]
+
+    parts = [f"# {parsed.get('name', '')}", parsed.get("description", "")]
+    for heading in ordered:
+        parts.append(f"## {heading}\n{sections[heading]}")
+        if sum(len(p) for p in parts) >= max_chars:
+            break
+    return "\n\n".join(p for p in parts if p)[:max_chars]
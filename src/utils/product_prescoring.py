@@ -0,0 +1,189 @@
+"""Deterministic product pre-scoring - prunes obvious mismatches before the LLM.
+
+Every catalog product used to go through the justification agent, including
+products that clearly do not fit (a 20-year-old student and a Pillar III
+pension fund, a low-risk profile and securities custody). This module scores
+each product with cheap rules built on the product categories inferred by
+`plan_analytics.infer_product_category` (with a few pre-scoring specific
+overrides) and the user profile fields, so only the top-K candidates are sent
+to the LLM.
+
+Pruned products get the deterministic score and a templated justification,
+so the UI can still list them below the AI-ranked products.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+from src.utils.plan_analytics import PRODUCT_RISK_SCORES, infer_product_category
+
+# Highest product risk score acceptable for each risk tolerance level
+_MAX_RISK_BY_TOLERANCE = {
+    "low": 2,
+    "medium": 3,
+    "high": 4,
+}
+
+_TOLERANCE_ALIASES = {
+    "scăzută": "low",
+    "scazuta": "low",
+    "low": "low",
+    "medie": "medium",
+    "medium": "medium",
+    "ridicată": "high",
+    "ridicata": "high",
+    "high": "high",
+}
+
+# Goal keyword -> (categories the goal supports, bonus)
+_GOAL_CATEGORY_BONUS: List[Tuple[Tuple[str, ...], Tuple[str, ...], float]] = [
+    (("termen scurt", "short"), ("cont_economii", "depozit"), 0.15),
+    (("termen lung", "long"), ("depozit", "titluri_venit_fix", "pensie_privata"), 0.10),
+    (("investiți", "investiti", "invest"), ("fond_investitii", "titluri_venit_fix"), 0.20),
+    (("pension", "retire"), ("pensie_privata",), 0.25),
+    (("casă", "casa", "locuință", "locuinta", "home"), ("depozit", "cont_economii"), 0.10),
+    (("educație", "educatie", "education"), ("fond_investitii", "depozit"), 0.10),
+    (("călătorii", "calatorii", "achiziții", "achizitii", "travel"), ("cont_economii", "depozit"), 0.10),
+]
+
+_CATEGORY_LABELS_RO = {
+    "cont_economii": "cont de economii",
+    "depozit": "depozit bancar",
+    "titluri_venit_fix": "titluri cu venit fix",
+    "pensie_privata": "pensie privată",
+    "fond_investitii": "produs de investiții",
+}
+
+
+def _prescore_category(product_name: str) -> str:
+    """Product category for pre-scoring.
+
+    Stricter than `infer_product_category` for two catalog cases: pension funds
+    ("Fondul de Pensii ...") are not generic investment funds, and custody of
+    financial instruments carries market exposure.
+    """
+    product_lower = product_name.lower()
+    if "pensi" in product_lower or "pension" in product_lower:
+        return "pensie_privata"
+    if any(k in product_lower for k in ("custodie", "instrumente", "custody")):
+        return "fond_investitii"
+    return infer_product_category(product_name)
+
+
+def _risk_tolerance(user_profile: Dict[str, Any]) -> str:
+    value = (user_profile.get("risk_tolerance") or "medie").strip().lower()
+    return _TOLERANCE_ALIASES.get(value, "medium")
+
+
+def prescore_product(user_profile: Dict[str, Any], product_name: str) -> Tuple[float, List[str]]:
+    """Score one product for a profile with deterministic rules.
+
+    Args:
+        user_profile: UserProfile as dict (Romanian or English enum values)
+        product_name: Product name/ID from the catalog
+
+    Returns:
+        (score in [0.05, 0.95], list of Romanian reasons behind the score)
+    """
+    category = _prescore_category(product_name)
+    product_risk = PRODUCT_RISK_SCORES.get(category, 2)
+    tolerance = _risk_tolerance(user_profile)
+    age = user_profile.get("age") or 35
+    income = user_profile.get("annual_income") or 0
+    employment = (user_profile.get("employment_status") or "").lower()
+    goals = [g.lower() for g in user_profile.get("financial_goals") or []]
+
+    score = 0.5
+    reasons: List[str] = []
+
+    # Risk fit: penalize every level above what the tolerance allows
+    excess_risk = product_risk - _MAX_RISK_BY_TOLERANCE[tolerance]
+    if excess_risk > 0:
+        score -= 0.15 * excess_risk
+        reasons.append("riscul produsului depășește toleranța la risc declarată")
+    elif tolerance == "low" and product_risk == 1:
+        score += 0.10
+        reasons.append("produs cu risc foarte scăzut, potrivit profilului prudent")
+    elif tolerance == "high" and product_risk >= 3:
+        score += 0.05
+        reasons.append("potențial de randament potrivit toleranței ridicate la risc")
+
+    # Life stage / horizon
+    if category == "pensie_privata":
+        if age < 25:
+            score -= 0.25
+            reasons.append("orizontul de pensionare este foarte îndepărtat")
+        elif age <= 55:
+            score += 0.10
+            reasons.append("etapă de viață potrivită pentru economisirea pe termen lung")
+        elif age > 60:
+            score -= 0.15
+            reasons.append("timp redus de acumulare până la pensionare")
+    elif category == "fond_investitii" and age > 70:
+        score -= 0.10
+        reasons.append("orizont de investiție scurt pentru vârsta clientului")
+
+    if category in ("fond_investitii", "pensie_privata"):
+        if any(status in employment for status in ("student", "șomer", "somer", "unemployed")):
+            score -= 0.10
+            reasons.append("venituri neregulate pentru contribuții pe termen lung")
+        if 0 < income < 30000:
+            score -= 0.10
+            reasons.append("venitul actual recomandă prioritizarea economiilor lichide")
+
+    # Goal alignment
+    for keywords, categories, bonus in _GOAL_CATEGORY_BONUS:
+        if category in categories and any(k in goal for goal in goals for k in keywords):
+            score += bonus
+            reasons.append("sprijină direct obiectivele financiare declarate")
+
+    return round(min(max(score, 0.05), 0.95), 3), reasons
+
+
+def _pruned_entry(product_name: str, score: float, reasons: List[str]) -> Dict[str, Any]:
+    """Ranking entry (same shape as the LLM ranking) for a pruned product."""
+    category = _prescore_category(product_name)
+    why = "; ".join(dict.fromkeys(reasons)) or "potrivire redusă față de celelalte produse"
+    return {
+        "product_id": product_name,
+        "score": score,
+        "justification": (
+            f"Pre-evaluare automată ({_CATEGORY_LABELS_RO.get(category, 'produs bancar')}): {why}. "
+            "Produsul nu a fost prioritizat pentru profilul dumneavoastră."
+        ),
+        "key_benefits": ["Consultați descrierea completă a produsului pentru detalii"],
+        "recommended_action": "Discutați cu un consultant Raiffeisen dacă doriți o analiză a acestui produs.",
+        "is_fallback": False,
+        "pruned": True,
+    }
+
+
+def prescore_products(
+    user_profile: Dict[str, Any],
+    products: List[Dict[str, Any]],
+    top_k: int | None,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Split products into LLM candidates and deterministically scored pruned entries.
+
+    Args:
+        user_profile: UserProfile as dict
+        products: Product rows with product_name (order is preserved for candidates)
+        top_k: Number of candidates to keep; None/0 keeps every product
+
+    Returns:
+        (candidate product rows, ranking entries for pruned products)
+    """
+    if not top_k or len(products) <= top_k:
+        return list(products), []
+
+    scored = [(product, *prescore_product(user_profile, product["product_name"])) for product in products]
+    ranked = sorted(scored, key=lambda item: item[1], reverse=True)
+    keep = {id(product) for product, _, _ in ranked[:top_k]}
+
+    candidates = [product for product in products if id(product) in keep]
+    pruned = [
+        _pruned_entry(product["product_name"], score, reasons)
+        for product, score, reasons in ranked[top_k:]
+    ]
+    return candidates, pruned
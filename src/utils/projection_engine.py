@@ -0,0 +1,176 @@
+"""Vectorized investment projection engine (NumPy).
+
+`plan_analytics.calculate_investment_projections` used to loop year by year in
+Python for a single scenario. This engine projects many scenarios - each an
+(initial amount, monthly contribution, annual rate, horizon) tuple - in one
+call using the closed-form future value of a lump sum plus an annuity, and
+returns columnar (scenario x year) arrays.
+
+Compounding:
+- "annual" (default, the historical plan_analytics semantics): each year the
+  12 monthly contributions are added, then the annual return is applied
+- "monthly": each month the contribution is added, then 1/12 of the annual
+  rate is applied
+
+Years beyond a scenario's horizon are NaN.
+
+`months_to_targets` is the inverse problem for savings goals: the number of
+monthly contributions needed to reach each target, solved in closed form.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Union
+
+import numpy as np
+
+ArrayLike = Union[float, int, List[float], np.ndarray]
+Compounding = Literal["annual", "monthly"]
+
+
+@dataclass(frozen=True)
+class ProjectionResult:
+    """Columnar projection for S scenarios over H years (H = max horizon).
+
+    Attributes:
+        years: Year numbers 1..H, shape (H,)
+        horizons: Horizon of each scenario in years, shape (S,)
+        balance: End-of-year balance, shape (S, H)
+        total_contributions: Cumulative contributions incl. initial amount, shape (S, H)
+        total_returns: balance - total_contributions, shape (S, H)
+        yearly_return: Return earned during each year, shape (S, H)
+    """
+
+    years: np.ndarray
+    horizons: np.ndarray
+    balance: np.ndarray
+    total_contributions: np.ndarray
+    total_returns: np.ndarray
+    yearly_return: np.ndarray
+
+    def to_records(self, scenario: int = 0) -> List[Dict]:
+        """Year-by-year dicts for one scenario (the `calculate_investment_projections` format)."""
+        horizon = int(self.horizons[scenario])
+        balance = np.round(self.balance[scenario, :horizon], 2)
+        contributions = np.round(self.total_contributions[scenario, :horizon], 2)
+        returns = np.round(self.total_returns[scenario, :horizon], 2)
+        yearly = np.round(self.yearly_return[scenario, :horizon], 2)
+        return [
+            {
+                "year": int(self.years[i]),
+                "balance": float(balance[i]),
+                "total_contributions": float(contributions[i]),
+                "total_returns": float(returns[i]),
+                "yearly_return": float(yearly[i]),
+            }
+            for i in range(horizon)
+        ]
+
+
+def _growth_sum(growth: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """sum_{k=1..n} g^k, elementwise (n = periods), safe for g == 1."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        geometric = growth * (np.power(growth, periods) - 1.0) / (growth - 1.0)
+    return np.where(np.isclose(growth, 1.0), periods, geometric)
+
+
+def project_investments(
+    initial_amount: ArrayLike,
+    monthly_contribution: ArrayLike,
+    annual_return_rate: ArrayLike,
+    years: ArrayLike,
+    compounding: Compounding = "annual",
+) -> ProjectionResult:
+    """Project balances for many scenarios at once.
+
+    Inputs broadcast against each other (scalars apply to every scenario).
+
+    Args:
+        initial_amount: Starting amount(s)
+        monthly_contribution: Monthly contribution(s)
+        annual_return_rate: Expected annual return(s) (e.g., 0.05 for 5%)
+        years: Horizon(s) in whole years
+        compounding: "annual" or "monthly"
+
+    Returns:
+        ProjectionResult with (scenario x year) arrays
+
+    Raises:
+        ValueError: On an unknown compounding mode
+    """
+    if compounding not in ("annual", "monthly"):
+        raise ValueError(f"Unknown compounding mode: {compounding}")
+
+    initial, contribution, rate, horizons = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(initial_amount, dtype=float)),
+        np.atleast_1d(np.asarray(monthly_contribution, dtype=float)),
+        np.atleast_1d(np.asarray(annual_return_rate, dtype=float)),
+        np.atleast_1d(np.maximum(np.asarray(years, dtype=int), 0)),
+    )
+    max_years = int(horizons.max(initial=0))
+    year_numbers = np.arange(1, max_years + 1)
+
+    # (S, 1) scenario columns against (1, H) year rows
+    initial, contribution, rate = initial[:, None], contribution[:, None], rate[:, None]
+    n = year_numbers[None, :].astype(float)
+
+    if compounding == "annual":
+        growth = 1.0 + rate
+        balance = initial * np.power(growth, n) + 12.0 * contribution * _growth_sum(growth, n)
+    else:
+        growth = 1.0 + rate / 12.0
+        months = 12.0 * n
+        balance = initial * np.power(growth, months) + contribution * _growth_sum(growth, months)
+
+    total_contributions = initial + 12.0 * contribution * n
+    previous_balance = np.concatenate([initial, balance[:, :-1]], axis=1)
+    yearly_return = balance - previous_balance - 12.0 * contribution
+
+    # Blank out years past each scenario's horizon
+    outside = year_numbers[None, :] > horizons[:, None]
+    balance, total_contributions, yearly_return = (
+        np.where(outside, np.nan, values) for values in (balance, total_contributions, yearly_return)
+    )
+
+    return ProjectionResult(
+        years=year_numbers,
+        horizons=horizons.copy(),
+        balance=balance,
+        total_contributions=total_contributions,
+        total_returns=balance - total_contributions,
+        yearly_return=yearly_return,
+    )
+
+
+def months_to_targets(
+    target: ArrayLike,
+    monthly_contribution: ArrayLike,
+    annual_return_rate: ArrayLike,
+) -> np.ndarray:
+    """Months needed to reach each target with monthly contributions and compounding.
+
+    Solves FV = PMT * ((1 + r)^n - 1) / r for n, with r = annual rate / 12.
+    Inputs broadcast against each other.
+
+    Args:
+        target: Target amount(s)
+        monthly_contribution: Monthly contribution(s)
+        annual_return_rate: Expected annual return(s) (e.g., 0.05 for 5%)
+
+    Returns:
+        Months per goal (at least 1 with interest; inf when the contribution is <= 0;
+        target / contribution when the rate is <= 0 or the log is undefined)
+    """
+    target, contribution, rate = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(target, dtype=float)),
+        np.atleast_1d(np.asarray(monthly_contribution, dtype=float)),
+        np.atleast_1d(np.asarray(annual_return_rate, dtype=float)),
+    )
+    monthly_rate = rate / 12.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        simple = target / contribution
+        ratio = 1.0 + (target * monthly_rate) / contribution
+        compound = np.maximum(1.0, np.log(ratio) / np.log(1.0 + monthly_rate))
+    months = np.where((monthly_rate > 0) & (ratio > 0), compound, simple)
+    return np.where(contribution > 0, months, np.inf)
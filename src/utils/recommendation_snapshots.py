@@ -0,0 +1,206 @@
+"""Operator recommendation snapshots - precomputed ranking + guidance per user.
+
+An operator lookup runs the full LLM ranking and one guidance call per
+product. `precompute_recommendations.py` runs the same pipeline offline for
+every user and stores the result in `recommendation_snapshots`; the Operator
+Recommendations page serves a snapshot while it is fresh.
+
+A snapshot is fresh when it is younger than SNAPSHOT_MAX_AGE_HOURS and its
+input hash (profile fingerprint + product catalog hash) still matches, so a
+profile update or a changed product description forces a live computation.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.utils.db import get_recommendation_snapshot, save_recommendation_snapshot
+from src.utils.product_catalog import product_catalog
+from src.utils.score_cache import description_hash, profile_fingerprint
+
+SNAPSHOT_MAX_AGE_HOURS = float(os.getenv("SNAPSHOT_MAX_AGE_HOURS", "24"))
+
+# Romanian form values -> UserProfile enum values
+_PROFILE_VALUE_MAPPINGS = {
+    'necăsătorit/ă': 'single',
+    'căsătorit/ă': 'married',
+    'divorțat/ă': 'divorced',
+    'văduv/ă': 'widowed',
+    'angajat': 'employed',
+    'independent': 'self-employed',
+    'șomer': 'unemployed',
+    'pensionar': 'retired',
+    'student': 'student',
+    'scăzută': 'low',
+    'medie': 'medium',
+    'ridicată': 'high',
+    'fără studii superioare': 'fara_studii_superioare',
+    'liceu': 'liceu',
+    'facultate': 'facultate',
+    'master': 'masterat',
+    'doctorat': 'doctorat',
+}
+
+
+def normalize_profile_value(value: Any) -> str | None:
+    """Lowercase a stored profile value and map Romanian labels to enum values."""
+    if not value:
+        return None
+    value = str(value).lower().strip()
+    return _PROFILE_VALUE_MAPPINGS.get(value, value)
+
+
+def build_user_profile(user_data: Dict[str, Any]):
+    """Build the ranking UserProfile from a `users` row (see db.get_user_by_email)."""
+    from src.agents.product_recommendation_agent import UserProfile
+
+    extra = user_data.get('extra') or {}
+    goals = extra.get('financial_goals')
+    return UserProfile(
+        marital_status=normalize_profile_value(user_data.get('marital_status')),
+        annual_income=float(extra.get('annual_income', 50000)),
+        age=int(user_data.get('age') or 35),
+        employment_status=normalize_profile_value(user_data.get('employment_status')),
+        has_children=bool(user_data.get('has_children', False)),
+        risk_tolerance=normalize_profile_value(extra.get('risk_tolerance', 'medium')),
+        financial_goals=[goal.lower().strip() for goal in goals] if isinstance(goals, list) else [],
+        education_level=normalize_profile_value(extra.get('education_level', 'facultate')),
+    )
+
+
+def build_guidance_profile(user_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the client profile dict passed to the operator guidance agent."""
+    extra = user_data.get('extra') or {}
+    return {
+        "age": user_data.get('age'),
+        "education_level": extra.get('education_level', 'facultate'),
+        "annual_income": extra.get('annual_income', 50000),
+        "marital_status": user_data.get('marital_status'),
+        "has_children": user_data.get('has_children', False),
+        "employment_status": user_data.get('employment_status'),
+        "risk_tolerance": extra.get('risk_tolerance', 'medium'),
+    }
+
+
+def catalog_hash(products: List[Dict[str, Any]]) -> str:
+    """Hash product names + descriptions (order independent)."""
+    parts = sorted(f"{p['product_name']}|{description_hash(p.get('product_description', ''))}" for p in products)
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def snapshot_hashes(user_data: Dict[str, Any], products: List[Dict[str, Any]] | None = None) -> Tuple[str, str, str]:
+    """Return (input_hash, profile_hash, catalog_hash) for a user and the current catalog."""
+    if products is None:
+        products = product_catalog.get_products()
+    profile_hash = profile_fingerprint(build_user_profile(user_data))
+    products_hash = catalog_hash(products)
+    input_hash = hashlib.sha256(f"{profile_hash}|{products_hash}".encode("utf-8")).hexdigest()
+    return input_hash, profile_hash, products_hash
+
+
+def merge_ranking_with_catalog(ranked_products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Attach catalog display data (name, description, benefits) to ranking entries."""
+    from src.agents.product_recommendation_agent import _get_products_catalog_dict
+
+    catalog_by_name = _get_products_catalog_dict()
+    merged = []
+    for product in ranked_products:
+        pid = product["product_id"]
+        base_data = catalog_by_name.get(pid, {})
+        merged.append({
+            "product_id": pid,
+            "name": base_data.get("name", pid),
+            "description": base_data.get("description", ""),
+            "benefits": base_data.get("benefits", []),
+            "score": product.get("score", 0.5),
+            "justification": product.get("justification", ""),
+            "recommended_action": product.get("recommended_action", ""),
+            "is_fallback": product.get("is_fallback", False),
+        })
+    return merged
+
+
+def guidance_inputs_for(products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Product info dicts for generate_operator_guidance_batch."""
+    return [
+        {
+            "product_name": product.get("name", product["product_id"]),
+            "description": product.get("description", ""),
+            "benefits": product.get("benefits", []),
+        }
+        for product in products
+    ]
+
+
+def compute_recommendations(
+    user_data: Dict[str, Any],
+    on_guidance: Callable[[Dict[str, Any], int, int], None] | None = None,
+) -> List[Dict[str, Any]]:
+    """Run ranking + operator guidance for one user (blocking).
+
+    Args:
+        user_data: `users` row (see db.get_user_by_email)
+        on_guidance: Optional callback(product, done, total) called in the
+            caller's thread as soon as each product's guidance arrives
+
+    Returns:
+        Ranked product dicts (see merge_ranking_with_catalog) with an
+        `operator_guidance` key each
+    """
+    from src.agents.operator_guidance_agent import _fallback_guidance, generate_operator_guidance_batch
+    from src.agents.product_recommendation_agent import rank_products_for_profile
+    from src.utils import llm_runtime
+
+    ranked = rank_products_for_profile(build_user_profile(user_data).model_dump_json())
+    products = merge_ranking_with_catalog(ranked)
+    inputs = guidance_inputs_for(products)
+
+    guidance_by_index: Dict[int, Dict[str, Any]] = {}
+    try:
+        for idx, guidance in llm_runtime.stream(
+            generate_operator_guidance_batch(build_guidance_profile(user_data), inputs),
+            timeout=90,
+        ):
+            guidance_by_index[idx] = guidance
+            if on_guidance is not None:
+                on_guidance({**products[idx], "operator_guidance": guidance}, len(guidance_by_index), len(products))
+    except Exception as e:
+        print(f"⚠️ Guidance batch incomplete for {user_data.get('email')}: {e}")
+
+    for idx, product in enumerate(products):
+        product["operator_guidance"] = guidance_by_index.get(idx) or _fallback_guidance(inputs[idx])
+    return products
+
+
+def load_fresh_snapshot(
+    user_data: Dict[str, Any],
+    max_age_hours: float = SNAPSHOT_MAX_AGE_HOURS,
+    catalog_products: List[Dict[str, Any]] | None = None,
+) -> List[Dict[str, Any]] | None:
+    """Return the stored recommendations for a user if still fresh, else None."""
+    snapshot = get_recommendation_snapshot(user_data.get("email"))
+    if not snapshot or snapshot["age_seconds"] > max_age_hours * 3600:
+        return None
+    input_hash, _, _ = snapshot_hashes(user_data, catalog_products)
+    if snapshot["input_hash"] != input_hash:
+        return None
+    return snapshot["payload"]
+
+
+def store_snapshot(
+    user_data: Dict[str, Any],
+    products: List[Dict[str, Any]],
+    catalog_products: List[Dict[str, Any]] | None = None,
+) -> bool:
+    """Save computed recommendations as the user's snapshot.
+
+    Results containing ranking fallbacks (LLM timeouts/errors) are not stored,
+    so the next lookup retries instead of serving them for a whole day.
+    """
+    if any(product.get("is_fallback") for product in products):
+        print(f"⚠️ Snapshot not stored for {user_data.get('email')}: ranking contains fallbacks")
+        return False
+    input_hash, profile_hash, products_hash = snapshot_hashes(user_data, catalog_products)
+    return save_recommendation_snapshot(user_data["email"], input_hash, profile_hash, products_hash, products)
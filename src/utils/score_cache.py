@@ -0,0 +1,160 @@
+"""Recommendation score cache keyed by a profile fingerprint.
+
+Ranking a profile costs one LLM round-trip per product, yet the same profile is
+re-ranked every time a user clicks "Obține Recomandări" or an operator looks up
+a client. This module caches the per-product ranking entries produced by
+`product_recommendation_agent` in two tiers:
+
+- In-process: thread-safe LRU with TTL (survives Streamlit reruns, not restarts)
+- Postgres: `recommendation_score_cache` table (shared across processes/restarts)
+
+Cache key = sha256(profile fingerprint, product name, description hash), so an
+edited product description never serves a stale score. `populate_products`
+additionally deletes Postgres entries for products whose description changed.
+
+Configuration (env):
+SCORE_CACHE_TTL_SECONDS (default 86400), SCORE_CACHE_MAX_ENTRIES (default 2048),
+SCORE_CACHE_USE_DB (default "true")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+from src.utils.db import get_cached_scores, save_cached_scores
+
+# Bump when the justification prompt/model changes so old scores stop matching
+SCORE_CACHE_VERSION = "v1"
+
+
+def _normalize_value(value: Any) -> Any:
+    """Lowercase, strip and remove diacritics from strings (recursively for lists)."""
+    if isinstance(value, str):
+        decomposed = unicodedata.normalize("NFKD", value.strip().lower())
+        return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    if isinstance(value, (list, tuple, set)):
+        return sorted({_normalize_value(v) for v in value if v not in (None, "")})
+    if isinstance(value, float):
+        return round(value, 2)
+    return value
+
+
+def profile_fingerprint(profile: Any) -> str:
+    """Return a canonical hash of a normalized user profile.
+
+    Accepts a pydantic model (e.g. UserProfile) or a plain dict. Field order,
+    case, diacritics and goal order do not affect the fingerprint.
+    """
+    data = profile.model_dump() if hasattr(profile, "model_dump") else dict(profile)
+    normalized = {k: _normalize_value(v) for k, v in sorted(data.items())}
+    canonical = json.dumps([SCORE_CACHE_VERSION, normalized], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def description_hash(product_description: str) -> str:
+    """Return the sha256 of a product description."""
+    return hashlib.sha256((product_description or "").encode("utf-8")).hexdigest()
+
+
+def _cache_key(profile_hash: str, product_name: str, desc_hash: str) -> str:
+    return hashlib.sha256(f"{profile_hash}|{product_name}|{desc_hash}".encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """Two-tier (in-process LRU + Postgres) cache for product ranking entries."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int, use_database: bool = True) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.use_database = use_database
+        self._entries: OrderedDict[str, tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_local(self, key: str) -> Dict[str, Any] | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(entry)
+
+    def _put_local(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, dict(entry))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_many(self, profile_hash: str, products: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Look up cached entries for a profile.
+
+        Args:
+            profile_hash: Result of `profile_fingerprint`
+            products: Product rows with product_name and product_description
+
+        Returns:
+            Dict mapping product_name -> cached ranking entry (hits only)
+        """
+        keys = {
+            p["product_name"]: _cache_key(profile_hash, p["product_name"], description_hash(p["product_description"]))
+            for p in products
+        }
+
+        hits: Dict[str, Dict[str, Any]] = {}
+        for name, key in keys.items():
+            entry = self._get_local(key)
+            if entry is not None:
+                hits[name] = entry
+
+        missing = {key: name for name, key in keys.items() if name not in hits}
+        if missing and self.use_database:
+            for key, entry in get_cached_scores(list(missing)).items():
+                self._put_local(key, entry)
+                hits[missing[key]] = dict(entry)
+
+        return hits
+
+    def put_many(self, profile_hash: str, scored: List[tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        """Store ranking entries for a profile.
+
+        Args:
+            profile_hash: Result of `profile_fingerprint`
+            scored: (product row, ranking entry) pairs
+        """
+        rows = []
+        for product, entry in scored:
+            desc_hash = description_hash(product["product_description"])
+            key = _cache_key(profile_hash, product["product_name"], desc_hash)
+            self._put_local(key, entry)
+            rows.append({
+                "cache_key": key,
+                "profile_hash": profile_hash,
+                "product_name": product["product_name"],
+                "description_hash": desc_hash,
+                "payload": entry,
+            })
+        if rows and self.use_database:
+            save_cached_scores(rows, self.ttl_seconds)
+
+    def clear(self) -> None:
+        """Drop the in-process tier (the Postgres tier expires via TTL)."""
+        with self._lock:
+            self._entries.clear()
+
+
+score_cache = ScoreCache(
+    ttl_seconds=int(os.getenv("SCORE_CACHE_TTL_SECONDS", "86400")),
+    max_entries=int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "2048")),
+    use_database=os.getenv("SCORE_CACHE_USE_DB", "true").lower() == "true",
+)
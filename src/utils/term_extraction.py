@@ -0,0 +1,255 @@
+"""Shared bank term extraction service with a content-addressed cache.
+
+Pages used to carry their own copy of `run_agent_extraction` and re-extracted
+terms on every rerun or widget click. Extraction now goes through this module:
+
+1. Lexicon match (src/utils/bank_term_lexicon.py) - deterministic, instant
+2. LLM fallback (bank_term_extractor_agent) only for text with no lexicon hits,
+   memoized in two tiers:
+   - In-process LRU (survives Streamlit reruns)
+   - Postgres `term_extraction_cache` table (shared across sessions/restarts)
+
+Cache key = sha256(EXTRACTOR_PROMPT_VERSION + text), so identical text never
+hits Bedrock twice and a prompt change never serves stale spans.
+
+`extract_terms_batch` handles many texts at once (e.g. all product cards of a
+ranked list): cache misses are sent to the agent as one request per
+EXTRACTION_BATCH_SIZE texts instead of one request per text.
+
+Configuration (env):
+EXTRACTION_CACHE_MAX_ENTRIES (default 1024), EXTRACTION_CACHE_USE_DB (default "true"),
+EXTRACTION_BATCH_SIZE (default 10)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+
+from src.agents.bank_term_extractor_agent import (
+    BatchExtractionResult,
+    ExtractionResult,
+    bank_term_extractor_agent,
+)
+from src.utils import llm_runtime
+from src.utils.bank_term_lexicon import bank_term_lexicon, extract_bank_terms
+from src.utils.db import get_cached_extraction, save_cached_extraction
+
+# Bump when the extractor prompt/agent instructions change
+EXTRACTOR_PROMPT_VERSION = "v1"
+
+EXTRACTION_TIMEOUT_S = 60
+EXTRACTION_BATCH_SIZE = max(1, int(os.getenv("EXTRACTION_BATCH_SIZE", "10")))
+
+
+def _build_prompt(text: str) -> str:
+    return (
+        "Extract bank-related terms from the following text. Return ONLY strict JSON with\n"
+        "keys 'categories' and 'spans' as previously defined. Do not include explanations.\n\n"
+        f"Text:\n{text}"
+    )
+
+
+def _build_batch_prompt(texts: Sequence[Tuple[str, str]]) -> str:
+    payload = [{"id": text_id, "text": text} for text_id, text in texts]
+    return (
+        "Extract bank-related terms from EACH of the texts below, independently. Return ONLY strict JSON\n"
+        "of the form {\"results\": [{\"id\": \"<id>\", \"categories\": {...}, \"spans\": [...]}]} with one entry\n"
+        "per input id; 'categories' and 'spans' are as previously defined and span offsets are relative\n"
+        "to that entry's text. Do not include explanations.\n\n"
+        f"Texts (JSON):\n{json.dumps(payload, ensure_ascii=False)}"
+    )
+
+
+def _parse_json_object(raw: str) -> Optional[Dict[str, Any]]:
+    """Parse a JSON object, isolating it from extra text some LLMs add."""
+    try:
+        return json.loads(raw)
+    except Exception:
+        start = raw.find("{")
+        end = raw.rfind("}")
+        if start != -1 and end != -1 and end > start:
+            return json.loads(raw[start : end + 1])
+        return None
+
+
+def extraction_cache_key(text: str) -> str:
+    """Content address of a text for the current extractor prompt version."""
+    return hashlib.sha256(f"{EXTRACTOR_PROMPT_VERSION}\n{text}".encode("utf-8")).hexdigest()
+
+
+async def run_agent_extraction(text: str) -> Optional[ExtractionResult]:
+    """Call the Bank Term Extractor agent and return a validated ExtractionResult or None."""
+    from agents import Runner
+
+    try:
+        result = await Runner.run(bank_term_extractor_agent, _build_prompt(text))
+        data = _parse_json_object(result.final_output or "")
+        if data is None:
+            return None
+        # Validate into class
+        try:
+            return ExtractionResult.model_validate(data)
+        except ValidationError:
+            return None
+    except Exception:
+        return None
+
+
+async def run_agent_batch_extraction(texts: Sequence[Tuple[str, str]]) -> Dict[str, ExtractionResult]:
+    """Extract terms for several (id, text) pairs with a single agent request.
+
+    Returns:
+        id -> ExtractionResult for every id the agent answered validly
+    """
+    from agents import Runner
+
+    try:
+        result = await Runner.run(bank_term_extractor_agent, _build_batch_prompt(texts))
+        data = _parse_json_object(result.final_output or "")
+        if data is None:
+            return {}
+        batch = BatchExtractionResult.model_validate(data)
+    except Exception:
+        return {}
+    wanted = {text_id for text_id, _ in texts}
+    return {
+        item.id: ExtractionResult.model_validate(item.model_dump(exclude={"id"}))
+        for item in batch.results
+        if item.id in wanted
+    }
+
+
+async def _extract_texts_async(texts: List[str]) -> List[Optional[ExtractionResult]]:
+    """Batched agent extraction; texts the batch reply missed are retried one by one."""
+    chunks = [
+        [(str(i), texts[i]) for i in range(start, min(start + EXTRACTION_BATCH_SIZE, len(texts)))]
+        for start in range(0, len(texts), EXTRACTION_BATCH_SIZE)
+    ]
+    answered: Dict[str, ExtractionResult] = {}
+    for chunk_result in await asyncio.gather(*(run_agent_batch_extraction(chunk) for chunk in chunks)):
+        answered.update(chunk_result)
+
+    missing = [i for i in range(len(texts)) if str(i) not in answered]
+    for i, single in zip(missing, await asyncio.gather(*(run_agent_extraction(texts[i]) for i in missing))):
+        if single is not None:
+            answered[str(i)] = single
+    return [answered.get(str(i)) for i in range(len(texts))]
+
+
+class ExtractionCache:
+    """Two-tier (in-process LRU + Postgres) cache of LLM extraction results."""
+
+    def __init__(self, max_entries: int, use_database: bool = True) -> None:
+        self.max_entries = max_entries
+        self.use_database = use_database
+        self._entries: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[ExtractionResult]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+        if payload is None and self.use_database:
+            payload = get_cached_extraction(key)
+            if payload is not None:
+                self._put_local(key, payload)
+        if payload is None:
+            return None
+        try:
+            return ExtractionResult.model_validate(payload)
+        except ValidationError:
+            return None
+
+    def _put_local(self, key: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put(self, key: str, result: ExtractionResult) -> None:
+        payload = result.model_dump()
+        self._put_local(key, payload)
+        if self.use_database:
+            save_cached_extraction(key, EXTRACTOR_PROMPT_VERSION, payload)
+
+    def clear(self) -> None:
+        """Drop the in-process tier."""
+        with self._lock:
+            self._entries.clear()
+
+
+extraction_cache = ExtractionCache(
+    max_entries=int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "1024")),
+    use_database=os.getenv("EXTRACTION_CACHE_USE_DB", "true").lower() == "true",
+)
+
+
+def extract_terms_llm(text: str) -> Optional[ExtractionResult]:
+    """LLM extraction memoized by content hash (failures are not cached)."""
+    key = extraction_cache_key(text)
+    cached = extraction_cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        result = llm_runtime.run_sync(run_agent_extraction(text), timeout=EXTRACTION_TIMEOUT_S)
+    except Exception:
+        return None
+    if result is not None:
+        extraction_cache.put(key, result)
+    return result
+
+
+def extract_terms(text: str) -> Optional[ExtractionResult]:
+    """Extract bank terms: lexicon first, cached LLM fallback on no hits."""
+    return extract_bank_terms(text, llm_fallback=extract_terms_llm)
+
+
+def extract_terms_batch(items: Sequence[Tuple[str, str]]) -> Dict[str, Optional[ExtractionResult]]:
+    """Extract bank terms for many texts (e.g. all product card summaries) at once.
+
+    Each text goes through the lexicon and the per-text cache first; only the
+    remaining texts reach the agent, batched into as few requests as possible.
+
+    Args:
+        items: (id, text) pairs; ids are caller-defined (e.g. product_id)
+
+    Returns:
+        id -> ExtractionResult, or None where the LLM fallback failed
+    """
+    results: Dict[str, Optional[ExtractionResult]] = {}
+    pending: Dict[str, List[str]] = {}  # text -> ids waiting for the LLM
+    for item_id, text in items:
+        lexicon_result = bank_term_lexicon.extract(text)
+        if lexicon_result.spans or not (text or "").strip():
+            results[item_id] = lexicon_result
+            continue
+        cached = extraction_cache.get(extraction_cache_key(text))
+        if cached is not None:
+            bank_term_lexicon.learn(cached, text)
+            results[item_id] = cached
+            continue
+        pending.setdefault(text, []).append(item_id)
+
+    if pending:
+        texts = list(pending)
+        try:
+            extracted = llm_runtime.run_sync(_extract_texts_async(texts), timeout=EXTRACTION_TIMEOUT_S)
+        except Exception:
+            extracted = [None] * len(texts)
+        for text, result in zip(texts, extracted):
+            if result is not None:
+                extraction_cache.put(extraction_cache_key(text), result)
+                bank_term_lexicon.learn(result, text)
+            for item_id in pending[text]:
+                results[item_id] = result
+    return results
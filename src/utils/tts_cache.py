@@ -0,0 +1,113 @@
+"""Content-addressed disk cache for synthesized speech (term explanations).
+
+Every "Voice Explain" click used to synthesize the same explanation again.
+Audio is now stored on disk as `<sha256(model, voice, format, text)>.<format>`
+and served straight from there on repeated clicks.
+
+The directory is bounded by size: hits refresh the file's mtime, and when the
+total exceeds TTS_CACHE_MAX_MB the least recently used files are deleted.
+
+Configuration (env):
+TTS_CACHE_DIR (default ~/.cache/nexxt_ai/tts), TTS_CACHE_MAX_MB (default 256)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def audio_key(text: str, voice: str, audio_format: str, model: str) -> str:
+    """Content address of a synthesized text."""
+    raw = f"{model}|{voice}|{audio_format}|{text}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Size-bounded LRU of audio files on disk."""
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes: Dict[Path, int] | None = None  # lazily scanned index
+
+    def _index(self) -> Dict[Path, int]:
+        """File -> size for the cache directory (caller holds the lock)."""
+        if self._sizes is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._sizes = {p: p.stat().st_size for p in self.directory.iterdir() if p.is_file() and not p.name.startswith(".")}
+        return self._sizes
+
+    def _path(self, key: str, audio_format: str) -> Path:
+        return self.directory / f"{key}.{audio_format or 'mp3'}"
+
+    def get(self, key: str, audio_format: str) -> Optional[bytes]:
+        """Cached audio bytes or None; a hit marks the file as recently used."""
+        path = self._path(key, audio_format)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def contains(self, key: str, audio_format: str) -> bool:
+        """True if audio for `key` is on disk (does not refresh its LRU position)."""
+        return self._path(key, audio_format).is_file()
+
+    def put(self, key: str, audio_format: str, data: bytes) -> None:
+        """Store audio bytes and evict least recently used files above the size limit."""
+        if not data:
+            return
+        path = self._path(key, audio_format)
+        try:
+            with self._lock:
+                sizes = self._index()
+                # Write-then-rename so readers never see a partial file
+                tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+                sizes[path] = len(data)
+                self._evict(sizes)
+        except OSError as e:
+            print(f"⚠️ Could not cache audio: {e}")
+
+    def _evict(self, sizes: Dict[Path, int]) -> None:
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        def mtime(p: Path) -> float:
+            try:
+                return p.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        for path in sorted(sizes, key=mtime):
+            if total <= self.max_bytes:
+                break
+            total -= sizes.pop(path)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Delete every cached audio file."""
+        with self._lock:
+            for path in list(self._index()):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._sizes = {}
+
+
+audio_cache = AudioCache(
+    directory=Path(os.getenv("TTS_CACHE_DIR", str(Path.home() / ".cache" / "nexxt_ai" / "tts"))),
+    max_bytes=int(float(os.getenv("TTS_CACHE_MAX_MB", "256")) * 1024 * 1024),
+)